@@ -7,7 +7,7 @@ import ray
 NUM_WORKERS = 4
 
 
-def setup():
+def setup(*args):
     if not hasattr(setup, "is_initialized"):
         ray.init(num_workers=NUM_WORKERS, num_cpus=4)
         setup.is_initialized = True
@@ -24,6 +24,14 @@ class MyActor(object):
     def set_x(self, x):
         self.x = x
 
+    def increment(self):
+        self.x = (self.x or 0) + 1
+
+
+@ray.remote
+def call_actor(actor, num_calls):
+    ray.get([actor.increment.remote() for _ in range(num_calls)])
+
 
 class ActorInstantiationSuite(object):
     def instantiate_actor(self):
@@ -60,6 +68,27 @@ class ActorMethodSuite(object):
     def peakmem_call_method(self):
         ray.get(self.actor.get_x.remote())
 
+    def time_driver_method_throughput(self):
+        ray.get([self.actor.increment.remote() for _ in range(1000)])
+
+
+class ActorMethodThroughputSuite(object):
+    """Call one actor through several handles passed to concurrent tasks."""
+    timeout = 60
+    params = [1, 4, 16]
+    param_names = ["num_handles"]
+
+    def setup(self, num_handles):
+        self.actor = MyActor.remote()
+        # Block to make sure actor is instantiated
+        ray.get(self.actor.get_x.remote())
+
+    def time_handle_method_throughput(self, num_handles):
+        ray.get([
+            call_actor.remote(self.actor, 1000 // num_handles)
+            for _ in range(num_handles)
+        ])
+
 
 class ActorCheckpointSuite(object):
     def checkpoint_and_restore(self):
@@ -0,0 +1,57 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import ray
+import ray.experimental.array.distributed as da
+
+
+def setup(*args):
+    if not hasattr(setup, "is_initialized"):
+        ray.init(num_workers=4, num_cpus=4)
+        setup.is_initialized = True
+
+
+def wait_for_blocks(a):
+    object_ids = list(a.objectids.flatten())
+    ray.wait(object_ids, num_returns=len(object_ids))
+
+
+class DotSuite(object):
+    timeout = 120
+    params = [["tall_skinny", "wide", "square"], [1, 4]]
+    param_names = ["product", "inner_blocks_per_task"]
+    # The shapes of the two matrices and the block size of the first one.
+    shapes = {
+        "tall_skinny": ([4000, 100], [100, 100], [500, 100]),
+        "wide": ([100, 4000], [4000, 100], [100, 500]),
+        "square": ([1000, 1000], [1000, 1000], [250, 250]),
+    }
+
+    def setup(self, product, inner_blocks_per_task):
+        a_shape, b_shape, block_size = self.shapes[product]
+        self.a = ray.get(da.random.normal.remote(a_shape, block_size))
+        self.b = ray.get(da.random.normal.remote(b_shape, block_size[::-1]))
+        wait_for_blocks(self.a)
+        wait_for_blocks(self.b)
+
+    def time_dot(self, product, inner_blocks_per_task):
+        wait_for_blocks(
+            ray.get(
+                da.dot.remote(
+                    self.a,
+                    self.b,
+                    inner_blocks_per_task=inner_blocks_per_task)))
+
+
+class RechunkSuite(object):
+    timeout = 60
+    params = [[100, 250, [1000, 50]]]
+    param_names = ["block_size"]
+
+    def setup(self, block_size):
+        self.a = ray.get(da.random.normal.remote([1000, 1000], 200))
+        wait_for_blocks(self.a)
+
+    def time_rechunk(self, block_size):
+        wait_for_blocks(ray.get(da.rechunk.remote(self.a, block_size)))
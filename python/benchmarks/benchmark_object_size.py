@@ -0,0 +1,70 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import time
+
+import numpy as np
+
+import ray
+
+# Object sizes in bytes, from a few bytes up to a gigabyte.
+OBJECT_SIZES = [10, 10**3, 10**5, 10**7, 10**9]
+
+
+def setup(*args):
+    if not hasattr(setup, "is_initialized"):
+        ray.init(num_workers=4, num_cpus=4, object_store_memory=5 * 10**9)
+        setup.is_initialized = True
+
+
+@ray.remote
+def nbytes(x):
+    return x.nbytes
+
+
+class ObjectSizeSuite(object):
+    timeout = 120
+    params = OBJECT_SIZES
+    param_names = ["num_bytes"]
+
+    def setup(self, num_bytes):
+        self.array = np.ones(num_bytes, dtype=np.uint8)
+        self.oid = ray.put(self.array)
+
+    def time_put(self, num_bytes):
+        ray.put(self.array)
+
+    def peakmem_put(self, num_bytes):
+        ray.put(self.array)
+
+    def time_get(self, num_bytes):
+        ray.get(self.oid)
+
+    def peakmem_get(self, num_bytes):
+        ray.get(self.oid)
+
+    def time_task_argument_by_value(self, num_bytes):
+        ray.get(nbytes.remote(self.array))
+
+    def time_task_argument_by_id(self, num_bytes):
+        ray.get(nbytes.remote(self.oid))
+
+
+class ObjectSizeThroughputSuite(object):
+    """Report put throughput in bytes per second for each object size."""
+    timeout = 120
+    params = OBJECT_SIZES
+    param_names = ["num_bytes"]
+    unit = "bytes/s"
+
+    def setup(self, num_bytes):
+        self.array = np.ones(num_bytes, dtype=np.uint8)
+        # Put roughly a gigabyte in total, but at least a few objects.
+        self.num_puts = max(3, min(1000, 10**9 // num_bytes))
+
+    def track_put_throughput(self, num_bytes):
+        start = time.time()
+        for _ in range(self.num_puts):
+            ray.put(self.array)
+        return self.num_puts * num_bytes / (time.time() - start)
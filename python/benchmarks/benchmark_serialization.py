@@ -0,0 +1,68 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import numpy as np
+import pyarrow
+
+import ray
+
+
+def setup(*args):
+    if not hasattr(setup, "is_initialized"):
+        ray.init(num_workers=4, num_cpus=4)
+        setup.is_initialized = True
+
+
+class Point(object):
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+def make_object(kind):
+    if kind == "small_array":
+        return np.zeros(10)
+    elif kind == "large_array":
+        return np.zeros(10**6)
+    elif kind == "list_of_arrays":
+        return [np.zeros(10) for _ in range(1000)]
+    elif kind == "flat_dict":
+        return {str(i): i for i in range(1000)}
+    elif kind == "nested_dict":
+        return {str(i): {"a": [i, float(i)], "b": str(i)} for i in range(1000)}
+    elif kind == "custom_class":
+        return [Point(i, i) for i in range(1000)]
+    raise ValueError(kind)
+
+
+class SerializationSuite(object):
+    """Time the serialization used by the object store in isolation."""
+    params = [
+        "small_array", "large_array", "list_of_arrays", "flat_dict",
+        "nested_dict", "custom_class"
+    ]
+    param_names = ["kind"]
+
+    def setup(self, kind):
+        self.object = make_object(kind)
+        worker = ray.worker.global_worker
+        # Putting the object once registers custom classes with the
+        # serialization context.
+        ray.put(self.object)
+        self.context = worker.get_serialization_context(worker.task_driver_id)
+        self.buffer = pyarrow.serialize(self.object, self.context).to_buffer()
+
+    def time_serialize(self, kind):
+        pyarrow.serialize(self.object, self.context).to_buffer()
+
+    def time_deserialize(self, kind):
+        pyarrow.deserialize(self.buffer, self.context)
+
+    def time_put_get(self, kind):
+        ray.get(ray.put(self.object))
+
+    def track_serialized_bytes(self, kind):
+        return self.buffer.size
+
+    track_serialized_bytes.unit = "bytes"
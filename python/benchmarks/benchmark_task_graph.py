@@ -0,0 +1,73 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import ray
+
+
+def setup(*args):
+    if not hasattr(setup, "is_initialized"):
+        ray.init(num_workers=4, num_cpus=4)
+        setup.is_initialized = True
+
+
+@ray.remote
+def no_op(*args):
+    return 1
+
+
+@ray.remote
+def sum_args(*args):
+    return sum(args)
+
+
+class ArgumentCountSuite(object):
+    timeout = 60
+    params = [[0, 1, 10, 100], ["value", "object_id"]]
+    param_names = ["num_args", "arg_type"]
+
+    def setup(self, num_args, arg_type):
+        if arg_type == "value":
+            self.args = [1] * num_args
+        else:
+            self.args = [ray.put(1) for _ in range(num_args)]
+
+    def time_submit(self, num_args, arg_type):
+        no_op.remote(*self.args)
+
+    def time_submit_and_get(self, num_args, arg_type):
+        ray.get(no_op.remote(*self.args))
+
+
+class FanOutFanInSuite(object):
+    """A driver fans out to many tasks whose results are summed by one task."""
+    timeout = 120
+    params = [10, 100, 1000]
+    param_names = ["width"]
+
+    def time_fan_out(self, width):
+        ray.get([no_op.remote() for _ in range(width)])
+
+    def time_fan_out_fan_in(self, width):
+        ray.get(sum_args.remote(*[no_op.remote() for _ in range(width)]))
+
+    def time_tree_reduce(self, width):
+        results = [no_op.remote() for _ in range(width)]
+        while len(results) > 1:
+            results = [
+                sum_args.remote(*results[i:i + 2])
+                for i in range(0, len(results), 2)
+            ]
+        ray.get(results[0])
+
+
+class ChainSuite(object):
+    timeout = 60
+    params = [10, 100, 1000]
+    param_names = ["length"]
+
+    def time_chain(self, length):
+        result = no_op.remote()
+        for _ in range(length - 1):
+            result = no_op.remote(result)
+        ray.get(result)
@@ -37,3 +37,18 @@ class WaitSuite(object):
 
     time_wait_timeout.params = [200, 800]
     time_wait_timeout.param_names = ["timeout_ms"]
+
+
+class WaitManyObjectsSuite(object):
+    timeout = 60
+    params = [100, 1000, 10000]
+    param_names = ["num_objects"]
+
+    def setup(self, num_objects):
+        self.object_ids = [ray.put(i) for i in range(num_objects)]
+
+    def time_wait_all(self, num_objects):
+        ray.wait(self.object_ids, num_returns=num_objects)
+
+    def time_wait_one(self, num_objects):
+        ray.wait(self.object_ids, num_returns=1)
@@ -0,0 +1,134 @@
+"""Compare ASV benchmark results against a stored baseline.
+
+ASV writes one JSON file per commit and machine to ASV_RESULTS/<machine>/.
+Copy the file for a known-good commit somewhere as the baseline, and after
+running the suite on a new commit compare the two with
+
+    python compare_benchmarks.py baseline.json ASV_RESULTS/<machine>/new.json
+
+The script prints every benchmark that changed by more than the threshold
+and exits with a nonzero status if any benchmark regressed, so it can be
+used to gate upgrades in CI.
+"""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import argparse
+import itertools
+import json
+import math
+import sys
+
+
+def higher_is_better(name):
+    """Return True if larger results are improvements for this benchmark.
+
+    The ASV type prefix decides: time_, mem_ and peakmem_ benchmarks measure
+    costs, so smaller is better. track_ benchmarks can record any value, and
+    only the rates among them (named *throughput*) are better when larger.
+    """
+    benchmark = name.split("(")[0].split(".")[-1]
+    return benchmark.startswith("track_") and "throughput" in benchmark
+
+
+def flatten_results(results):
+    """Map each benchmark (and parameter combination) to a single number.
+
+    Args:
+        results: The "results" dictionary of an ASV results file. Values are
+            either numbers or dictionaries with a flat "result" list that
+            enumerates the cartesian product of "params".
+
+    Returns:
+        A dictionary mapping "benchmark(param1, param2)" to a float. Failed
+            or skipped measurements are omitted.
+    """
+    flat = {}
+    for name, value in results.items():
+        if isinstance(value, dict):
+            params = value.get("params") or [[]]
+            combinations = itertools.product(*params)
+            for combination, result in zip(combinations, value["result"]):
+                key = "{}({})".format(name, ", ".join(combination))
+                flat[key] = result
+        else:
+            flat[name] = value
+    return {
+        key: float(value)
+        for key, value in flat.items()
+        if value is not None and not math.isnan(float(value))
+    }
+
+
+def load_results(path):
+    with open(path) as f:
+        return flatten_results(json.load(f)["results"])
+
+
+def compare(baseline, current, threshold):
+    """Compare two flattened result dictionaries.
+
+    Args:
+        baseline: The flattened baseline results.
+        current: The flattened results to check.
+        threshold (float): The relative change above which a benchmark is
+            reported, e.g. 0.1 for 10%.
+
+    Returns:
+        A tuple of the list of regressions and the list of improvements. Each
+            entry is a tuple of the benchmark name, the baseline value, the
+            current value and the ratio current / baseline.
+    """
+    regressions = []
+    improvements = []
+    for name in sorted(set(baseline) & set(current)):
+        old, new = baseline[name], current[name]
+        if old == 0:
+            continue
+        ratio = new / old
+        worse = ratio < 1 if higher_is_better(name) else ratio > 1
+        if abs(ratio - 1) <= threshold:
+            continue
+        entry = (name, old, new, ratio)
+        if worse:
+            regressions.append(entry)
+        else:
+            improvements.append(entry)
+    return regressions, improvements
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Compare ASV results against a stored baseline.")
+    parser.add_argument("baseline", help="The baseline ASV results file.")
+    parser.add_argument("current", help="The ASV results file to check.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="The relative change above which a benchmark is reported.")
+    args = parser.parse_args(argv)
+
+    baseline = load_results(args.baseline)
+    current = load_results(args.current)
+    regressions, improvements = compare(baseline, current, args.threshold)
+
+    for title, entries in [("Regressions", regressions), ("Improvements",
+                                                          improvements)]:
+        print("{} ({}):".format(title, len(entries)))
+        for name, old, new, ratio in entries:
+            print("    {:<80} {:>12.6g} -> {:<12.6g} ({:.2f}x)".format(
+                name, old, new, ratio))
+    missing = sorted(set(baseline) - set(current))
+    if missing:
+        print("Missing from the current results ({}):".format(len(missing)))
+        for name in missing:
+            print("    {}".format(name))
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
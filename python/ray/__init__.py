@@ -49,8 +49,9 @@ except ImportError as e:
 from ray.local_scheduler import ObjectID, _config  # noqa: E402
 from ray.profiling import profile  # noqa: E402
 from ray.worker import (error_info, init, connect, disconnect, get, put, wait,
-                        remote, get_gpu_ids, get_resource_ids, get_webui_url,
-                        register_custom_serializer, shutdown)  # noqa: E402
+                        remote, submit_batch, get_gpu_ids, get_resource_ids,
+                        get_webui_url, register_custom_serializer,
+                        shutdown)  # noqa: E402
 from ray.worker import (SCRIPT_MODE, WORKER_MODE, LOCAL_MODE,
                         PYTHON_MODE)  # noqa: E402
 from ray.worker import global_state  # noqa: E402
@@ -66,10 +67,10 @@ __version__ = "0.5.2"
 
 __all__ = [
     "error_info", "init", "connect", "disconnect", "get", "put", "wait",
-    "remote", "profile", "actor", "method", "get_gpu_ids", "get_resource_ids",
-    "get_webui_url", "register_custom_serializer", "shutdown", "SCRIPT_MODE",
-    "WORKER_MODE", "LOCAL_MODE", "PYTHON_MODE", "global_state", "ObjectID",
-    "_config", "__version__", "internal"
+    "remote", "submit_batch", "profile", "actor", "method", "get_gpu_ids",
+    "get_resource_ids", "get_webui_url", "register_custom_serializer",
+    "shutdown", "SCRIPT_MODE", "WORKER_MODE", "LOCAL_MODE", "PYTHON_MODE",
+    "global_state", "ObjectID", "_config", "__version__", "internal"
 ]
 
 import ctypes  # noqa: E402
@@ -7,6 +7,7 @@ import hashlib
 import inspect
 import json
 import traceback
+from collections import namedtuple
 
 import ray.cloudpickle as pickle
 import ray.local_scheduler
@@ -23,6 +24,14 @@ from ray.utils import (
 
 DEFAULT_ACTOR_METHOD_NUM_RETURN_VALS = 1
 
+# The information about an actor class that handles need to invoke its
+# methods. It is cached per worker so that handles do not carry it. The
+# function IDs of the methods are filled in as the methods are invoked.
+ActorClassMethods = namedtuple("ActorClassMethods", [
+    "class_name", "method_names", "method_signatures",
+    "method_num_return_vals", "method_function_ids"
+])
+
 
 def is_classmethod(f):
     """Returns whether the given method is a classmethod."""
@@ -388,15 +397,18 @@ def publish_actor_class_to_key(key, actor_class_info, worker):
     worker.redis_client.rpush("Exports", key)
 
 
-def export_actor_class(class_id, Class, actor_method_names,
-                       checkpoint_interval, worker):
+def export_actor_class(class_id, Class, class_methods, checkpoint_interval,
+                       worker):
     key = b"ActorClass:" + class_id
     actor_class_info = {
         "class_name": Class.__name__,
         "module": Class.__module__,
         "class": pickle.dumps(Class),
         "checkpoint_interval": checkpoint_interval,
-        "actor_method_names": json.dumps(list(actor_method_names))
+        "actor_method_names": json.dumps(list(class_methods.method_names)),
+        "method_signatures": pickle.dumps(class_methods.method_signatures),
+        "method_num_return_vals": json.dumps(
+            class_methods.method_num_return_vals)
     }
 
     check_oversized_pickle(actor_class_info["class"],
@@ -420,6 +432,35 @@ def export_actor_class(class_id, Class, actor_method_names,
     # https://github.com/ray-project/ray/issues/1146.
 
 
+def get_actor_class_methods(class_id, worker):
+    """Get the method information of an actor class.
+
+    This is fetched from Redis the first time an actor handle of the class is
+    deserialized on this worker, and then cached.
+
+    Args:
+        class_id: The ID of the actor class.
+        worker: The worker to use.
+
+    Returns:
+        The ActorClassMethods of the actor class.
+    """
+    class_methods = worker.actor_class_methods.get(class_id)
+    if class_methods is None:
+        (class_name, actor_method_names, method_signatures,
+         method_num_return_vals) = worker.redis_client.hmget(
+             b"ActorClass:" + class_id, [
+                 "class_name", "actor_method_names", "method_signatures",
+                 "method_num_return_vals"
+             ])
+        class_methods = ActorClassMethods(
+            decode(class_name), json.loads(decode(actor_method_names)),
+            pickle.loads(method_signatures),
+            json.loads(decode(method_num_return_vals)), {})
+        worker.actor_class_methods[class_id] = class_methods
+    return class_methods
+
+
 def method(*args, **kwargs):
     """Annotate an actor method.
 
@@ -468,6 +509,19 @@ class ActorMethod(object):
     def remote(self, *args, **kwargs):
         return self._submit(args, kwargs)
 
+    def map(self, *iterables):
+        """Call the actor method on the elements of the iterables.
+
+        Like the builtin map, the method is called with one element from each
+        iterable until the shortest one is exhausted. The tasks are submitted
+        together with ray.submit_batch.
+
+        Returns:
+            A list with the result of remote() for each call.
+        """
+        return ray.worker.submit_batch(
+            (self, args) for args in zip(*iterables))
+
     def _submit(self, args, kwargs, num_return_vals=None):
         if num_return_vals is None:
             num_return_vals = self._num_return_vals
@@ -504,6 +558,7 @@ class ActorClass(object):
         _actor_method_names: The names of the actor methods.
         _actor_method_num_return_vals: The default number of return values for
             each actor method.
+        _class_methods: The ActorClassMethods shared by handles of this class.
     """
 
     def __init__(self, modified_class, class_id, checkpoint_interval, num_cpus,
@@ -550,6 +605,9 @@ class ActorClass(object):
         self._actor_method_names = [
             method_name for method_name, _ in self._actor_methods
         ]
+        self._class_methods = ActorClassMethods(
+            self._class_name, self._actor_method_names,
+            self._method_signatures, self._actor_method_num_return_vals, {})
 
     def __call__(self, *args, **kwargs):
         raise Exception("Actors methods cannot be instantiated directly. "
@@ -605,6 +663,9 @@ class ActorClass(object):
         # updated to reflect the new invocation.
         actor_cursor = None
 
+        # Handles deserialized by this worker look up the methods by class ID.
+        worker.actor_class_methods[self._class_id] = self._class_methods
+
         # Do not export the actor class or the actor if run in LOCAL_MODE
         # Instead, instantiate the actor locally and add it to the worker's
         # dictionary
@@ -615,7 +676,7 @@ class ActorClass(object):
             # Export the actor.
             if not self._exported:
                 export_actor_class(self._class_id, self._modified_class,
-                                   self._actor_method_names,
+                                   self._class_methods,
                                    self._checkpoint_interval, worker)
                 self._exported = True
 
@@ -636,10 +697,9 @@ class ActorClass(object):
         # creation task.
         actor_counter = 1
         actor_handle = ActorHandle(
-            actor_id, self._class_name, actor_cursor, actor_counter,
-            self._actor_method_names, self._method_signatures,
-            self._actor_method_num_return_vals, actor_cursor,
-            self._actor_method_cpus, worker.task_driver_id)
+            actor_id, self._class_id, self._class_methods, actor_cursor,
+            actor_counter, actor_cursor, self._actor_method_cpus,
+            worker.task_driver_id)
 
         # Call __init__ as a remote function.
         if "__init__" in actor_handle._ray_actor_method_names:
@@ -685,10 +745,13 @@ class ActorHandle(object):
             then updated to reflect the new invocation.
         _ray_actor_counter: The number of actor method invocations that we've
             called so far.
+        _ray_class_id: The ID of the actor class.
         _ray_actor_method_names: The names of the actor methods.
         _ray_method_signatures: The signatures of the actor methods.
         _ray_method_num_return_vals: The default number of return values for
             each method.
+        _ray_method_function_ids: The function IDs of the actor methods that
+            have been invoked so far.
         _ray_class_name: The name of the actor class.
         _ray_actor_forks: The number of times this handle has been forked.
         _ray_actor_creation_dummy_object_id: The dummy object ID from the actor
@@ -708,12 +771,10 @@ class ActorHandle(object):
 
     def __init__(self,
                  actor_id,
-                 class_name,
+                 class_id,
+                 class_methods,
                  actor_cursor,
                  actor_counter,
-                 actor_method_names,
-                 method_signatures,
-                 method_num_return_vals,
                  actor_creation_dummy_object_id,
                  actor_method_cpus,
                  actor_driver_id,
@@ -731,10 +792,13 @@ class ActorHandle(object):
             self._ray_actor_handle_id = actor_handle_id
         self._ray_actor_cursor = actor_cursor
         self._ray_actor_counter = actor_counter
-        self._ray_actor_method_names = actor_method_names
-        self._ray_method_signatures = method_signatures
-        self._ray_method_num_return_vals = method_num_return_vals
-        self._ray_class_name = class_name
+        self._ray_class_id = class_id
+        self._ray_actor_method_names = class_methods.method_names
+        self._ray_method_signatures = class_methods.method_signatures
+        self._ray_method_num_return_vals = (
+            class_methods.method_num_return_vals)
+        self._ray_method_function_ids = class_methods.method_function_ids
+        self._ray_class_name = class_methods.class_name
         self._ray_actor_forks = 0
         self._ray_actor_creation_dummy_object_id = (
             actor_creation_dummy_object_id)
@@ -801,8 +865,12 @@ class ActorHandle(object):
         else:
             actor_handle_id = self._ray_actor_handle_id
 
-        function_id = compute_actor_method_function_id(self._ray_class_name,
-                                                       method_name)
+        # The function IDs are hashes, so only compute each of them once.
+        function_id = self._ray_method_function_ids.get(method_name)
+        if function_id is None:
+            function_id = compute_actor_method_function_id(
+                self._ray_class_name, method_name)
+            self._ray_method_function_ids[method_name] = function_id
         object_ids = worker.submit_task(
             function_id,
             args,
@@ -837,18 +905,19 @@ class ActorHandle(object):
 
     def __getattribute__(self, attr):
         try:
-            # Check whether this is an actor method.
-            actor_method_names = object.__getattribute__(
-                self, "_ray_actor_method_names")
-            if attr in actor_method_names:
+            # Check whether this is an actor method. This uses the dict of
+            # return value counts, which has a key for each actor method, as
+            # it is much faster to look up than the list of method names.
+            method_num_return_vals = object.__getattribute__(
+                self, "_ray_method_num_return_vals")
+            if attr in method_num_return_vals:
                 # We create the ActorMethod on the fly here so that the
                 # ActorHandle doesn't need a reference to the ActorMethod.
                 # The ActorMethod has a reference to the ActorHandle and
                 # this was causing cyclic references which were prevent
                 # object deallocation from behaving in a predictable
                 # manner.
-                return ActorMethod(self, attr,
-                                   self._ray_method_num_return_vals[attr])
+                return ActorMethod(self, attr, method_num_return_vals[attr])
         except AttributeError:
             pass
 
@@ -891,17 +960,15 @@ class ActorHandle(object):
 
         Returns:
             A dictionary of the information needed to reconstruct the object.
+            The actor methods are not included, they are looked up by the
+            class ID instead.
         """
         state = {
             "actor_id": self._ray_actor_id.id(),
-            "class_name": self._ray_class_name,
+            "class_id": self._ray_class_id,
             "actor_forks": self._ray_actor_forks,
             "actor_cursor": self._ray_actor_cursor.id()
             if self._ray_actor_cursor is not None else None,
-            "actor_counter": 0,  # Reset the actor counter.
-            "actor_method_names": self._ray_actor_method_names,
-            "method_signatures": self._ray_method_signatures,
-            "method_num_return_vals": self._ray_method_num_return_vals,
             "actor_creation_dummy_object_id": self.
             _ray_actor_creation_dummy_object_id.id()
             if self._ray_actor_creation_dummy_object_id is not None else None,
@@ -941,13 +1008,11 @@ class ActorHandle(object):
 
         self.__init__(
             ray.ObjectID(state["actor_id"]),
-            state["class_name"],
+            state["class_id"],
+            get_actor_class_methods(state["class_id"], worker),
             ray.ObjectID(state["actor_cursor"])
             if state["actor_cursor"] is not None else None,
-            state["actor_counter"],
-            state["actor_method_names"],
-            state["method_signatures"],
-            state["method_num_return_vals"],
+            0,  # Reset the actor counter.
             ray.ObjectID(state["actor_creation_dummy_object_id"])
             if state["actor_creation_dummy_object_id"] is not None else None,
             state["actor_method_cpus"],
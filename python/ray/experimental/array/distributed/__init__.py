@@ -6,10 +6,13 @@ from . import random
 from . import linalg
 from .core import (BLOCK_SIZE, DistArray, assemble, zeros, ones, copy, eye,
                    triu, tril, blockwise_dot, dot, transpose, add, subtract,
-                   numpy_to_dist, subblocks)
+                   numpy_to_dist, subblocks, rechunk)
+from .expression import (Expression, lazy, apply, evaluate, sum, mean, max,
+                         min)
 
 __all__ = [
     "random", "linalg", "BLOCK_SIZE", "DistArray", "assemble", "zeros", "ones",
     "copy", "eye", "triu", "tril", "blockwise_dot", "dot", "transpose", "add",
-    "subtract", "numpy_to_dist", "subblocks"
+    "subtract", "numpy_to_dist", "subblocks", "rechunk", "Expression", "lazy",
+    "apply", "evaluate", "sum", "mean", "max", "min"
 ]
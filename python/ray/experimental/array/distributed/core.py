@@ -2,6 +2,9 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import itertools
+import numbers
+
 import numpy as np
 import ray.experimental.array.remote as ra
 import ray
@@ -10,12 +13,22 @@ BLOCK_SIZE = 10
 
 
 class DistArray(object):
-    def __init__(self, shape, objectids=None):
+    def __init__(self, shape, objectids=None, block_size=None):
+        """Create a distributed array.
+
+        Args:
+            shape: The shape of the array.
+            objectids: A numpy array of the object IDs of the blocks. If this
+                is None, an empty array of object IDs is created.
+            block_size: The size of the blocks along each dimension, either
+                as a list with one entry per dimension or as an int that is
+                used for all dimensions. This defaults to BLOCK_SIZE.
+        """
         self.shape = shape
         self.ndim = len(shape)
-        self.num_blocks = [
-            int(np.ceil(1.0 * a / BLOCK_SIZE)) for a in self.shape
-        ]
+        self.block_size = DistArray.compute_block_size(block_size, self.ndim)
+        self.num_blocks = DistArray.compute_num_blocks(self.shape,
+                                                       self.block_size)
         if objectids is not None:
             self.objectids = objectids
         else:
@@ -27,51 +40,172 @@ class DistArray(object):
                                                   list(self.objectids.shape)))
 
     @staticmethod
-    def compute_block_lower(index, shape):
+    def compute_block_size(block_size, ndim):
+        if block_size is None:
+            return [BLOCK_SIZE] * ndim
+        if isinstance(block_size, numbers.Integral):
+            block_size = [block_size] * ndim
+        block_size = [int(size) for size in block_size]
+        if len(block_size) != ndim:
+            raise Exception("The field `block_size` must have one entry per "
+                            "dimension, but `block_size` is {} and the array "
+                            "has {} dimensions.".format(block_size, ndim))
+        if any(size <= 0 for size in block_size):
+            raise Exception("The entries of `block_size` must be positive, "
+                            "but `block_size` is {}.".format(block_size))
+        return block_size
+
+    @staticmethod
+    def compute_block_lower(index, shape, block_size=None):
         if len(index) != len(shape):
             raise Exception("The fields `index` and `shape` must have the "
                             "same length, but `index` is {} and `shape` is "
                             "{}.".format(index, shape))
-        return [elem * BLOCK_SIZE for elem in index]
+        block_size = DistArray.compute_block_size(block_size, len(shape))
+        return [elem * size for (elem, size) in zip(index, block_size)]
 
     @staticmethod
-    def compute_block_upper(index, shape):
+    def compute_block_upper(index, shape, block_size=None):
         if len(index) != len(shape):
             raise Exception("The fields `index` and `shape` must have the "
                             "same length, but `index` is {} and `shape` is "
                             "{}.".format(index, shape))
+        block_size = DistArray.compute_block_size(block_size, len(shape))
         upper = []
         for i in range(len(shape)):
-            upper.append(min((index[i] + 1) * BLOCK_SIZE, shape[i]))
+            upper.append(min((index[i] + 1) * block_size[i], shape[i]))
         return upper
 
     @staticmethod
-    def compute_block_shape(index, shape):
-        lower = DistArray.compute_block_lower(index, shape)
-        upper = DistArray.compute_block_upper(index, shape)
+    def compute_block_shape(index, shape, block_size=None):
+        lower = DistArray.compute_block_lower(index, shape, block_size)
+        upper = DistArray.compute_block_upper(index, shape, block_size)
         return [u - l for (l, u) in zip(lower, upper)]
 
     @staticmethod
-    def compute_num_blocks(shape):
-        return [int(np.ceil(1.0 * a / BLOCK_SIZE)) for a in shape]
+    def compute_num_blocks(shape, block_size=None):
+        block_size = DistArray.compute_block_size(block_size, len(shape))
+        return [
+            int(np.ceil(1.0 * a / size))
+            for (a, size) in zip(shape, block_size)
+        ]
 
     def assemble(self):
         """Assemble an array from a distributed array of object IDs."""
-        first_block = ray.get(self.objectids[(0, ) * self.ndim])
-        dtype = first_block.dtype
-        result = np.zeros(self.shape, dtype=dtype)
-        for index in np.ndindex(*self.num_blocks):
-            lower = DistArray.compute_block_lower(index, self.shape)
-            upper = DistArray.compute_block_upper(index, self.shape)
-            result[[slice(l, u) for (l, u) in zip(lower, upper)]] = ray.get(
-                self.objectids[index])
+        indices = list(np.ndindex(*self.num_blocks))
+        # Fetch all of the blocks with a single call to ray.get.
+        blocks = ray.get([self.objectids[index] for index in indices])
+        result = np.zeros(self.shape, dtype=blocks[0].dtype)
+        for index, block in zip(indices, blocks):
+            lower = DistArray.compute_block_lower(index, self.shape,
+                                                  self.block_size)
+            upper = DistArray.compute_block_upper(index, self.shape,
+                                                  self.block_size)
+            result[tuple(slice(l, u) for (l, u) in zip(lower, upper))] = block
         return result
 
+    def iter_blocks(self, num_blocks_per_get=10):
+        """Iterate over the blocks of the array in row-major block order.
+
+        The blocks are fetched num_blocks_per_get at a time, so the whole array
+        never has to be held in memory at once.
+
+        Yields:
+            Pairs (index, block) of the index of a block in objectids and the
+                block itself.
+        """
+        indices = list(np.ndindex(*self.num_blocks))
+        for start in range(0, len(indices), num_blocks_per_get):
+            batch = indices[start:start + num_blocks_per_get]
+            blocks = ray.get([self.objectids[index] for index in batch])
+            for index, block in zip(batch, blocks):
+                yield index, block
+
     def __getitem__(self, sliced):
-        # TODO(rkn): Fix this, this is just a placeholder that should work but
-        # is inefficient.
-        a = self.assemble()
-        return a[sliced]
+        """Index the array, only fetching the blocks that the index touches.
+
+        Integers, slices (with any step) and Ellipsis are handled blockwise.
+        Other indices, like index arrays or np.newaxis, fall back to indexing
+        the assembled array.
+        """
+        selection = _selected_indices(sliced, self.shape)
+        if selection is None:
+            return self.assemble()[sliced]
+        # For each dimension, find the blocks that the selected indices fall
+        # in, along with the selected positions in the result and in the
+        # block. The selected indices are monotonic, so the indices in each
+        # block are contiguous in the result.
+        block_selections = []
+        for (indices, _), block_size in zip(selection, self.block_size):
+            block_indices, starts, counts = np.unique(
+                indices // block_size, return_index=True, return_counts=True)
+            dim_selection = []
+            for block_index, start, count in zip(block_indices, starts,
+                                                 counts):
+                positions = np.arange(start, start + count)
+                dim_selection.append(
+                    (block_index, positions,
+                     indices[positions] - block_index * block_size))
+            block_selections.append(dim_selection)
+        combinations = list(itertools.product(*block_selections))
+        # Fetch the relevant blocks with a single call to ray.get.
+        blocks = ray.get([
+            self.objectids[tuple(
+                block_index for (block_index, _, _) in combination)]
+            for combination in combinations
+        ])
+        if len(blocks) > 0:
+            dtype = blocks[0].dtype
+        else:
+            dtype = ray.get(self.objectids[(0, ) * self.ndim]).dtype
+        result = np.empty([len(indices) for indices, _ in selection], dtype)
+        for combination, block in zip(combinations, blocks):
+            result_positions = [positions for (_, positions, _) in combination]
+            block_positions = [positions for (_, _, positions) in combination]
+            result[np.ix_(*result_positions)] = block[np.ix_(*block_positions)]
+        # Remove the dimensions that were indexed with an integer.
+        return result[tuple(
+            slice(None) if keep_dim else 0 for (_, keep_dim) in selection)]
+
+
+def _selected_indices(sliced, shape):
+    """Compute the indices selected along each dimension by an index.
+
+    Args:
+        sliced: An index made of integers, slices and at most one Ellipsis.
+        shape: The shape of the array being indexed.
+
+    Returns:
+        A list with a pair (indices, keep_dim) for each dimension, where
+            indices is an array of the selected indices and keep_dim is False
+            if the dimension was indexed with an integer. None is returned if
+            the index contains anything else.
+    """
+    if not isinstance(sliced, tuple):
+        sliced = (sliced, )
+    ellipses = [i for i, s in enumerate(sliced) if s is Ellipsis]
+    if len(ellipses) > 1:
+        return None
+    if len(ellipses) == 1:
+        i = ellipses[0]
+        num_missing = len(shape) - len(sliced) + 1
+        sliced = (sliced[:i] + (slice(None), ) * max(num_missing, 0) +
+                  sliced[i + 1:])
+    if len(sliced) > len(shape):
+        return None
+    sliced = sliced + (slice(None), ) * (len(shape) - len(sliced))
+    selection = []
+    for s, size in zip(sliced, shape):
+        if isinstance(s, slice):
+            selection.append((np.arange(*s.indices(size)), True))
+        elif isinstance(s, numbers.Integral) and not isinstance(s, bool):
+            if not -size <= s < size:
+                raise IndexError("Index {} is out of bounds for a dimension "
+                                 "of size {}.".format(s, size))
+            selection.append((np.array([s % size]), False))
+        else:
+            return None
+    return selection
 
 
 @ray.remote
@@ -81,37 +215,41 @@ def assemble(a):
 
 # TODO(rkn): What should we call this method?
 @ray.remote
-def numpy_to_dist(a):
-    result = DistArray(a.shape)
+def numpy_to_dist(a, block_size=None):
+    result = DistArray(a.shape, block_size=block_size)
     for index in np.ndindex(*result.num_blocks):
-        lower = DistArray.compute_block_lower(index, a.shape)
-        upper = DistArray.compute_block_upper(index, a.shape)
-        result.objectids[index] = ray.put(
-            a[[slice(l, u) for (l, u) in zip(lower, upper)]])
+        lower = DistArray.compute_block_lower(index, a.shape,
+                                              result.block_size)
+        upper = DistArray.compute_block_upper(index, a.shape,
+                                              result.block_size)
+        result.objectids[index] = ray.put(a[tuple(
+            slice(l, u) for (l, u) in zip(lower, upper))])
     return result
 
 
 @ray.remote
-def zeros(shape, dtype_name="float"):
-    result = DistArray(shape)
+def zeros(shape, dtype_name="float", block_size=None):
+    result = DistArray(shape, block_size=block_size)
     for index in np.ndindex(*result.num_blocks):
         result.objectids[index] = ra.zeros.remote(
-            DistArray.compute_block_shape(index, shape), dtype_name=dtype_name)
+            DistArray.compute_block_shape(index, shape, result.block_size),
+            dtype_name=dtype_name)
     return result
 
 
 @ray.remote
-def ones(shape, dtype_name="float"):
-    result = DistArray(shape)
+def ones(shape, dtype_name="float", block_size=None):
+    result = DistArray(shape, block_size=block_size)
     for index in np.ndindex(*result.num_blocks):
         result.objectids[index] = ra.ones.remote(
-            DistArray.compute_block_shape(index, shape), dtype_name=dtype_name)
+            DistArray.compute_block_shape(index, shape, result.block_size),
+            dtype_name=dtype_name)
     return result
 
 
 @ray.remote
 def copy(a):
-    result = DistArray(a.shape)
+    result = DistArray(a.shape, block_size=a.block_size)
     for index in np.ndindex(*result.num_blocks):
         # We don't need to actually copy the objects because remote objects are
         # immutable.
@@ -119,16 +257,31 @@ def copy(a):
     return result
 
 
+def _diagonal_offset(index, shape, block_size):
+    """Return the offset of the diagonal in a block of a matrix.
+
+    The global diagonal of the matrix is the diagonal k of the block, in the
+    sense of np.eye, np.triu and np.tril. The second value returned is True
+    if the diagonal passes through the block.
+    """
+    lower = DistArray.compute_block_lower(index, shape, block_size)
+    upper = DistArray.compute_block_upper(index, shape, block_size)
+    k = lower[0] - lower[1]
+    return k, lower[0] < upper[1] and lower[1] < upper[0]
+
+
 @ray.remote
-def eye(dim1, dim2=-1, dtype_name="float"):
+def eye(dim1, dim2=-1, dtype_name="float", block_size=None):
     dim2 = dim1 if dim2 == -1 else dim2
     shape = [dim1, dim2]
-    result = DistArray(shape)
+    result = DistArray(shape, block_size=block_size)
     for (i, j) in np.ndindex(*result.num_blocks):
-        block_shape = DistArray.compute_block_shape([i, j], shape)
-        if i == j:
+        block_shape = DistArray.compute_block_shape([i, j], shape,
+                                                    result.block_size)
+        k, on_diagonal = _diagonal_offset([i, j], shape, result.block_size)
+        if on_diagonal:
             result.objectids[i, j] = ra.eye.remote(
-                block_shape[0], block_shape[1], dtype_name=dtype_name)
+                block_shape[0], block_shape[1], k=k, dtype_name=dtype_name)
         else:
             result.objectids[i, j] = ra.zeros.remote(
                 block_shape, dtype_name=dtype_name)
@@ -140,12 +293,14 @@ def triu(a):
     if a.ndim != 2:
         raise Exception("Input must have 2 dimensions, but a.ndim is "
                         "{}.".format(a.ndim))
-    result = DistArray(a.shape)
+    result = DistArray(a.shape, block_size=a.block_size)
     for (i, j) in np.ndindex(*result.num_blocks):
-        if i < j:
+        k, on_diagonal = _diagonal_offset([i, j], a.shape, a.block_size)
+        if on_diagonal:
+            result.objectids[i, j] = ra.triu.remote(a.objectids[i, j], k=k)
+        elif k < 0:
+            # The block is above the diagonal.
             result.objectids[i, j] = ra.copy.remote(a.objectids[i, j])
-        elif i == j:
-            result.objectids[i, j] = ra.triu.remote(a.objectids[i, j])
         else:
             result.objectids[i, j] = ra.zeros_like.remote(a.objectids[i, j])
     return result
@@ -156,17 +311,113 @@ def tril(a):
     if a.ndim != 2:
         raise Exception("Input must have 2 dimensions, but a.ndim is "
                         "{}.".format(a.ndim))
-    result = DistArray(a.shape)
+    result = DistArray(a.shape, block_size=a.block_size)
     for (i, j) in np.ndindex(*result.num_blocks):
-        if i > j:
+        k, on_diagonal = _diagonal_offset([i, j], a.shape, a.block_size)
+        if on_diagonal:
+            result.objectids[i, j] = ra.tril.remote(a.objectids[i, j], k=k)
+        elif k > 0:
+            # The block is below the diagonal.
             result.objectids[i, j] = ra.copy.remote(a.objectids[i, j])
-        elif i == j:
-            result.objectids[i, j] = ra.tril.remote(a.objectids[i, j])
         else:
             result.objectids[i, j] = ra.zeros_like.remote(a.objectids[i, j])
     return result
 
 
+@ray.remote
+def assemble_block(block_shape, pieces, *blocks):
+    """Assemble a block from pieces of other blocks.
+
+    Args:
+        block_shape: The shape of the block to assemble.
+        pieces: A list with a tuple (lower, upper, block_lower, block_upper)
+            for each block in blocks. The part of the block between
+            block_lower and block_upper is copied to the part of the result
+            between lower and upper.
+        blocks: The blocks to copy the pieces from.
+    """
+    result = np.empty(block_shape, dtype=blocks[0].dtype)
+    for (lower, upper, block_lower, block_upper), block in zip(pieces, blocks):
+        result[tuple(
+            slice(l, u) for (l, u) in zip(lower, upper))] = block[tuple(
+                slice(l, u) for (l, u) in zip(block_lower, block_upper))]
+    return result
+
+
+def _rechunk(a, block_size):
+    result = DistArray(a.shape, block_size=block_size)
+    if result.block_size == a.block_size:
+        result.objectids = np.copy(a.objectids)
+        return result
+    for index in np.ndindex(*result.num_blocks):
+        lower = DistArray.compute_block_lower(index, a.shape,
+                                              result.block_size)
+        upper = DistArray.compute_block_upper(index, a.shape,
+                                              result.block_size)
+        # The indices of the blocks of a that overlap with this block.
+        overlapping = list(
+            itertools.product(*[
+                range(l // size, (u - 1) // size + 1)
+                for (l, u, size) in zip(lower, upper, a.block_size)
+            ]))
+        pieces = []
+        for a_index in overlapping:
+            a_lower = DistArray.compute_block_lower(a_index, a.shape,
+                                                    a.block_size)
+            a_upper = DistArray.compute_block_upper(a_index, a.shape,
+                                                    a.block_size)
+            if len(overlapping) == 1 and (a_lower, a_upper) == (lower, upper):
+                # The block is unchanged, so we can reuse it.
+                break
+            piece_lower = [max(x, y) for (x, y) in zip(lower, a_lower)]
+            piece_upper = [min(x, y) for (x, y) in zip(upper, a_upper)]
+            pieces.append(([x - y for (x, y) in zip(piece_lower, lower)], [
+                x - y for (x, y) in zip(piece_upper, lower)
+            ], [x - y for (x, y) in zip(piece_lower, a_lower)],
+                           [x - y for (x, y) in zip(piece_upper, a_lower)]))
+        if len(pieces) == 0:
+            result.objectids[index] = a.objectids[overlapping[0]]
+        else:
+            result.objectids[index] = assemble_block.remote(
+                [u - l for (l, u) in zip(lower, upper)], pieces,
+                *[a.objectids[a_index] for a_index in overlapping])
+    return result
+
+
+@ray.remote
+def rechunk(a, block_size):
+    """Change the block size of a distributed array.
+
+    Blocks that don't change are reused, and every other block of the result
+    is assembled by one task from the blocks of a that it overlaps.
+
+    Args:
+        a: The distributed array.
+        block_size: The new block size, either as a list with one entry per
+            dimension or as an int that is used for all dimensions.
+    """
+    return _rechunk(a, block_size)
+
+
+def _tree_reduce(object_ids, combine):
+    """Combine object IDs pairwise in a balanced tree.
+
+    The function combine takes two object IDs and submits a task that
+    combines them. This launches len(object_ids) - 1 tasks in about
+    log2(len(object_ids)) rounds, so that no single task has to combine all of
+    the objects.
+    """
+    object_ids = list(object_ids)
+    while len(object_ids) > 1:
+        reduced = [
+            combine(x, y) for (x, y) in zip(object_ids[0::2], object_ids[1::2])
+        ]
+        if len(object_ids) % 2 == 1:
+            reduced.append(object_ids[-1])
+        object_ids = reduced
+    return object_ids[0]
+
+
 @ray.remote
 def blockwise_dot(*matrices):
     n = len(matrices)
@@ -181,7 +432,16 @@ def blockwise_dot(*matrices):
 
 
 @ray.remote
-def dot(a, b):
+def dot(a, b, inner_blocks_per_task=1):
+    """Multiply two distributed matrices.
+
+    Each block of the result is computed as a sum of partial products. A leaf
+    task multiplies inner_blocks_per_task pairs of blocks, and the partial
+    products are summed with a tree reduction, so that large inner dimensions
+    are parallelized instead of being summed serially by one task. If the
+    blocks of b along its first dimension don't match the blocks of a along
+    its second dimension, b is rechunked first.
+    """
     if a.ndim != 2:
         raise Exception("dot expects its arguments to be 2-dimensional, but "
                         "a.ndim = {}.".format(a.ndim))
@@ -192,11 +452,18 @@ def dot(a, b):
         raise Exception("dot expects a.shape[1] to equal b.shape[0], but "
                         "a.shape = {} and b.shape = {}.".format(
                             a.shape, b.shape))
+    if a.block_size[1] != b.block_size[0]:
+        b = _rechunk(b, [a.block_size[1], b.block_size[1]])
     shape = [a.shape[0], b.shape[1]]
-    result = DistArray(shape)
+    result = DistArray(shape, block_size=[a.block_size[0], b.block_size[1]])
+    num_inner_blocks = a.num_blocks[1]
     for (i, j) in np.ndindex(*result.num_blocks):
-        args = list(a.objectids[i, :]) + list(b.objectids[:, j])
-        result.objectids[i, j] = blockwise_dot.remote(*args)
+        partial_products = []
+        for k in range(0, num_inner_blocks, inner_blocks_per_task):
+            inner = slice(k, k + inner_blocks_per_task)
+            args = list(a.objectids[i, inner]) + list(b.objectids[inner, j])
+            partial_products.append(blockwise_dot.remote(*args))
+        result.objectids[i, j] = _tree_reduce(partial_products, ra.add.remote)
     return result
 
 
@@ -235,10 +502,11 @@ def subblocks(a, *ranges):
                             "the {}th range is {}, and a.num_blocks = {}."
                             .format(i, ranges[i], a.num_blocks))
     last_index = [r[-1] for r in ranges]
-    last_block_shape = DistArray.compute_block_shape(last_index, a.shape)
-    shape = [(len(ranges[i]) - 1) * BLOCK_SIZE + last_block_shape[i]
+    last_block_shape = DistArray.compute_block_shape(last_index, a.shape,
+                                                     a.block_size)
+    shape = [(len(ranges[i]) - 1) * a.block_size[i] + last_block_shape[i]
              for i in range(a.ndim)]
-    result = DistArray(shape)
+    result = DistArray(shape, block_size=a.block_size)
     for index in np.ndindex(*result.num_blocks):
         result.objectids[index] = a.objectids[tuple(
             ranges[i][index[i]] for i in range(a.ndim))]
@@ -251,7 +519,9 @@ def transpose(a):
         raise Exception("transpose expects its argument to be 2-dimensional, "
                         "but a.ndim = {}, a.shape = {}.".format(
                             a.ndim, a.shape))
-    result = DistArray([a.shape[1], a.shape[0]])
+    result = DistArray(
+        [a.shape[1], a.shape[0]],
+        block_size=[a.block_size[1], a.block_size[0]])
     for i in range(result.num_blocks[0]):
         for j in range(result.num_blocks[1]):
             result.objectids[i, j] = ra.transpose.remote(a.objectids[j, i])
@@ -265,7 +535,9 @@ def add(x1, x2):
         raise Exception("add expects arguments `x1` and `x2` to have the same "
                         "shape, but x1.shape = {}, and x2.shape = {}.".format(
                             x1.shape, x2.shape))
-    result = DistArray(x1.shape)
+    if x1.block_size != x2.block_size:
+        x2 = _rechunk(x2, x1.block_size)
+    result = DistArray(x1.shape, block_size=x1.block_size)
     for index in np.ndindex(*result.num_blocks):
         result.objectids[index] = ra.add.remote(x1.objectids[index],
                                                 x2.objectids[index])
@@ -279,7 +551,9 @@ def subtract(x1, x2):
         raise Exception("subtract expects arguments `x1` and `x2` to have the "
                         "same shape, but x1.shape = {}, and x2.shape = {}."
                         .format(x1.shape, x2.shape))
-    result = DistArray(x1.shape)
+    if x1.block_size != x2.block_size:
+        x2 = _rechunk(x2, x1.block_size)
+    result = DistArray(x1.shape, block_size=x1.block_size)
     for index in np.ndindex(*result.num_blocks):
         result.objectids[index] = ra.subtract.remote(x1.objectids[index],
                                                      x2.objectids[index])
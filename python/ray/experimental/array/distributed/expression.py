@@ -0,0 +1,319 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import numpy as np
+import ray
+
+from .core import DistArray, _rechunk, _tree_reduce
+
+__all__ = [
+    "Expression", "lazy", "apply", "evaluate", "sum", "mean", "max", "min"
+]
+
+# The ufunc that combines the partial results of each reduction.
+_REDUCTION_COMBINERS = {"sum": "add", "max": "maximum", "min": "minimum"}
+
+
+class Expression(object):
+    """A lazy elementwise expression over distributed arrays.
+
+    Expressions are built from distributed arrays and scalars with NumPy
+    ufuncs, either with apply, with arithmetic operators, or by calling a
+    ufunc like np.exp on an expression directly. Nothing is computed until the
+    expression is passed to evaluate or to a reduction, which run the whole
+    chain of ufuncs in a single task per block, so no intermediate
+    distributed arrays are created.
+
+    Attributes:
+        ufunc_name: The name of the NumPy ufunc applied to args, or None if
+            the expression just wraps one distributed array.
+        args: The arguments of the ufunc. These are distributed arrays,
+            expressions or scalars.
+        shape: The shape of the result, or None if there are no distributed
+            arrays in the expression.
+    """
+
+    def __init__(self, ufunc_name, args):
+        self.ufunc_name = ufunc_name
+        self.args = list(args)
+        self.shape = None
+        for arg in self.args:
+            if isinstance(arg, (DistArray, Expression)):
+                if arg.shape is None:
+                    continue
+                if self.shape is None:
+                    self.shape = list(arg.shape)
+                elif list(arg.shape) != self.shape:
+                    raise Exception("The distributed arrays in an expression "
+                                    "must have the same shape, but the shapes "
+                                    "{} and {} were found.".format(
+                                        self.shape, list(arg.shape)))
+            elif np.ndim(arg) != 0:
+                raise Exception("The arguments of an expression must be "
+                                "distributed arrays, expressions or scalars, "
+                                "but an argument of type {} was found.".format(
+                                    type(arg)))
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        if method != "__call__" or kwargs:
+            return NotImplemented
+        return apply(ufunc, *inputs)
+
+    def __add__(self, other):
+        return apply(np.add, self, other)
+
+    def __radd__(self, other):
+        return apply(np.add, other, self)
+
+    def __sub__(self, other):
+        return apply(np.subtract, self, other)
+
+    def __rsub__(self, other):
+        return apply(np.subtract, other, self)
+
+    def __mul__(self, other):
+        return apply(np.multiply, self, other)
+
+    def __rmul__(self, other):
+        return apply(np.multiply, other, self)
+
+    def __truediv__(self, other):
+        return apply(np.true_divide, self, other)
+
+    def __rtruediv__(self, other):
+        return apply(np.true_divide, other, self)
+
+    def __div__(self, other):
+        return apply(np.divide, self, other)
+
+    def __rdiv__(self, other):
+        return apply(np.divide, other, self)
+
+    def __pow__(self, other):
+        return apply(np.power, self, other)
+
+    def __rpow__(self, other):
+        return apply(np.power, other, self)
+
+    def __neg__(self):
+        return apply(np.negative, self)
+
+    def __abs__(self):
+        return apply(np.absolute, self)
+
+
+def lazy(a):
+    """Wrap a distributed array in an expression."""
+    if not isinstance(a, DistArray):
+        raise Exception("lazy expects a DistArray, but got {}.".format(
+            type(a)))
+    return Expression(None, [a])
+
+
+def apply(ufunc, *args):
+    """Lazily apply a NumPy ufunc to distributed arrays and scalars.
+
+    Args:
+        ufunc: A NumPy ufunc with a single output, like np.exp or np.add.
+        args: The arguments of the ufunc. These can be distributed arrays,
+            expressions or scalars. The distributed arrays must all have the
+            same shape.
+
+    Returns:
+        An expression for the result.
+    """
+    if (not isinstance(ufunc, np.ufunc)
+            or getattr(np, ufunc.__name__, None) is not ufunc):
+        raise Exception(
+            "apply expects a NumPy ufunc, but got {}.".format(ufunc))
+    if ufunc.nout != 1:
+        raise Exception("apply only supports ufuncs with one output, but {} "
+                        "has {} outputs.".format(ufunc.__name__, ufunc.nout))
+    if len(args) != ufunc.nin:
+        raise Exception("The ufunc {} takes {} arguments, but {} were "
+                        "given.".format(ufunc.__name__, ufunc.nin, len(args)))
+    return Expression(ufunc.__name__, args)
+
+
+def _compile(expression, arrays):
+    """Convert an expression into a program for _run.
+
+    The distributed arrays in the expression are appended to arrays (each one
+    only once), and are referred to by their position in arrays.
+    """
+    if isinstance(expression, DistArray):
+        for i, array in enumerate(arrays):
+            if array is expression:
+                return ("block", i)
+        arrays.append(expression)
+        return ("block", len(arrays) - 1)
+    if isinstance(expression, Expression):
+        if expression.ufunc_name is None:
+            return _compile(expression.args[0], arrays)
+        return ("ufunc", expression.ufunc_name,
+                [_compile(arg, arrays) for arg in expression.args])
+    return ("value", expression)
+
+
+def _compile_blockwise(expression):
+    """Compile an expression whose distributed arrays are blocked alike.
+
+    Returns:
+        The program and the list of distributed arrays that it refers to. The
+            arrays are rechunked to the block size of the first one if needed.
+    """
+    arrays = []
+    program = _compile(expression, arrays)
+    if len(arrays) == 0:
+        raise Exception("The expression does not contain any distributed "
+                        "arrays.")
+    block_size = arrays[0].block_size
+    arrays = [
+        a if a.block_size == block_size else _rechunk(a, block_size)
+        for a in arrays
+    ]
+    return program, arrays
+
+
+def _run(program, blocks):
+    kind = program[0]
+    if kind == "block":
+        return blocks[program[1]]
+    if kind == "value":
+        return program[1]
+    ufunc = getattr(np, program[1])
+    return ufunc(*[_run(arg, blocks) for arg in program[2]])
+
+
+@ray.remote
+def evaluate_block(program, *blocks):
+    return _run(program, blocks)
+
+
+@ray.remote
+def reduce_block(program, reduction, axis, *blocks):
+    return getattr(np, reduction)(_run(program, blocks), axis=axis)
+
+
+@ray.remote
+def combine(ufunc_name, x1, x2):
+    return getattr(np, ufunc_name)(x1, x2)
+
+
+def _evaluate(expression):
+    program, arrays = _compile_blockwise(expression)
+    result = DistArray(arrays[0].shape, block_size=arrays[0].block_size)
+    for index in np.ndindex(*result.num_blocks):
+        result.objectids[index] = evaluate_block.remote(
+            program, *[a.objectids[index] for a in arrays])
+    return result
+
+
+@ray.remote
+def evaluate(expression):
+    """Compute an expression with a single task per block.
+
+    Args:
+        expression: An expression or a distributed array.
+
+    Returns:
+        A distributed array with the block size of the first distributed
+            array in the expression.
+    """
+    return _evaluate(expression)
+
+
+def _reduce(a, reduction, axis):
+    program, arrays = _compile_blockwise(a)
+    shape = list(arrays[0].shape)
+    block_size = arrays[0].block_size
+    if axis is not None:
+        if not -len(shape) <= axis < len(shape):
+            raise Exception("The axis {} is out of bounds for an array with "
+                            "{} dimensions.".format(axis, len(shape)))
+        axis %= len(shape)
+    # Reduce each block, evaluating the expression in the same task.
+    partials = np.empty(arrays[0].num_blocks, dtype=object)
+    for index in np.ndindex(*partials.shape):
+        partials[index] = reduce_block.remote(
+            program, reduction, axis, *[a.objectids[index] for a in arrays])
+
+    combiner = _REDUCTION_COMBINERS[reduction]
+
+    def combine_partials(x1, x2):
+        return combine.remote(combiner, x1, x2)
+
+    if axis is None:
+        return ray.get(_tree_reduce(partials.flatten(), combine_partials))
+    result = DistArray(
+        shape[:axis] + shape[axis + 1:],
+        block_size=block_size[:axis] + block_size[axis + 1:])
+    for index in np.ndindex(*result.num_blocks):
+        partials_along_axis = partials[index[:axis] + (slice(None), ) +
+                                       index[axis:]]
+        result.objectids[index] = _tree_reduce(partials_along_axis,
+                                               combine_partials)
+    return result
+
+
+@ray.remote
+def sum(a, axis=None):
+    """Sum a distributed array or an expression with a tree reduction.
+
+    Args:
+        a: A distributed array or an expression.
+        axis: The axis to sum over, or None to sum over all of the elements.
+
+    Returns:
+        The sum if axis is None, and a distributed array otherwise.
+    """
+    return _reduce(a, "sum", axis)
+
+
+@ray.remote
+def mean(a, axis=None):
+    """Average a distributed array or an expression with a tree reduction.
+
+    Args:
+        a: A distributed array or an expression.
+        axis: The axis to average over, or None to average all of the
+            elements.
+
+    Returns:
+        The mean if axis is None, and a distributed array otherwise.
+    """
+    total = _reduce(a, "sum", axis)
+    if axis is None:
+        return total / np.prod(a.shape)
+    return _evaluate(apply(np.true_divide, total, a.shape[axis]))
+
+
+@ray.remote
+def max(a, axis=None):
+    """Take the maximum of a distributed array or an expression.
+
+    Args:
+        a: A distributed array or an expression.
+        axis: The axis to take the maximum over, or None to take the maximum
+            of all of the elements.
+
+    Returns:
+        The maximum if axis is None, and a distributed array otherwise.
+    """
+    return _reduce(a, "max", axis)
+
+
+@ray.remote
+def min(a, axis=None):
+    """Take the minimum of a distributed array or an expression.
+
+    Args:
+        a: A distributed array or an expression.
+        axis: The axis to take the minimum over, or None to take the minimum
+            of all of the elements.
+
+    Returns:
+        The minimum if axis is None, and a distributed array otherwise.
+    """
+    return _reduce(a, "min", axis)
@@ -33,6 +33,12 @@ def tsqr(a):
     if a.num_blocks[1] != 1:
         raise Exception("tsqr requires a.num_blocks[1] == 1, but a.num_blocks "
                         "is {}".format(a.num_blocks))
+    # The reconstruction of q below assumes that the r factor of every row
+    # block is square.
+    if a.num_blocks[0] > 1 and a.block_size[0] < a.shape[1]:
+        raise Exception("tsqr requires a.block_size[0] >= a.shape[1] when a "
+                        "has more than one row block, but a.block_size is {} "
+                        "and a.shape is {}".format(a.block_size, a.shape))
 
     num_blocks = a.num_blocks[0]
     K = int(np.ceil(np.log2(num_blocks))) + 1
@@ -60,9 +66,9 @@ def tsqr(a):
         q_shape = a.shape
     else:
         q_shape = [a.shape[0], a.shape[0]]
-    q_num_blocks = core.DistArray.compute_num_blocks(q_shape)
+    q_num_blocks = core.DistArray.compute_num_blocks(q_shape, a.block_size)
     q_objectids = np.empty(q_num_blocks, dtype=object)
-    q_result = core.DistArray(q_shape, q_objectids)
+    q_result = core.DistArray(q_shape, q_objectids, block_size=a.block_size)
 
     # reconstruct output
     for i in range(num_blocks):
@@ -71,10 +77,10 @@ def tsqr(a):
         for j in range(1, K):
             if np.mod(ith_index, 2) == 0:
                 lower = [0, 0]
-                upper = [a.shape[1], core.BLOCK_SIZE]
+                upper = [a.shape[1], a.block_size[1]]
             else:
                 lower = [a.shape[1], 0]
-                upper = [2 * a.shape[1], core.BLOCK_SIZE]
+                upper = [2 * a.shape[1], a.block_size[1]]
             ith_index //= 2
             q_block_current = ra.dot.remote(
                 q_block_current,
@@ -102,6 +108,7 @@ def modified_lu(q):
             and a a vector representing a diagonal matrix s such that
             q - s = l * u.
     """
+    block_size = q.block_size
     q = q.assemble()
     m, b = q.shape[0], q.shape[1]
     S = np.zeros(b)
@@ -122,7 +129,8 @@ def modified_lu(q):
         L[i, i] = 1
     U = np.triu(q_work)[:b, :]
     # TODO(rkn): Get rid of the put below.
-    return ray.get(core.numpy_to_dist.remote(ray.put(L))), U, S
+    return ray.get(
+        core.numpy_to_dist.remote(ray.put(L), block_size=block_size)), U, S
 
 
 @ray.remote(num_return_vals=2)
@@ -166,6 +174,9 @@ def qr_helper2(y_ri, a_rc):
 # http://www.eecs.berkeley.edu/Pubs/TechRpts/2013/EECS-2013-175.pdf.
 @ray.remote(num_return_vals=2)
 def qr(a):
+    # The blocks of the intermediate results are assumed to line up with
+    # the blocks of a, so a is converted to the default block size.
+    a = core._rechunk(a, core.BLOCK_SIZE)
 
     m, n = a.shape[0], a.shape[1]
     k = min(m, n)
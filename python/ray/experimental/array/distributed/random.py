@@ -10,11 +10,11 @@ from .core import DistArray
 
 
 @ray.remote
-def normal(shape):
-    num_blocks = DistArray.compute_num_blocks(shape)
+def normal(shape, block_size=None):
+    num_blocks = DistArray.compute_num_blocks(shape, block_size)
     objectids = np.empty(num_blocks, dtype=object)
     for index in np.ndindex(*num_blocks):
         objectids[index] = ra.random.normal.remote(
-            DistArray.compute_block_shape(index, shape))
-    result = DistArray(shape, objectids)
+            DistArray.compute_block_shape(index, shape, block_size))
+    result = DistArray(shape, objectids, block_size=block_size)
     return result
@@ -57,53 +57,75 @@ def flush_task_and_object_metadata_unsafe():
     """
     ray.worker.global_worker.check_connected()
 
-    def flush_shard(redis_client):
+    def delete_keys(redis_client, pattern):
+        # Delete the keys found by each SCAN batch in one round trip.
+        num_deleted = 0
+        keys = []
+        for key in redis_client.scan_iter(match=pattern, count=1000):
+            keys.append(key)
+            if len(keys) == 1000:
+                num_deleted += redis_client.delete(*keys)
+                keys = []
+        if len(keys) > 0:
+            num_deleted += redis_client.delete(*keys)
+        return num_deleted
+
+    def flush_shard(shard_index, redis_client):
         # Flush the task table. Note that this also flushes the driver tasks
         # which may be undesirable.
-        num_task_keys_deleted = 0
-        for key in redis_client.scan_iter(match=TASK_PREFIX + b"*"):
-            num_task_keys_deleted += redis_client.delete(key)
+        num_task_keys_deleted = delete_keys(redis_client, TASK_PREFIX + b"*")
         print("Deleted {} task keys from Redis.".format(num_task_keys_deleted))
 
         # Flush the object information.
-        num_object_keys_deleted = 0
-        for key in redis_client.scan_iter(match=OBJECT_INFO_PREFIX + b"*"):
-            num_object_keys_deleted += redis_client.delete(key)
+        num_object_keys_deleted = delete_keys(redis_client,
+                                              OBJECT_INFO_PREFIX + b"*")
         print("Deleted {} object info keys from Redis.".format(
             num_object_keys_deleted))
 
         # Flush the object locations.
-        num_object_location_keys_deleted = 0
-        for key in redis_client.scan_iter(match=OBJECT_LOCATION_PREFIX + b"*"):
-            num_object_location_keys_deleted += redis_client.delete(key)
+        num_object_location_keys_deleted = delete_keys(
+            redis_client, OBJECT_LOCATION_PREFIX + b"*")
         print("Deleted {} object location keys from Redis.".format(
             num_object_location_keys_deleted))
 
-    # Loop over the shards and flush all of them.
-    for redis_client in ray.worker.global_state.redis_clients:
-        flush_shard(redis_client)
+    # Flush all of the shards concurrently.
+    ray.worker.global_state._map_shards(flush_shard)
 
 
 def _task_table_shard(shard_index):
     redis_client = ray.global_state.redis_clients[shard_index]
-    task_table_keys = redis_client.keys(TASK_PREFIX + b"*")
+    task_ids = [
+        ray.ObjectID(key[len(TASK_PREFIX):])
+        for key in redis_client.scan_iter(match=TASK_PREFIX + b"*")
+    ]
+    responses = ray.global_state._execute_pipelined(redis_client, [
+        ray.global_state._task_table_command(task_id) for task_id in task_ids
+    ])
     results = {}
-    for key in task_table_keys:
-        task_id_binary = key[len(TASK_PREFIX):]
-        results[binary_to_hex(task_id_binary)] = ray.global_state._task_table(
-            ray.ObjectID(task_id_binary))
+    for task_id, response in zip(task_ids, responses):
+        results[binary_to_hex(
+            task_id.id())] = (ray.global_state._parse_task_table(
+                task_id, response))
 
     return results
 
 
 def _object_table_shard(shard_index):
     redis_client = ray.global_state.redis_clients[shard_index]
-    object_table_keys = redis_client.keys(OBJECT_LOCATION_PREFIX + b"*")
+    object_ids = [
+        ray.ObjectID(key[len(OBJECT_LOCATION_PREFIX):])
+        for key in redis_client.scan_iter(match=OBJECT_LOCATION_PREFIX + b"*")
+    ]
+    commands = []
+    for object_id in object_ids:
+        commands.extend(ray.global_state._object_table_commands(object_id))
+    responses = ray.global_state._execute_pipelined(redis_client, commands)
+    num_commands = len(commands) // max(len(object_ids), 1)
     results = {}
-    for key in object_table_keys:
-        object_id_binary = key[len(OBJECT_LOCATION_PREFIX):]
-        results[binary_to_hex(object_id_binary)] = (
-            ray.global_state._object_table(ray.ObjectID(object_id_binary)))
+    for i, object_id in enumerate(object_ids):
+        results[binary_to_hex(
+            object_id.id())] = (ray.global_state._parse_object_table(
+                responses[i * num_commands:(i + 1) * num_commands]))
 
     return results
 
@@ -165,9 +187,11 @@ def flush_finished_tasks_unsafe():
     """
     ray.worker.global_worker.check_connected()
 
-    for shard_index in range(len(ray.global_state.redis_clients)):
+    def flush_shard(shard_index, _):
         _flush_finished_tasks_unsafe_shard(shard_index)
 
+    ray.global_state._map_shards(flush_shard)
+
 
 def flush_evicted_objects_unsafe():
     """This removes some critical state from the Redis shards.
@@ -182,5 +206,7 @@ def flush_evicted_objects_unsafe():
     """
     ray.worker.global_worker.check_connected()
 
-    for shard_index in range(len(ray.global_state.redis_clients)):
+    def flush_shard(shard_index, _):
         _flush_evicted_objects_unsafe_shard(shard_index)
+
+    ray.global_state._map_shards(flush_shard)
@@ -6,9 +6,11 @@ import copy
 from collections import defaultdict
 import heapq
 import json
+from multiprocessing.pool import ThreadPool
 import os
 import redis
 import sys
+import threading
 import time
 
 import ray
@@ -36,6 +38,92 @@ TASK_STATUS_MAPPING = {
     TASK_STATUS_RECONSTRUCTING: "RECONSTRUCTING",
 }
 
+# Colors are specified at
+# https://github.com/catapult-project/catapult/blob/master/tracing/tracing/base/color_scheme.html.  # noqa: E501
+DEFAULT_COLOR_MAPPING = defaultdict(
+    lambda: "generic_work", {
+        "get_task": "cq_build_abandoned",
+        "task": "rail_response",
+        "task:deserialize_arguments": "rail_load",
+        "task:execute": "rail_animation",
+        "task:store_outputs": "rail_idle",
+        "wait_for_function": "detailed_memory_dump",
+        "ray.get": "good",
+        "ray.put": "terrible",
+        "ray.wait": "vsync_highlight_color",
+        "submit_task": "background_memory_dump",
+        "fetch_and_run_function": "detailed_memory_dump",
+        "register_remote_function": "detailed_memory_dump",
+    })
+
+
+def _seconds_to_microseconds(time_in_seconds):
+    return 10**6 * time_in_seconds
+
+
+def _profile_event_to_trace_event(event):
+    """Convert a profile event to the chrome tracing format.
+
+    Args:
+        event: A profile event as returned by GlobalState.profile_table.
+
+    Returns:
+        A dictionary that can be loaded by chrome://tracing.
+    """
+    trace_event = {
+        # The category of the event.
+        "cat": event["event_type"],
+        # The string displayed on the event.
+        "name": event["event_type"],
+        # The identifier for the group of rows that the event appears in.
+        "pid": event["node_ip_address"],
+        # The identifier for the row that the event appears in.
+        "tid": event["component_type"] + ":" + event["component_id"],
+        # The start time in microseconds.
+        "ts": _seconds_to_microseconds(event["start_time"]),
+        # The duration in microseconds.
+        "dur": _seconds_to_microseconds(event["end_time"] -
+                                        event["start_time"]),
+        # What is this?
+        "ph": "X",
+        # This is the name of the color to display the box in.
+        "cname": DEFAULT_COLOR_MAPPING[event["event_type"]],
+        # The extra user-defined data.
+        "args": event["extra_data"],
+    }
+
+    # Modify the json with the additional user-defined extra data. This can be
+    # used to add fields or override existing fields.
+    if "cname" in event["extra_data"]:
+        trace_event["cname"] = event["extra_data"]["cname"]
+    if "name" in event["extra_data"]:
+        trace_event["name"] = event["extra_data"]["name"]
+
+    return trace_event
+
+
+class _ChromeTraceWriter(object):
+    """Write a JSON list of trace events to a file one event at a time.
+
+    Attributes:
+        outfile: The file object to write to.
+        num_events (int): The number of events written so far.
+    """
+
+    def __init__(self, outfile):
+        self.outfile = outfile
+        self.num_events = 0
+        self.outfile.write("[")
+
+    def write(self, event):
+        if self.num_events > 0:
+            self.outfile.write(", ")
+        json.dump(event, self.outfile)
+        self.num_events += 1
+
+    def close(self):
+        self.outfile.write("]")
+
 
 class GlobalState(object):
     """A class used to interface with the Ray control state.
@@ -58,6 +146,10 @@ class GlobalState(object):
         self.redis_clients = None
         # True if we are using the raylet code path and false otherwise.
         self.use_raylet = None
+        # A pool with one thread per shard used to query the shards
+        # concurrently. This is created lazily.
+        self._shard_pool = None
+        self._shard_pool_lock = threading.Lock()
 
     def _check_connected(self):
         """Check that the object has been initialized before it is used.
@@ -158,6 +250,85 @@ class GlobalState(object):
             self.redis_clients)]
         return client.execute_command(*args)
 
+    def _map_shards(self, function):
+        """Call a function on every Redis shard concurrently.
+
+        Redis clients are thread-safe, so each shard is queried from its own
+        thread and the total latency is that of the slowest shard rather than
+        the sum over all shards.
+
+        Args:
+            function: A function that is called as function(shard_index,
+                redis_client) for each shard. It must not call _map_shards
+                itself.
+
+        Returns:
+            The list of values returned by the function, ordered by shard.
+        """
+        num_shards = len(self.redis_clients)
+        if num_shards == 1:
+            return [function(0, self.redis_clients[0])]
+        with self._shard_pool_lock:
+            if self._shard_pool is None:
+                self._shard_pool = ThreadPool(num_shards)
+
+        def call_on_shard(shard_index):
+            return function(shard_index, self.redis_clients[shard_index])
+
+        return self._shard_pool.map(call_on_shard, range(num_shards))
+
+    def _execute_pipelined(self, redis_client, commands):
+        """Execute a list of Redis commands in one round trip.
+
+        Args:
+            redis_client: The client of the Redis server to run the commands
+                on.
+            commands: A list of tuples of command arguments.
+
+        Returns:
+            The list of values returned by the commands.
+        """
+        if len(commands) == 0:
+            return []
+        pipe = redis_client.pipeline(transaction=False)
+        for command in commands:
+            pipe.execute_command(*command)
+        return pipe.execute()
+
+    def _execute_commands(self, keys, commands):
+        """Execute many Redis commands, each on the shard of its key.
+
+        The commands are pipelined per shard and the shards are queried
+        concurrently.
+
+        Args:
+            keys: A list of the object IDs or task IDs that the commands are
+                about.
+            commands: A list of tuples of command arguments, one per key.
+
+        Returns:
+            The list of values returned by the commands, in the same order as
+                the commands.
+        """
+        positions_per_shard = defaultdict(list)
+        for position, key in enumerate(keys):
+            positions_per_shard[key.redis_shard_hash() % len(
+                self.redis_clients)].append(position)
+
+        def execute_on_shard(shard_index, redis_client):
+            return self._execute_pipelined(redis_client, [
+                commands[position]
+                for position in positions_per_shard[shard_index]
+            ])
+
+        results = len(commands) * [None]
+        for shard_index, shard_results in enumerate(
+                self._map_shards(execute_on_shard)):
+            for position, result in zip(positions_per_shard[shard_index],
+                                        shard_results):
+                results[position] = result
+        return results
+
     def _keys(self, pattern):
         """Execute the KEYS command on all Redis shards.
 
@@ -168,29 +339,84 @@ class GlobalState(object):
             The concatenated list of results from all shards.
         """
         result = []
-        for client in self.redis_clients:
-            result.extend(list(client.scan_iter(match=pattern)))
+        for keys in self._map_shards(
+                lambda _, client: list(client.scan_iter(match=pattern))):
+            result.extend(keys)
         return result
 
-    def _object_table(self, object_id):
-        """Fetch and parse the object table information for a single object ID.
+    def _iter_keys(self, pattern):
+        """Lazily iterate over the keys matching a pattern on all shards.
+
+        Unlike _keys, this does not build the full list of keys up front, so
+        callers can process one key at a time.
 
         Args:
-            object_id_binary: A string of bytes with the object ID to get
-                information about.
+            pattern: The SCAN pattern to query.
 
         Returns:
-            A dictionary with information about the object ID in question.
+            A generator over the matching keys.
         """
-        # Allow the argument to be either an ObjectID or a hex string.
-        if not isinstance(object_id, ray.ObjectID):
-            object_id = ray.ObjectID(hex_to_binary(object_id))
+        for client in self.redis_clients:
+            for key in client.scan_iter(match=pattern):
+                yield key
 
-        # Return information about a single object ID.
+    def _scan_page(self, pattern, cursor, page_size):
+        """Scan one page of keys matching a pattern.
+
+        The shards are scanned one after the other with SCAN, so no single
+        call blocks a shard for long.
+
+        Args:
+            pattern: The SCAN pattern to query.
+            cursor: None to start a new scan, or the cursor returned by the
+                previous call to continue it.
+            page_size: A hint for the number of keys to return.
+
+        Returns:
+            A tuple of the index of the scanned shard, the list of keys found
+                on it (possibly empty) and the cursor to pass to the next call,
+                which is None once every shard has been scanned.
+        """
+        shard_index, shard_cursor = cursor if cursor is not None else (0, 0)
+        shard_cursor, keys = self.redis_clients[shard_index].scan(
+            cursor=shard_cursor, match=pattern, count=page_size)
+        if shard_cursor != 0:
+            next_cursor = (shard_index, shard_cursor)
+        elif shard_index + 1 < len(self.redis_clients):
+            next_cursor = (shard_index + 1, 0)
+        else:
+            next_cursor = None
+        return shard_index, keys, next_cursor
+
+    def _object_table_commands(self, object_id):
+        """Return the Redis commands needed to look up an object.
+
+        Args:
+            object_id: The ObjectID to look up.
+
+        Returns:
+            A list of tuples of command arguments. The values they return
+                should be passed to _parse_object_table.
+        """
+        if not self.use_raylet:
+            return [("RAY.OBJECT_TABLE_LOOKUP", object_id.id()),
+                    ("RAY.RESULT_TABLE_LOOKUP", object_id.id())]
+        else:
+            return [("RAY.TABLE_LOOKUP", ray.gcs_utils.TablePrefix.OBJECT, "",
+                     object_id.id())]
+
+    def _parse_object_table(self, responses):
+        """Parse the values returned by the _object_table_commands commands.
+
+        Args:
+            responses: The list of values returned by the commands.
+
+        Returns:
+            A dictionary with information about the object ID in question.
+        """
         if not self.use_raylet:
             # Use the non-raylet code path.
-            object_locations = self._execute_command(
-                object_id, "RAY.OBJECT_TABLE_LOOKUP", object_id.id())
+            object_locations, result_table_response = responses
             if object_locations is not None:
                 manager_ids = [
                     binary_to_hex(manager_id)
@@ -199,8 +425,6 @@ class GlobalState(object):
             else:
                 manager_ids = None
 
-            result_table_response = self._execute_command(
-                object_id, "RAY.RESULT_TABLE_LOOKUP", object_id.id())
             result_table_message = (
                 ray.gcs_utils.ResultTableReply.GetRootAsResultTableReply(
                     result_table_response, 0))
@@ -215,9 +439,7 @@ class GlobalState(object):
 
         else:
             # Use the raylet code path.
-            message = self._execute_command(object_id, "RAY.TABLE_LOOKUP",
-                                            ray.gcs_utils.TablePrefix.OBJECT,
-                                            "", object_id.id())
+            message, = responses
             result = []
             gcs_entry = ray.gcs_utils.GcsTableEntry.GetRootAsGcsTableEntry(
                 message, 0)
@@ -235,6 +457,86 @@ class GlobalState(object):
 
         return result
 
+    def _object_table(self, object_id):
+        """Fetch and parse the object table information for a single object ID.
+
+        Args:
+            object_id_binary: A string of bytes with the object ID to get
+                information about.
+
+        Returns:
+            A dictionary with information about the object ID in question.
+        """
+        # Allow the argument to be either an ObjectID or a hex string.
+        if not isinstance(object_id, ray.ObjectID):
+            object_id = ray.ObjectID(hex_to_binary(object_id))
+
+        # Return information about a single object ID.
+        responses = [
+            self._execute_command(object_id, *command)
+            for command in self._object_table_commands(object_id)
+        ]
+        return self._parse_object_table(responses)
+
+    def object_table_page(self, cursor=None, page_size=1000):
+        """Fetch one page of the object table.
+
+        The keys of the page are found with SCAN on a single shard and all of
+        their entries are fetched with one pipelined round trip, so this never
+        blocks a shard for long. In the non-raylet code path, objects are
+        enumerated from the result table.
+
+        Args:
+            cursor: None to fetch the first page, or the cursor returned with
+                the previous page.
+            page_size: A hint for the number of objects in the page. Pages
+                can be smaller (even empty) or larger than this.
+
+        Returns:
+            A tuple of a dictionary mapping ObjectIDs to their information and
+                the cursor of the next page, which is None if this was the
+                last page.
+        """
+        self._check_connected()
+        if not self.use_raylet:
+            prefix = ray.gcs_utils.OBJECT_INFO_PREFIX
+        else:
+            prefix = ray.gcs_utils.TablePrefix_OBJECT_string
+        shard_index, keys, cursor = self._scan_page(prefix + "*", cursor,
+                                                    page_size)
+        object_ids = [binary_to_object_id(key[len(prefix):]) for key in keys]
+
+        commands = []
+        for object_id in object_ids:
+            commands.extend(self._object_table_commands(object_id))
+        responses = self._execute_pipelined(self.redis_clients[shard_index],
+                                            commands)
+
+        num_commands = len(commands) // max(len(object_ids), 1)
+        results = {}
+        for i, object_id in enumerate(object_ids):
+            results[object_id] = self._parse_object_table(
+                responses[i * num_commands:(i + 1) * num_commands])
+        return results, cursor
+
+    def iter_object_table(self, page_size=1000):
+        """Lazily iterate over the object table one page at a time.
+
+        Args:
+            page_size: A hint for the number of objects fetched per round
+                trip.
+
+        Returns:
+            A generator over pairs of ObjectID and object information.
+        """
+        cursor = None
+        while True:
+            results, cursor = self.object_table_page(cursor, page_size)
+            for item in results.items():
+                yield item
+            if cursor is None:
+                return
+
     def object_table(self, object_id=None):
         """Fetch and parse the object table info for one or more object IDs.
 
@@ -249,40 +551,63 @@ class GlobalState(object):
         if object_id is not None:
             # Return information about a single object ID.
             return self._object_table(object_id)
+        elif self.use_raylet:
+            return dict(self.iter_object_table())
         else:
-            # Return the entire object table.
-            if not self.use_raylet:
-                object_info_keys = self._keys(
-                    ray.gcs_utils.OBJECT_INFO_PREFIX + "*")
-                object_location_keys = self._keys(
-                    ray.gcs_utils.OBJECT_LOCATION_PREFIX + "*")
-                object_ids_binary = set([
-                    key[len(ray.gcs_utils.OBJECT_INFO_PREFIX):]
-                    for key in object_info_keys
-                ] + [
-                    key[len(ray.gcs_utils.OBJECT_LOCATION_PREFIX):]
-                    for key in object_location_keys
-                ])
-            else:
-                object_keys = self._keys(
-                    ray.gcs_utils.TablePrefix_OBJECT_string + "*")
-                object_ids_binary = {
-                    key[len(ray.gcs_utils.TablePrefix_OBJECT_string):]
-                    for key in object_keys
-                }
-
+            # Return the entire object table. Objects may have locations
+            # before they have a result table entry, so both are scanned.
+            object_info_keys = self._keys(ray.gcs_utils.OBJECT_INFO_PREFIX +
+                                          "*")
+            object_location_keys = self._keys(
+                ray.gcs_utils.OBJECT_LOCATION_PREFIX + "*")
+            object_ids_binary = set([
+                key[len(ray.gcs_utils.OBJECT_INFO_PREFIX):]
+                for key in object_info_keys
+            ] + [
+                key[len(ray.gcs_utils.OBJECT_LOCATION_PREFIX):]
+                for key in object_location_keys
+            ])
+
+            object_ids = [
+                binary_to_object_id(object_id_binary)
+                for object_id_binary in object_ids_binary
+            ]
+            keys = []
+            commands = []
+            for object_id in object_ids:
+                object_commands = self._object_table_commands(object_id)
+                keys.extend(len(object_commands) * [object_id])
+                commands.extend(object_commands)
+            responses = self._execute_commands(keys, commands)
+
+            num_commands = len(commands) // max(len(object_ids), 1)
             results = {}
-            for object_id_binary in object_ids_binary:
-                results[binary_to_object_id(object_id_binary)] = (
-                    self._object_table(binary_to_object_id(object_id_binary)))
+            for i, object_id in enumerate(object_ids):
+                results[object_id] = self._parse_object_table(
+                    responses[i * num_commands:(i + 1) * num_commands])
             return results
 
-    def _task_table(self, task_id):
-        """Fetch and parse the task table information for a single task ID.
+    def _task_table_command(self, task_id):
+        """Return the Redis command needed to look up a task.
 
         Args:
-            task_id_binary: A string of bytes with the task ID to get
-                information about.
+            task_id: The ID of the task to look up.
+
+        Returns:
+            A tuple of command arguments.
+        """
+        if not self.use_raylet:
+            return ("RAY.TASK_TABLE_GET", task_id.id())
+        else:
+            return ("RAY.TABLE_LOOKUP", ray.gcs_utils.TablePrefix.RAYLET_TASK,
+                    "", task_id.id())
+
+    def _parse_task_table(self, task_id, response):
+        """Parse the value returned by the _task_table_command command.
+
+        Args:
+            task_id: The ID of the task that was looked up.
+            response: The value returned by the command.
 
         Returns:
             A dictionary with information about the task ID in question.
@@ -291,8 +616,7 @@ class GlobalState(object):
         """
         if not self.use_raylet:
             # Use the non-raylet code path.
-            task_table_response = self._execute_command(
-                task_id, "RAY.TASK_TABLE_GET", task_id.id())
+            task_table_response = response
             if task_table_response is None:
                 raise Exception("There is no entry for task ID {} in the task "
                                 "table.".format(binary_to_hex(task_id.id())))
@@ -347,9 +671,7 @@ class GlobalState(object):
 
         else:
             # Use the raylet code path.
-            message = self._execute_command(
-                task_id, "RAY.TABLE_LOOKUP",
-                ray.gcs_utils.TablePrefix.RAYLET_TASK, "", task_id.id())
+            message = response
             gcs_entries = ray.gcs_utils.GcsTableEntry.GetRootAsGcsTableEntry(
                 message, 0)
 
@@ -393,6 +715,125 @@ class GlobalState(object):
 
             return info
 
+    def _task_table(self, task_id):
+        """Fetch and parse the task table information for a single task ID.
+
+        Args:
+            task_id_binary: A string of bytes with the task ID to get
+                information about.
+
+        Returns:
+            A dictionary with information about the task ID in question.
+                TASK_STATUS_MAPPING should be used to parse the "State" field
+                into a human-readable string.
+        """
+        response = self._execute_command(task_id,
+                                         *self._task_table_command(task_id))
+        return self._parse_task_table(task_id, response)
+
+    def _task_matches(self, info, driver_id, function_id, state):
+        """Check whether a parsed task table entry matches the filters."""
+        if driver_id is None and function_id is None and state is None:
+            return True
+        if not self.use_raylet:
+            specs = [info["TaskSpec"]]
+            if state is not None and not info["State"] & state:
+                return False
+        else:
+            specs = [entry["TaskSpec"] for entry in info]
+        return any((driver_id is None or spec["DriverID"] == driver_id) and (
+            function_id is None or spec["FunctionID"] == function_id)
+                   for spec in specs)
+
+    def task_table_page(self,
+                        cursor=None,
+                        page_size=1000,
+                        driver_id=None,
+                        function_id=None,
+                        state=None):
+        """Fetch one page of the task table.
+
+        The keys of the page are found with SCAN on a single shard and all of
+        their entries are fetched with one pipelined round trip, so this never
+        blocks a shard for long. The filters are applied as the entries are
+        parsed.
+
+        Args:
+            cursor: None to fetch the first page, or the cursor returned with
+                the previous page.
+            page_size: A hint for the number of tasks scanned for the page.
+                Pages can be smaller (even empty) or larger than this.
+            driver_id: If provided, only tasks submitted by the driver with
+                this hex ID are returned.
+            function_id: If provided, only tasks executing the function with
+                this hex ID are returned.
+            state: If provided, only tasks whose state is in this bitmask of
+                TASK_STATUS_* values are returned. This is only supported in
+                the non-raylet code path, since the raylet task table does not
+                store task states.
+
+        Returns:
+            A tuple of a dictionary mapping hex task IDs to task information
+                and the cursor of the next page, which is None if this was the
+                last page.
+        """
+        self._check_connected()
+        if not self.use_raylet:
+            prefix = ray.gcs_utils.TASK_PREFIX
+        else:
+            if state is not None:
+                raise ValueError("Filtering tasks by state is not supported "
+                                 "in the raylet code path.")
+            prefix = ray.gcs_utils.TablePrefix_RAYLET_TASK_string
+        shard_index, keys, cursor = self._scan_page(prefix + "*", cursor,
+                                                    page_size)
+        task_ids = [ray.ObjectID(key[len(prefix):]) for key in keys]
+        responses = self._execute_pipelined(
+            self.redis_clients[shard_index],
+            [self._task_table_command(task_id) for task_id in task_ids])
+
+        results = {}
+        for task_id, response in zip(task_ids, responses):
+            # The task may have been removed since the key was scanned.
+            if response is None:
+                continue
+            info = self._parse_task_table(task_id, response)
+            if self._task_matches(info, driver_id, function_id, state):
+                results[binary_to_hex(task_id.id())] = info
+        return results, cursor
+
+    def iter_task_table(self,
+                        page_size=1000,
+                        driver_id=None,
+                        function_id=None,
+                        state=None):
+        """Lazily iterate over the task table one page at a time.
+
+        Args:
+            page_size: A hint for the number of tasks fetched per round trip.
+            driver_id: If provided, only tasks submitted by the driver with
+                this hex ID are returned.
+            function_id: If provided, only tasks executing the function with
+                this hex ID are returned.
+            state: If provided, only tasks whose state is in this bitmask of
+                TASK_STATUS_* values are returned.
+
+        Returns:
+            A generator over pairs of hex task ID and task information.
+        """
+        cursor = None
+        while True:
+            results, cursor = self.task_table_page(
+                cursor,
+                page_size,
+                driver_id=driver_id,
+                function_id=function_id,
+                state=state)
+            for item in results.items():
+                yield item
+            if cursor is None:
+                return
+
     def task_table(self, task_id=None):
         """Fetch and parse the task table information for one or more task IDs.
 
@@ -408,25 +849,7 @@ class GlobalState(object):
             task_id = ray.ObjectID(hex_to_binary(task_id))
             return self._task_table(task_id)
         else:
-            if not self.use_raylet:
-                task_table_keys = self._keys(ray.gcs_utils.TASK_PREFIX + "*")
-                task_ids_binary = [
-                    key[len(ray.gcs_utils.TASK_PREFIX):]
-                    for key in task_table_keys
-                ]
-            else:
-                task_table_keys = self._keys(
-                    ray.gcs_utils.TablePrefix_RAYLET_TASK_string + "*")
-                task_ids_binary = [
-                    key[len(ray.gcs_utils.TablePrefix_RAYLET_TASK_string):]
-                    for key in task_table_keys
-                ]
-
-            results = {}
-            for task_id_binary in task_ids_binary:
-                results[binary_to_hex(task_id_binary)] = self._task_table(
-                    ray.ObjectID(task_id_binary))
-            return results
+            return dict(self.iter_task_table())
 
     def function_table(self, function_id=None):
         """Fetch and parse the function table.
@@ -438,9 +861,11 @@ class GlobalState(object):
         self._check_connected()
         function_table_keys = self.redis_client.keys(
             ray.gcs_utils.FUNCTION_PREFIX + "*")
+        infos = self._execute_pipelined(self.redis_client,
+                                        [("HGETALL", key)
+                                         for key in function_table_keys])
         results = {}
-        for key in function_table_keys:
-            info = self.redis_client.hgetall(key)
+        for info in infos:
             function_info_parsed = {
                 "DriverID": binary_to_hex(info[b"driver_id"]),
                 "Module": decode(info[b"module"]),
@@ -459,9 +884,11 @@ class GlobalState(object):
         if not self.use_raylet:
             db_client_keys = self.redis_client.keys(
                 ray.gcs_utils.DB_CLIENT_PREFIX + "*")
+            client_infos = self._execute_pipelined(self.redis_client,
+                                                   [("HGETALL", key)
+                                                    for key in db_client_keys])
             node_info = {}
-            for key in db_client_keys:
-                client_info = self.redis_client.hgetall(key)
+            for client_info in client_infos:
                 node_ip_address = decode(client_info[b"node_ip_address"])
                 if node_ip_address not in node_info:
                     node_info[node_ip_address] = []
@@ -585,7 +1012,7 @@ class GlobalState(object):
                 no task ID.
         """
         task_info = {}
-        event_log_sets = self.redis_client.keys("event_log*")
+        event_log_sets = self.redis_client.scan_iter(match="event_log*")
 
         # The heap is used to maintain the set of x tasks that occurred the
         # most recently across all of the workers, where x is defined as the
@@ -685,54 +1112,105 @@ class GlobalState(object):
 
         return task_info
 
-    def _profile_table(self, component_id):
+    def _profile_table(self, component_id, start=None, end=None):
         """Get the profile events for a given component.
 
         Args:
             component_id: An identifier for a component.
+            start: If provided, only events that end after this time are
+                returned.
+            end: If provided, only events that start before this time are
+                returned.
 
         Returns:
             A list of the profile events for the specified process.
         """
-        # TODO(rkn): This method should support limiting the number of log
-        # events and should also support returning a window of events.
+        return list(self._iter_profile_table(component_id, start, end))
+
+    def _iter_profile_table(self,
+                            component_id,
+                            start=None,
+                            end=None,
+                            component_types=None):
+        """Lazily decode the profile events for a given component.
+
+        The events of a component are stored in a single GCS entry, so they
+        are fetched with one lookup, but each event is only decoded and
+        converted to a dictionary when the generator reaches it.
+
+        Args:
+            component_id: An identifier for a component.
+            start: If provided, only events that end after this time are
+                yielded.
+            end: If provided, only events that start before this time are
+                yielded.
+            component_types: If provided, only events from components whose
+                type is in this collection are yielded.
+
+        Returns:
+            A generator over the profile events for the specified process.
+        """
         message = self._execute_command(component_id, "RAY.TABLE_LOOKUP",
                                         ray.gcs_utils.TablePrefix.PROFILE, "",
                                         component_id.id())
 
         if message is None:
-            return []
+            return
 
         gcs_entries = ray.gcs_utils.GcsTableEntry.GetRootAsGcsTableEntry(
             message, 0)
 
-        profile_events = []
         for i in range(gcs_entries.EntriesLength()):
             profile_table_message = (
                 ray.gcs_utils.ProfileTableData.GetRootAsProfileTableData(
                     gcs_entries.Entries(i), 0))
 
             component_type = decode(profile_table_message.ComponentType())
-            component_id = binary_to_hex(profile_table_message.ComponentId())
+            if (component_types is not None
+                    and component_type not in component_types):
+                continue
+            component_id_hex = binary_to_hex(
+                profile_table_message.ComponentId())
             node_ip_address = decode(profile_table_message.NodeIpAddress())
 
             for j in range(profile_table_message.ProfileEventsLength()):
                 profile_event_message = profile_table_message.ProfileEvents(j)
-
-                profile_event = {
+                start_time = profile_event_message.StartTime()
+                end_time = profile_event_message.EndTime()
+                if start is not None and end_time < start:
+                    continue
+                if end is not None and start_time > end:
+                    continue
+
+                yield {
                     "event_type": decode(profile_event_message.EventType()),
-                    "component_id": component_id,
+                    "component_id": component_id_hex,
                     "node_ip_address": node_ip_address,
                     "component_type": component_type,
-                    "start_time": profile_event_message.StartTime(),
-                    "end_time": profile_event_message.EndTime(),
+                    "start_time": start_time,
+                    "end_time": end_time,
                     "extra_data": json.loads(
                         decode(profile_event_message.ExtraData())),
                 }
 
-                profile_events.append(profile_event)
+    def _profile_component_ids(self, component_ids=None):
+        """Lazily iterate over the IDs of the components to profile.
+
+        Args:
+            component_ids: If provided, a list of hex component IDs. Only
+                these components are looked up, so the profile table does not
+                need to be scanned.
 
-        return profile_events
+        Returns:
+            A generator over the binary component IDs.
+        """
+        if component_ids is not None:
+            for component_id in component_ids:
+                yield hex_to_binary(component_id)
+            return
+        prefix = ray.gcs_utils.TablePrefix_PROFILE_string
+        for key in self._iter_keys(prefix + "*"):
+            yield key[len(prefix):]
 
     def profile_table(self):
         if not self.use_raylet:
@@ -752,10 +1230,49 @@ class GlobalState(object):
             for component_id in component_identifiers_binary
         }
 
+    def iter_profile_events(self,
+                            start=None,
+                            end=None,
+                            component_ids=None,
+                            component_types=None):
+        """Lazily iterate over the profile events of the cluster.
+
+        The shards and components are visited one at a time, so only the
+        events of a single component are held in memory at once.
+
+        Args:
+            start: If provided, only events that end after this time (in
+                seconds since the epoch) are returned.
+            end: If provided, only events that start before this time are
+                returned.
+            component_ids: If provided, a list of hex IDs of the components
+                (workers or drivers) to return events for.
+            component_types: If provided, a list of component types (for
+                example "worker" or "driver") to return events for.
+
+        Returns:
+            A generator over profile events. Each profile event is a
+                dictionary.
+        """
+        if not self.use_raylet:
+            raise Exception("This method is only supported in the raylet "
+                            "code path.")
+        self._check_connected()
+
+        for component_id in self._profile_component_ids(component_ids):
+            for event in self._iter_profile_table(
+                    binary_to_object_id(component_id), start, end,
+                    component_types):
+                yield event
+
     def chrome_tracing_dump(self,
                             include_task_data=False,
                             filename=None,
-                            open_browser=False):
+                            open_browser=False,
+                            start=None,
+                            end=None,
+                            component_ids=None,
+                            component_types=None):
         """Return a list of profiling events that can viewed as a timeline.
 
         To view this information as a timeline, simply dump it as a json file
@@ -763,6 +1280,9 @@ class GlobalState(object):
         web browser and load the dumped file. Make sure to enable "Flow events"
         in the "View Options" menu.
 
+        When a filename is provided, the events are streamed to the file one
+        component at a time instead of being collected in memory first.
+
         Args:
             include_task_data: If true, we will include more task metadata such
                 as the task specifications in the json.
@@ -770,15 +1290,22 @@ class GlobalState(object):
                 file.
             open_browser: If true, we will attempt to automatically open the
                 timeline visualization in Chrome.
+            start: If provided, only events that end after this time (in
+                seconds since the epoch) are included.
+            end: If provided, only events that start before this time are
+                included.
+            component_ids: If provided, a list of hex IDs of the components to
+                include.
+            component_types: If provided, a list of component types (for
+                example "worker" or "driver") to include.
 
         Returns:
             If filename is not provided, this returns a list of profiling
-                events. Each profile event is a dictionary.
+                events. Each profile event is a dictionary. Otherwise, the
+                number of events written to the file is returned.
         """
         # TODO(rkn): Support including the task specification data in the
         # timeline.
-        # TODO(rkn): This should support viewing just a window of time or a
-        # limited number of events.
 
         if include_task_data:
             raise NotImplementedError("This flag has not been implented yet.")
@@ -786,71 +1313,22 @@ class GlobalState(object):
         if open_browser:
             raise NotImplementedError("This flag has not been implented yet.")
 
-        profile_table = self.profile_table()
-        all_events = []
-
-        # Colors are specified at
-        # https://github.com/catapult-project/catapult/blob/master/tracing/tracing/base/color_scheme.html.  # noqa: E501
-        default_color_mapping = defaultdict(
-            lambda: "generic_work", {
-                "get_task": "cq_build_abandoned",
-                "task": "rail_response",
-                "task:deserialize_arguments": "rail_load",
-                "task:execute": "rail_animation",
-                "task:store_outputs": "rail_idle",
-                "wait_for_function": "detailed_memory_dump",
-                "ray.get": "good",
-                "ray.put": "terrible",
-                "ray.wait": "vsync_highlight_color",
-                "submit_task": "background_memory_dump",
-                "fetch_and_run_function": "detailed_memory_dump",
-                "register_remote_function": "detailed_memory_dump",
-            })
-
-        def seconds_to_microseconds(time_in_seconds):
-            time_in_microseconds = 10**6 * time_in_seconds
-            return time_in_microseconds
-
-        for component_id_hex, component_events in profile_table.items():
-            for event in component_events:
-                new_event = {
-                    # The category of the event.
-                    "cat": event["event_type"],
-                    # The string displayed on the event.
-                    "name": event["event_type"],
-                    # The identifier for the group of rows that the event
-                    # appears in.
-                    "pid": event["node_ip_address"],
-                    # The identifier for the row that the event appears in.
-                    "tid": event["component_type"] + ":" +
-                    event["component_id"],
-                    # The start time in microseconds.
-                    "ts": seconds_to_microseconds(event["start_time"]),
-                    # The duration in microseconds.
-                    "dur": seconds_to_microseconds(event["end_time"] -
-                                                   event["start_time"]),
-                    # What is this?
-                    "ph": "X",
-                    # This is the name of the color to display the box in.
-                    "cname": default_color_mapping[event["event_type"]],
-                    # The extra user-defined data.
-                    "args": event["extra_data"],
-                }
-
-                # Modify the json with the additional user-defined extra data.
-                # This can be used to add fields or override existing fields.
-                if "cname" in event["extra_data"]:
-                    new_event["cname"] = event["extra_data"]["cname"]
-                if "name" in event["extra_data"]:
-                    new_event["name"] = event["extra_data"]["name"]
-
-                all_events.append(new_event)
+        trace_events = (_profile_event_to_trace_event(event)
+                        for event in self.iter_profile_events(
+                            start=start,
+                            end=end,
+                            component_ids=component_ids,
+                            component_types=component_types))
 
         if filename is not None:
             with open(filename, "w") as outfile:
-                json.dump(all_events, outfile)
+                writer = _ChromeTraceWriter(outfile)
+                for trace_event in trace_events:
+                    writer.write(trace_event)
+                writer.close()
+            return writer.num_events
         else:
-            return all_events
+            return list(trace_events)
 
     def dump_catapult_trace(self,
                             path,
@@ -894,6 +1372,29 @@ class GlobalState(object):
         # filter out tasks not in task_table
         task_info = {k: v for k, v in task_info.items() if k in task_table}
 
+        # Write to a temporary file first so that a failure does not leave a
+        # truncated trace at path.
+        tmp_path = path + ".tmp"
+        try:
+            with open(tmp_path, "w") as outfile:
+                full_trace = _ChromeTraceWriter(outfile)
+                for event in self._catapult_trace_events(
+                        task_info, task_table, workers, breakdowns, task_dep,
+                        obj_dep):
+                    full_trace.write(event)
+                full_trace.close()
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        os.rename(tmp_path, path)
+        print("Created JSON {}/{}".format(full_trace.num_events,
+                                          len(task_info)))
+
+    def _catapult_trace_events(self, task_info, task_table, workers,
+                               breakdowns, task_dep, obj_dep):
+        """Generate the events of a trace for dump_catapult_trace."""
+
         start_time = None
         for info in task_info.values():
             task_start = min(self._get_times(info))
@@ -908,7 +1409,6 @@ class GlobalState(object):
 
         seen_obj = {}
 
-        full_trace = []
         for task_id, info in task_info.items():
             worker = workers[info["worker_id"]]
             task_t_info = task_table[task_id]
@@ -954,7 +1454,7 @@ class GlobalState(object):
                                       info["get_arguments_start"]),
                         "cname": "rail_idle"
                     }
-                    full_trace.append(get_args_trace)
+                    yield get_args_trace
 
                 if "store_outputs_end" in info:
                     outputs_trace = {
@@ -970,7 +1470,7 @@ class GlobalState(object):
                                       info["store_outputs_start"]),
                         "cname": "thread_state_runnable"
                     }
-                    full_trace.append(outputs_trace)
+                    yield outputs_trace
 
                 if "execute_end" in info:
                     execute_trace = {
@@ -986,7 +1486,7 @@ class GlobalState(object):
                                       info["execute_start"]),
                         "cname": "rail_animation"
                     }
-                    full_trace.append(execute_trace)
+                    yield execute_trace
 
             else:
                 if parent_info:
@@ -1011,7 +1511,7 @@ class GlobalState(object):
                         "args": {},
                         "id": _parent_id,
                     }
-                    full_trace.append(parent)
+                    yield parent
 
                     _id = info["worker_id"] + str(micros(min(parent_times)))
 
@@ -1027,7 +1527,7 @@ class GlobalState(object):
                         "bp": "e",
                         "cname": "olive"
                     }
-                    full_trace.append(task_trace)
+                    yield task_trace
 
                 task = {
                     "cat": "task",
@@ -1042,7 +1542,7 @@ class GlobalState(object):
                                   info["get_arguments_start"]),
                     "cname": "thread_state_runnable"
                 }
-                full_trace.append(task)
+                yield task
 
             if task_dep:
                 if parent_info:
@@ -1067,7 +1567,7 @@ class GlobalState(object):
                         "args": {},
                         "id": _parent_id,
                     }
-                    full_trace.append(parent)
+                    yield parent
 
                     _id = info["worker_id"] + str(micros(min(parent_times)))
 
@@ -1082,7 +1582,7 @@ class GlobalState(object):
                         "id": _id,
                         "bp": "e"
                     }
-                    full_trace.append(task_trace)
+                    yield task_trace
 
             if obj_dep:
                 args = task_table[task_id]["TaskSpec"]["Args"]
@@ -1127,7 +1627,7 @@ class GlobalState(object):
                                     "cname": "cq_build_attempt_failed",
                                     "id": "obj" + str(arg) + str(seen_obj[arg])
                                 }
-                                full_trace.append(owner)
+                                yield owner
 
                             dependent = {
                                 "cat": "obj_dependency",
@@ -1142,11 +1642,7 @@ class GlobalState(object):
                                 "bp": "e",
                                 "id": "obj" + str(arg) + str(seen_obj[arg])
                             }
-                            full_trace.append(dependent)
-
-        print("Creating JSON {}/{}".format(len(full_trace), len(task_info)))
-        with open(path, "w") as outfile:
-            json.dump(full_trace, outfile)
+                            yield dependent
 
     def _get_times(self, data):
         """Extract the numerical times from a task profile.
@@ -1207,10 +1703,11 @@ class GlobalState(object):
     def workers(self):
         """Get a dictionary mapping worker ID to worker information."""
         worker_keys = self.redis_client.keys("Worker*")
+        worker_infos = self._execute_pipelined(
+            self.redis_client, [("HGETALL", key) for key in worker_keys])
         workers_data = {}
 
-        for worker_key in worker_keys:
-            worker_info = self.redis_client.hgetall(worker_key)
+        for worker_key, worker_info in zip(worker_keys, worker_infos):
             worker_id = binary_to_hex(worker_key[len("Workers:"):])
 
             workers_data[worker_id] = {
@@ -1232,9 +1729,10 @@ class GlobalState(object):
 
     def actors(self):
         actor_keys = self.redis_client.keys("Actor:*")
+        infos = self._execute_pipelined(
+            self.redis_client, [("HGETALL", key) for key in actor_keys])
         actor_info = {}
-        for key in actor_keys:
-            info = self.redis_client.hgetall(key)
+        for key, info in zip(actor_keys, infos):
             actor_id = key[len("Actor:"):]
             assert len(actor_id) == ray_constants.ID_SIZE
             actor_info[binary_to_hex(actor_id)] = {
@@ -1252,17 +1750,19 @@ class GlobalState(object):
         overall_smallest = sys.maxsize
         overall_largest = 0
         num_tasks = 0
+        # Query all of the event logs in one round trip.
+        pipe = self.redis_client.pipeline(transaction=False)
+        now = time.time()
         for event_log_set in event_log_sets:
-            fwd_range = self.redis_client.zrange(
-                event_log_set, start=0, end=0, withscores=True)
+            pipe.zrange(event_log_set, start=0, end=0, withscores=True)
+            pipe.zrevrange(event_log_set, start=0, end=0, withscores=True)
+            pipe.zcount(event_log_set, min=0, max=now)
+        responses = pipe.execute() if event_log_sets else []
+        for i in range(len(event_log_sets)):
+            fwd_range, rev_range, count = responses[3 * i:3 * i + 3]
             overall_smallest = min(overall_smallest, fwd_range[0][1])
-
-            rev_range = self.redis_client.zrevrange(
-                event_log_set, start=0, end=0, withscores=True)
             overall_largest = max(overall_largest, rev_range[0][1])
-
-            num_tasks += self.redis_client.zcount(
-                event_log_set, min=0, max=time.time())
+            num_tasks += count
         if num_tasks is 0:
             return 0, 0, 0
         return overall_smallest, overall_largest, num_tasks
@@ -1309,7 +1809,17 @@ class GlobalState(object):
         message = self.redis_client.execute_command(
             "RAY.TABLE_LOOKUP", ray.gcs_utils.TablePrefix.ERROR_INFO, "",
             job_id.id())
+        return self._parse_error_messages(message)
 
+    def _parse_error_messages(self, message):
+        """Parse the error table entry of a job.
+
+        Args:
+            message: The value returned by the error table lookup.
+
+        Returns:
+            A list of the error messages for this job.
+        """
         # If there are no errors, return early.
         if message is None:
             return []
@@ -1353,7 +1863,11 @@ class GlobalState(object):
             for key in error_table_keys
         ]
 
+        messages = self._execute_pipelined(
+            self.redis_client,
+            [("RAY.TABLE_LOOKUP", ray.gcs_utils.TablePrefix.ERROR_INFO, "",
+              job_id) for job_id in job_ids])
         return {
-            binary_to_hex(job_id): self._error_messages(ray.ObjectID(job_id))
-            for job_id in job_ids
+            binary_to_hex(job_id): self._parse_error_messages(message)
+            for job_id, message in zip(job_ids, messages)
         }
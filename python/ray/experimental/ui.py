@@ -234,17 +234,31 @@ def get_sliders(update):
     return start_box, end_box, range_slider, breakdown_opt
 
 
+# The number of table entries to fetch per page when browsing the object and
+# task tables.
+TABLE_PAGE_SIZE = 100
+
+
 def object_search_bar():
     object_search = widgets.Text(
         value="",
-        placeholder="Object ID",
+        placeholder="Object ID (empty to browse)",
         description="Search for an object:",
         disabled=False)
     display(object_search)
 
+    # The cursor of the next page of the object table to show when the
+    # search is submitted without an object ID.
+    cursor = [None]
+
     def handle_submit(sender):
         pp = pprint.PrettyPrinter()
-        pp.pprint(ray.global_state.object_table(object_search.value))
+        if object_search.value:
+            pp.pprint(ray.global_state.object_table(object_search.value))
+        else:
+            page, cursor[0] = ray.global_state.object_table_page(
+                cursor[0], page_size=TABLE_PAGE_SIZE)
+            pp.pprint(page)
 
     object_search.on_submit(handle_submit)
 
@@ -252,14 +266,23 @@ def object_search_bar():
 def task_search_bar():
     task_search = widgets.Text(
         value="",
-        placeholder="Task ID",
+        placeholder="Task ID (empty to browse)",
         description="Search for a task:",
         disabled=False)
     display(task_search)
 
+    # The cursor of the next page of the task table to show when the search
+    # is submitted without a task ID.
+    cursor = [None]
+
     def handle_submit(sender):
         pp = pprint.PrettyPrinter()
-        pp.pprint(ray.global_state.task_table(task_search.value))
+        if task_search.value:
+            pp.pprint(ray.global_state.task_table(task_search.value))
+        else:
+            page, cursor[0] = ray.global_state.task_table_page(
+                cursor[0], page_size=TABLE_PAGE_SIZE)
+            pp.pprint(page)
 
     task_search.on_submit(handle_submit)
 
@@ -357,6 +357,33 @@ class Monitor(object):
         # manager.
         self.live_plasma_managers[db_client_id] = 0
 
+    def _scan_hashes(self, redis, pattern, page_size=1000):
+        """Iterate over the hashes whose keys match a pattern in a shard.
+
+        Each SCAN batch is fetched with one pipeline of HGETALLs, so the
+        shard is never blocked for long. Keys deleted between the SCAN and
+        the HGETALL are skipped.
+
+        Args:
+            redis: The client of the Redis shard to scan.
+            pattern: The SCAN pattern to query.
+            page_size: A hint for the number of keys fetched per round trip.
+
+        Returns:
+            A generator over pairs of key and hash contents.
+        """
+        cursor = 0
+        while True:
+            cursor, keys = redis.scan(
+                cursor=cursor, match=pattern, count=page_size)
+            entries = self.state._execute_pipelined(
+                redis, [("HGETALL", key) for key in keys])
+            for key, entry in zip(keys, entries):
+                if entry:
+                    yield key, entry
+            if cursor == 0:
+                return
+
     def _entries_for_driver_in_shard(self, driver_id, redis_shard_index):
         """Collect IDs of control-state entries for a driver from a shard.
 
@@ -376,8 +403,7 @@ class Monitor(object):
 
         # Scan the task table & filter to get the list of tasks belong to this
         # driver.  Use a cursor in order not to block the redis shards.
-        for key in redis.scan_iter(match=TASK_TABLE_PREFIX + b"*"):
-            entry = redis.hgetall(key)
+        for _, entry in self._scan_hashes(redis, TASK_TABLE_PREFIX + b"*"):
             task_info = ray.gcs_utils.TaskInfo.GetRootAsTaskInfo(
                 entry[b"TaskSpec"], 0)
             if driver_id != task_info.DriverId():
@@ -395,8 +421,8 @@ class Monitor(object):
 
         # Also record all the ray.put()'d objects.
         put_objects = []
-        for key in redis.scan_iter(match=OBJECT_INFO_PREFIX + b"*"):
-            entry = redis.hgetall(key)
+        for key, entry in self._scan_hashes(redis,
+                                            OBJECT_INFO_PREFIX + b"*"):
             if entry[b"is_put"] == "0":
                 continue
             object_id = key.split(OBJECT_INFO_PREFIX)[1]
@@ -410,13 +436,17 @@ class Monitor(object):
         # Clean up (in the future, save) entries for non-empty objects.
         object_ids_locs = set()
         object_ids_infos = set()
+        pipe = redis.pipeline(transaction=False)
         for object_id in object_ids:
+            pipe.zrange(OBJECT_LOCATION_PREFIX + object_id, 0, -1)
+            pipe.hgetall(OBJECT_INFO_PREFIX + object_id)
+        responses = pipe.execute() if object_ids else []
+        for i, object_id in enumerate(object_ids):
+            obj_loc, obj_info = responses[2 * i:2 * i + 2]
             # OL.
-            obj_loc = redis.zrange(OBJECT_LOCATION_PREFIX + object_id, 0, -1)
             if obj_loc:
                 object_ids_locs.add(object_id)
             # OI.
-            obj_info = redis.hgetall(OBJECT_INFO_PREFIX + object_id)
             if obj_info:
                 object_ids_infos.add(object_id)
 
@@ -451,11 +481,11 @@ class Monitor(object):
         driver_task_ids = []
         all_put_objects = []
 
-        # Collect relevant ids.
-        # TODO(zongheng): consider parallelizing this loop.
-        for shard_index in range(len(self.state.redis_clients)):
-            returned_object_ids, task_ids, put_objects = \
-                self._entries_for_driver_in_shard(driver_id, shard_index)
+        # Collect relevant ids from all of the shards concurrently.
+        for returned_object_ids, task_ids, put_objects in (
+                self.state._map_shards(
+                    lambda shard_index, _: self._entries_for_driver_in_shard(
+                        driver_id, shard_index))):
             driver_object_ids.extend(returned_object_ids)
             driver_task_ids.extend(task_ids)
             all_put_objects.extend(put_objects)
@@ -479,11 +509,10 @@ class Monitor(object):
         for task_id in driver_task_ids:
             task_ids_per_shard[ToShardIndex(task_id)].append(task_id)
 
-        # TODO(zongheng): consider parallelizing this loop.
-        for shard_index in range(len(self.state.redis_clients)):
-            self._clean_up_entries_from_shard(
+        self.state._map_shards(
+            lambda shard_index, _: self._clean_up_entries_from_shard(
                 object_ids_per_shard[shard_index],
-                task_ids_per_shard[shard_index], shard_index)
+                task_ids_per_shard[shard_index], shard_index))
 
     def driver_removed_handler(self, unused_channel, data):
         """Handle a notification that a driver has been removed.
@@ -514,23 +543,16 @@ class Monitor(object):
         xray_object_table_prefix = (
             ray.gcs_utils.TablePrefix_OBJECT_string.encode("ascii"))
 
-        task_table_objects = self.state.task_table()
         driver_id_hex = binary_to_hex(driver_id)
         driver_task_id_bins = set()
-        for task_id_hex in task_table_objects:
-            if len(task_table_objects[task_id_hex]) == 0:
-                continue
-            task_table_object = task_table_objects[task_id_hex][0]["TaskSpec"]
-            task_driver_id_hex = task_table_object["DriverID"]
-            if driver_id_hex != task_driver_id_hex:
-                # Ignore tasks that aren't from this driver.
-                continue
+        # Only tasks from this driver are returned.
+        for task_id_hex, _ in self.state.iter_task_table(
+                driver_id=driver_id_hex):
             driver_task_id_bins.add(hex_to_binary(task_id_hex))
 
         # Get objects associated with the driver.
-        object_table_objects = self.state.object_table()
         driver_object_id_bins = set()
-        for object_id, object_table_object in object_table_objects.items():
+        for object_id, object_table_object in self.state.iter_object_table():
             assert len(object_table_object) > 0
             task_id_bin = ray.local_scheduler.compute_task_id(object_id).id()
             if task_id_bin in driver_task_id_bins:
@@ -550,11 +572,10 @@ class Monitor(object):
                 xray_object_table_prefix + object_id_bin)
 
         # Remove with best effort.
-        for shard_index in range(len(sharded_keys)):
+        def remove_from_shard(shard_index, redis):
             keys = sharded_keys[shard_index]
             if len(keys) == 0:
-                continue
-            redis = self.state.redis_clients[shard_index]
+                return
             num_deleted = redis.delete(*keys)
             logger.info("Removed {} dead redis entries of the driver from"
                         " redis shard {}.".format(num_deleted, shard_index))
@@ -563,6 +584,8 @@ class Monitor(object):
                                " from redis shard {}.".format(
                                    len(keys) - num_deleted, shard_index))
 
+        self.state._map_shards(remove_from_shard)
+
     def xray_driver_removed_handler(self, unused_channel, data):
         """Handle a notification that a driver has been removed.
 
@@ -3,16 +3,25 @@ from __future__ import division
 from __future__ import print_function
 
 import json
+import struct
 import time
 import threading
 import traceback
 
 import ray
+import ray.ray_constants as ray_constants
 
 LOG_POINT = 0
 LOG_SPAN_START = 1
 LOG_SPAN_END = 2
 
+PROFILING_MODE_JSON = "json"
+PROFILING_MODE_BINARY = "binary"
+PROFILING_MODE_DISABLED = "disabled"
+PROFILING_MODES = [
+    PROFILING_MODE_JSON, PROFILING_MODE_BINARY, PROFILING_MODE_DISABLED
+]
+
 
 class _NullLogSpan(object):
     """A log span context manager that does nothing"""
@@ -59,32 +68,200 @@ def profile(event_type, extra_data=None, worker=None):
     """
     if worker is None:
         worker = ray.worker.global_worker
-    if not worker.use_raylet:
-        # Log the event if this is a worker and not a driver, since the
+    if not worker.profiler.should_log():
+        return NULL_LOG_SPAN
+    return _make_log_span(worker, event_type, extra_data)
+
+
+def profile_task(function_name, task_id, worker):
+    """Profile the execution of a task.
+
+    This is used by the worker instead of profile so that the sampling
+    decision is made once per task and so that the task ID is only converted
+    to hex when the event is flushed. Every span opened while the task is
+    executing is recorded if and only if the task was sampled.
+
+    Args:
+        function_name (str): The name of the function being executed.
+        task_id: The ID of the task being executed.
+        worker: The worker executing the task.
+
+    Returns:
+        An object that can profile the task via a "with" statement.
+    """
+    return _TaskLogSpan(worker, function_name, task_id)
+
+
+def _make_log_span(worker, event_type, extra_data, name=None, task_id=None):
+    if not worker.use_raylet and worker.mode != ray.WORKER_MODE:
+        # Only log the event if this is a worker and not a driver, since the
         # driver's event log never gets flushed.
-        if worker.mode == ray.WORKER_MODE:
-            return RayLogSpanNonRaylet(
-                worker.profiler, event_type, contents=extra_data)
-        else:
-            return NULL_LOG_SPAN
+        return NULL_LOG_SPAN
+    if worker.profiler.mode == PROFILING_MODE_BINARY:
+        return RayLogSpanBinary(
+            worker.profiler,
+            event_type,
+            name=name,
+            task_id=task_id,
+            extra_data=extra_data)
+    if not worker.use_raylet:
+        return RayLogSpanNonRaylet(
+            worker.profiler, event_type, contents=extra_data)
     else:
         return RayLogSpanRaylet(
             worker.profiler, event_type, extra_data=extra_data)
 
 
+class _TaskLogSpan(object):
+    """A log span that wraps the execution of a single task.
+
+    Attributes:
+        worker: The worker executing the task.
+        function_name (str): The name of the function being executed.
+        task_id: The ID of the task being executed.
+        span: The underlying log span, or None if the task was not sampled.
+    """
+
+    def __init__(self, worker, function_name, task_id):
+        self.worker = worker
+        self.function_name = function_name
+        self.task_id = task_id
+        self.span = None
+
+    def __enter__(self):
+        profiler = self.worker.profiler
+        if not profiler.start_task():
+            return
+        if profiler.mode == PROFILING_MODE_BINARY:
+            self.span = _make_log_span(
+                self.worker,
+                "task",
+                None,
+                name=self.function_name,
+                task_id=self.task_id.id())
+        elif not self.worker.use_raylet:
+            self.span = _make_log_span(
+                self.worker, "task", {
+                    "function_name": self.function_name,
+                    "task_id": self.task_id.hex(),
+                    "worker_id": ray.utils.binary_to_hex(self.worker.worker_id)
+                })
+        else:
+            self.span = _make_log_span(self.worker, "task", {
+                "name": self.function_name,
+                "task_id": self.task_id.hex()
+            })
+        self.span.__enter__()
+
+    def __exit__(self, type, value, tb):
+        try:
+            if self.span is not None:
+                self.span.__exit__(type, value, tb)
+        finally:
+            self.worker.profiler.end_task()
+
+
 class Profiler(object):
     """A class that holds the profiling states.
 
+    The defaults for mode, sample_every_n and buffer_size are read from the
+    RAY_PROFILING_MODE, RAY_PROFILING_SAMPLE_EVERY_N and
+    RAY_PROFILING_BUFFER_SIZE environment variables, so setting them before
+    starting Ray configures the driver and all of the local workers.
+
     Attributes:
         worker: the worker to profile.
-        events: the buffer of events.
+        mode (str): One of PROFILING_MODES.
+        sample_every_n (int): Only one in this many tasks is profiled.
+        events: the buffer of events in the JSON mode.
+        binary_events: the ring buffer of events in the binary mode.
         lock: the lock to protect access of events.
     """
 
-    def __init__(self, worker):
+    def __init__(self,
+                 worker,
+                 mode=None,
+                 sample_every_n=None,
+                 buffer_size=None):
         self.worker = worker
         self.events = []
+        self.binary_events = None
         self.lock = threading.Lock()
+        self.configure(
+            mode=mode if mode is not None else ray_constants.PROFILING_MODE,
+            sample_every_n=(sample_every_n if sample_every_n is not None else
+                            ray_constants.PROFILING_SAMPLE_EVERY_N),
+            buffer_size=(buffer_size if buffer_size is not None else
+                         ray_constants.PROFILING_BUFFER_SIZE))
+
+    def configure(self, mode, sample_every_n=1, buffer_size=2**16):
+        """Change how profile events are recorded.
+
+        Events buffered in the previous mode are discarded.
+
+        Args:
+            mode (str): One of PROFILING_MODES.
+            sample_every_n (int): Only one in this many tasks is profiled.
+            buffer_size (int): The number of records in the ring buffer used
+                by the binary mode.
+        """
+        if mode not in PROFILING_MODES:
+            raise ValueError("The profiling mode must be one of {}, got {}."
+                             .format(PROFILING_MODES, mode))
+        if sample_every_n < 1:
+            raise ValueError("sample_every_n must be a positive integer.")
+        with self.lock:
+            self.mode = mode
+            self.sample_every_n = sample_every_n
+            self.enabled = mode != PROFILING_MODE_DISABLED
+            self.events = []
+            if mode == PROFILING_MODE_BINARY:
+                self.binary_events = BinaryEventBuffer(buffer_size)
+            else:
+                self.binary_events = None
+        # Tasks and the spans outside of tasks are sampled with separate
+        # counters so that the spans between tasks (such as get_task) do not
+        # skew which tasks are sampled.
+        self._task_sample_counter = 0
+        self._span_sample_counter = 0
+        # True if a task is being executed, in which case _task_sampled
+        # determines whether the spans inside of the task are logged.
+        self._in_task = False
+        self._task_sampled = True
+
+    def should_log(self):
+        """Return True if the next profile span should be recorded."""
+        if not self.enabled:
+            return False
+        if self._in_task:
+            return self._task_sampled
+        if self.sample_every_n == 1:
+            return True
+        self._span_sample_counter += 1
+        if self._span_sample_counter >= self.sample_every_n:
+            self._span_sample_counter = 0
+            return True
+        return False
+
+    def start_task(self):
+        """Decide whether the task that is starting should be profiled.
+
+        Returns:
+            True if the task is sampled and False otherwise.
+        """
+        self._in_task = True
+        self._task_sample_counter += 1
+        if self._task_sample_counter >= self.sample_every_n:
+            self._task_sample_counter = 0
+            self._task_sampled = self.enabled
+        else:
+            self._task_sampled = False
+        return self._task_sampled
+
+    def end_task(self):
+        """Mark the end of the task started by the last start_task call."""
+        self._in_task = False
+        self._task_sampled = True
 
     def start_flush_thread(self):
         t = threading.Thread(
@@ -123,6 +300,14 @@ class Profiler(object):
         with self.lock:
             events = self.events
             self.events = []
+            if self.binary_events is not None:
+                events = self.binary_events.drain(
+                    raylet=self.worker.use_raylet,
+                    worker_id_hex=ray.utils.binary_to_hex(
+                        self.worker.worker_id))
+
+        if not events:
+            return
 
         if not self.worker.use_raylet:
             event_log_key = b"event_log:" + self.worker.worker_id
@@ -143,6 +328,219 @@ class Profiler(object):
         with self.lock:
             self.events.append(event)
 
+    def add_binary_event(self, start_time, end_time, event_type, name, task_id,
+                         extra_data):
+        with self.lock:
+            if self.binary_events is not None:
+                self.binary_events.add(start_time, end_time, event_type, name,
+                                       task_id, extra_data)
+
+
+class BinaryEventBuffer(object):
+    """A ring buffer of fixed-size binary profile event records.
+
+    Each record holds the start and end time of a span, interned indices for
+    the event type and the displayed name, an optional raw task ID and an
+    index into a side table for the rare events that carry arbitrary extra
+    data (such as user-defined extra data or exception information). Nothing
+    is converted to strings until the buffer is drained.
+
+    Attributes:
+        capacity (int): The maximum number of records held by the buffer.
+        num_dropped (int): The number of records that were overwritten before
+            they could be drained.
+    """
+
+    RECORD = struct.Struct("<ddIIB20s")
+    NIL_TASK_ID = 20 * b"\x00"
+    # The number of interned strings kept beyond those in use by records
+    # before the table is compacted.
+    MAX_UNUSED_STRINGS = 4096
+
+    def __init__(self, capacity):
+        if capacity < 1:
+            raise ValueError("The profiling buffer size must be positive.")
+        self.capacity = capacity
+        self.buffer = bytearray(capacity * self.RECORD.size)
+        self.num_dropped = 0
+        self._next = 0
+        self._size = 0
+        # Interned strings. Index 0 is reserved for "no value".
+        self._strings = [None]
+        self._string_indices = {}
+        # Extra data dictionaries keyed by the slot of their record.
+        self._extra_data = {}
+
+    def _intern(self, value):
+        if value is None:
+            return 0
+        index = self._string_indices.get(value)
+        if index is None:
+            index = len(self._strings)
+            self._strings.append(value)
+            self._string_indices[value] = index
+        return index
+
+    def _compact(self):
+        """Drop the interned strings that no record refers to anymore."""
+        strings = [None]
+        string_indices = {}
+        remap = {0: 0}
+        first = (self._next - self._size) % self.capacity
+        for i in range(self._size):
+            offset = ((first + i) % self.capacity) * self.RECORD.size
+            record = list(self.RECORD.unpack_from(self.buffer, offset))
+            for field in (2, 3):
+                index = record[field]
+                if index not in remap:
+                    remap[index] = len(strings)
+                    string_indices[self._strings[index]] = len(strings)
+                    strings.append(self._strings[index])
+                record[field] = remap[index]
+            self.RECORD.pack_into(self.buffer, offset, *record)
+        self._strings = strings
+        self._string_indices = string_indices
+
+    def add(self, start_time, end_time, event_type, name, task_id, extra_data):
+        """Add a record, overwriting the oldest one if the buffer is full."""
+        # At most two strings per record are in use, so this bounds the
+        # table even if every event has a distinct name.
+        if len(self._strings) > 2 * self._size + self.MAX_UNUSED_STRINGS:
+            self._compact()
+        slot = self._next
+        has_extra_data = 0
+        if extra_data:
+            self._extra_data[slot] = extra_data
+            has_extra_data = 1
+        elif slot in self._extra_data:
+            del self._extra_data[slot]
+        self.RECORD.pack_into(self.buffer, slot * self.RECORD.size, start_time,
+                              end_time, self._intern(event_type),
+                              self._intern(name), has_extra_data, task_id
+                              or self.NIL_TASK_ID)
+        self._next = (slot + 1) % self.capacity
+        if self._size == self.capacity:
+            self.num_dropped += 1
+        else:
+            self._size += 1
+
+    def __len__(self):
+        return self._size
+
+    def records(self):
+        """Iterate over the decoded records from the oldest to the newest.
+
+        Yields:
+            Tuples of start time, end time, event type, name, task ID (or
+                None) and extra data dictionary (or None).
+        """
+        first = (self._next - self._size) % self.capacity
+        for i in range(self._size):
+            slot = (first + i) % self.capacity
+            (start_time, end_time, event_type, name,
+             has_extra_data, task_id) = self.RECORD.unpack_from(
+                 self.buffer, slot * self.RECORD.size)
+            yield (start_time, end_time, self._strings[event_type],
+                   self._strings[name], None if task_id == self.NIL_TASK_ID
+                   else task_id, self._extra_data[slot]
+                   if has_extra_data else None)
+
+    def drain(self, raylet, worker_id_hex):
+        """Remove all records and convert them to the events format.
+
+        Args:
+            raylet (bool): True if the events are for the raylet code path,
+                which expects one dictionary per span, and False if they are
+                for the legacy code path, which expects a start and an end
+                tuple per span.
+            worker_id_hex (str): The hex ID of the worker, which is added to
+                task events in the legacy code path.
+
+        Returns:
+            A list of events.
+        """
+        events = []
+        for (start_time, end_time, event_type, name, task_id,
+             extra_data) in self.records():
+            contents = {} if extra_data is None else dict(extra_data)
+            if task_id is not None:
+                contents["task_id"] = ray.utils.binary_to_hex(task_id)
+            if raylet:
+                if name is not None:
+                    contents["name"] = name
+                events.append({
+                    "event_type": event_type,
+                    "start_time": start_time,
+                    "end_time": end_time,
+                    "extra_data": json.dumps(contents),
+                })
+            else:
+                if name is not None:
+                    contents["function_name"] = name
+                if task_id is not None:
+                    contents["worker_id"] = worker_id_hex
+                contents = {str(k): str(v) for k, v in contents.items()}
+                events.append((start_time, event_type, LOG_SPAN_START,
+                               contents))
+                events.append((end_time, event_type, LOG_SPAN_END, {}))
+        self._next = 0
+        self._size = 0
+        self._extra_data = {}
+        return events
+
+
+class RayLogSpanBinary(object):
+    """A log span that is recorded in the binary ring buffer.
+
+    Attributes:
+        event_type (str): The type of the event being logged.
+        name (str): The text displayed for the span in the timeline.
+        task_id (bytes): The raw ID of the task the span belongs to.
+        extra_data: Additional information to log.
+    """
+
+    def __init__(self,
+                 profiler,
+                 event_type,
+                 name=None,
+                 task_id=None,
+                 extra_data=None):
+        self.profiler = profiler
+        self.event_type = event_type
+        self.name = name
+        self.task_id = task_id
+        self.extra_data = extra_data
+
+    def set_attribute(self, key, value):
+        """Add a key-value pair to the extra_data dict.
+
+        Args:
+            key: The attribute name.
+            value: The attribute value.
+        """
+        if not isinstance(key, str) or not isinstance(value, str):
+            raise ValueError("The extra_data argument must be a "
+                             "dictionary mapping strings to strings.")
+        if self.extra_data is None:
+            self.extra_data = {}
+        self.extra_data[key] = value
+
+    def __enter__(self):
+        self.start_time = time.time()
+        return self
+
+    def __exit__(self, type, value, tb):
+        extra_data = self.extra_data
+        if type is not None:
+            extra_data = {
+                "type": str(type),
+                "value": str(value),
+                "traceback": str(traceback.format_exc()),
+            }
+        self.profiler.add_binary_event(self.start_time, time.time(),
+                                       self.event_type, self.name,
+                                       self.task_id, extra_data)
+
 
 class RayLogSpanNonRaylet(object):
     """An object used to enable logging a span of events with a with statement.
@@ -45,6 +45,19 @@ HASH_MISMATCH_PUSH_ERROR = "object_hash_mismatch"
 INFEASIBLE_TASK_ERROR = "infeasible_task"
 REMOVED_NODE_ERROR = "node_removed"
 
+# The format used to buffer profile events on workers and drivers. "json"
+# keeps one Python dictionary per event, "binary" writes fixed-size records
+# into a preallocated ring buffer, and "disabled" turns profiling off.
+PROFILING_MODE = os.environ.get("RAY_PROFILING_MODE", "json")
+
+# Only one in this many tasks is profiled. Spans that happen outside of task
+# execution (for example on the driver) are sampled at the same rate.
+PROFILING_SAMPLE_EVERY_N = env_integer("RAY_PROFILING_SAMPLE_EVERY_N", 1)
+
+# The number of records in the binary profiling ring buffer. When the buffer
+# fills up before it is flushed, the oldest records are overwritten.
+PROFILING_BUFFER_SIZE = env_integer("RAY_PROFILING_BUFFER_SIZE", 2**16)
+
 # Abort autoscaling if more than this number of errors are encountered. This
 # is a safety feature to prevent e.g. runaway node launches.
 AUTOSCALER_MAX_NUM_FAILURES = env_integer("AUTOSCALER_MAX_NUM_FAILURES", 5)
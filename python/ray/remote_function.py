@@ -64,6 +64,8 @@ class RemoteFunction(object):
         _max_calls: The number of times a worker can execute this function
             before executing.
         _function_signature: The function signature.
+        _default_task_resources: The resource requirements of invocations
+            that don't override them, or None if not computed yet.
     """
 
     def __init__(self, function, num_cpus, num_gpus, resources,
@@ -87,6 +89,7 @@ class RemoteFunction(object):
         ray.signature.check_signature_supported(self._function)
         self._function_signature = ray.signature.extract_signature(
             self._function)
+        self._default_task_resources = None
 
         # # Export the function.
         worker = ray.worker.get_global_worker()
@@ -105,6 +108,19 @@ class RemoteFunction(object):
         """This runs immediately when a remote function is called."""
         return self._submit(args=args, kwargs=kwargs)
 
+    def map(self, *iterables):
+        """Call the remote function on the elements of the iterables.
+
+        Like the builtin map, the function is called with one element from each
+        iterable until the shortest one is exhausted. The tasks are submitted
+        together with ray.submit_batch.
+
+        Returns:
+            A list with the result of remote() for each call.
+        """
+        return ray.worker.submit_batch(
+            (self, args) for args in zip(*iterables))
+
     def _submit(self,
                 args=None,
                 kwargs=None,
@@ -122,9 +138,18 @@ class RemoteFunction(object):
         if num_return_vals is None:
             num_return_vals = self._num_return_vals
 
-        resources = ray.utils.resources_from_resource_arguments(
-            self._num_cpus, self._num_gpus, self._resources, num_cpus,
-            num_gpus, resources)
+        if num_cpus is None and num_gpus is None and resources is None:
+            # Only validate the default resources on the first invocation.
+            if self._default_task_resources is None:
+                self._default_task_resources = (
+                    ray.utils.resources_from_resource_arguments(
+                        self._num_cpus, self._num_gpus, self._resources, None,
+                        None, None))
+            resources = self._default_task_resources
+        else:
+            resources = ray.utils.resources_from_resource_arguments(
+                self._num_cpus, self._num_gpus, self._resources, num_cpus,
+                num_gpus, resources)
         if worker.mode == ray.worker.LOCAL_MODE:
             # In LOCAL_MODE, remote calls simply execute the function.
             # We copy the arguments to prevent the function call from
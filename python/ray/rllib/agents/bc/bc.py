@@ -39,6 +39,9 @@ DEFAULT_CONFIG = {
         # Number of gradients applied for each `train` step
         "grads_per_step": 100,
     },
+    # Whether each remote evaluator samples only from its own contiguous
+    # shard of the dataset, instead of from all of it
+    "shard_dataset": False,
     # Arguments to pass to the env creator
     "env_config": {},
 }
@@ -70,8 +73,9 @@ class BCAgent(Agent):
         else:
             remote_cls = RemoteBCEvaluator
         self.remote_evaluators = [
-            remote_cls.remote(self.env_creator, self.config, self.logdir)
-            for _ in range(self.config["num_workers"])
+            remote_cls.remote(
+                self.env_creator, self.config, self.logdir, worker_index=i + 1)
+            for i in range(self.config["num_workers"])
         ]
         self.optimizer = AsyncGradientsOptimizer(self.local_evaluator,
                                                  self.remote_evaluators,
@@ -13,10 +13,17 @@ from ray.rllib.models import ModelCatalog
 
 
 class BCEvaluator(EvaluatorInterface):
-    def __init__(self, env_creator, config, logdir):
+    def __init__(self, env_creator, config, logdir, worker_index=0):
         env = ModelCatalog.get_preprocessor_as_wrapper(
             env_creator(config["env_config"]), config["model"])
-        self.dataset = ExperienceDataset(config["dataset_path"])
+        if config["shard_dataset"] and worker_index > 0:
+            # Remote evaluators each sample from their own shard.
+            self.dataset = ExperienceDataset(
+                config["dataset_path"],
+                shard_index=worker_index - 1,
+                num_shards=config["num_workers"])
+        else:
+            self.dataset = ExperienceDataset(config["dataset_path"])
         self.policy = BCPolicy(env.observation_space, env.action_space, config)
         self.config = config
         self.logdir = logdir
@@ -2,33 +2,164 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import argparse
 import itertools
+import json
+import os
 import pickle
 
 import numpy as np
 
+COLUMNS = ["observations", "actions"]
+METADATA_FILE = "metadata.json"
+
 
 class ExperienceDataset(object):
-    def __init__(self, dataset_path):
+    def __init__(self, dataset_path, shard_index=0, num_shards=1):
         """Create dataset of experience to imitate.
 
         Parameters
         ----------
         dataset_path:
-          Path of file containing the database as pickled list of trajectories,
+          Either a directory written by ExperienceDatasetWriter, or the path
+          of a file containing the database as pickled list of trajectories,
           each trajectory being a list of steps,
           each step containing the observation and action as its first two
             elements.
-          The file must be available on each machine used by a BCEvaluator.
+          The path must be available on each machine used by a BCEvaluator.
+          Directories are memory mapped, so only the pages touched by
+          sampled batches are read into memory.
+        shard_index: int
+          Index of the contiguous shard of steps to sample from.
+        num_shards: int
+          Number of shards the steps are split into, e.g. one per evaluator.
         """
-        self._dataset = list(
-            itertools.chain.from_iterable(
-                pickle.load(open(dataset_path, "rb"))))
+        if os.path.isdir(dataset_path):
+            self._columns = _open_columns(dataset_path)
+        else:
+            self._columns = _load_pickled_columns(dataset_path)
+        num_steps = len(self._columns["observations"])
+        assert 0 <= shard_index < num_shards
+        self._start = num_steps * shard_index // num_shards
+        self._end = num_steps * (shard_index + 1) // num_shards
+        if self._start == self._end:
+            raise ValueError(
+                "Shard {} of {} of dataset {} with {} steps is empty.".format(
+                    shard_index, num_shards, dataset_path, num_steps))
+
+    def __len__(self):
+        return self._end - self._start
 
     def sample(self, batch_size):
-        indexes = np.random.choice(len(self._dataset), batch_size)
-        samples = {
-            'observations': [self._dataset[i][0] for i in indexes],
-            'actions': [self._dataset[i][1] for i in indexes]
-        }
+        # Sorted indexes keep reads from the memory map mostly sequential.
+        indexes = np.sort(
+            np.random.randint(self._start, self._end, size=batch_size))
+        samples = {k: self._columns[k][indexes] for k in COLUMNS}
         return samples
+
+
+class ExperienceDatasetWriter(object):
+    def __init__(self, dataset_path, flush_every=10000):
+        """Write experience to a columnar on-disk dataset.
+
+        Each column is appended to a raw binary file in `dataset_path`, and
+        the dtypes and shapes are recorded in a metadata file on close().
+
+        Parameters
+        ----------
+        dataset_path:
+          Directory to write the dataset to. It is created if needed.
+        flush_every: int
+          Number of steps to buffer in memory before appending to disk.
+        """
+        if not os.path.exists(dataset_path):
+            os.makedirs(dataset_path)
+        self._path = dataset_path
+        self._flush_every = flush_every
+        self._buffers = {k: [] for k in COLUMNS}
+        self._files = {
+            k: open(os.path.join(dataset_path, k + ".bin"), "wb")
+            for k in COLUMNS
+        }
+        self._metadata = {}
+        self._num_steps = 0
+
+    def add_step(self, observation, action):
+        self._buffers["observations"].append(observation)
+        self._buffers["actions"].append(action)
+        if len(self._buffers["observations"]) >= self._flush_every:
+            self.flush()
+
+    def add_trajectory(self, trajectory):
+        for step in trajectory:
+            self.add_step(step[0], step[1])
+
+    def flush(self):
+        for k in COLUMNS:
+            if not self._buffers[k]:
+                continue
+            column = np.asarray(self._buffers[k])
+            if k not in self._metadata:
+                self._metadata[k] = {
+                    "dtype": column.dtype.str,
+                    "shape": list(column.shape[1:]),
+                }
+            column = column.astype(
+                np.dtype(self._metadata[k]["dtype"]), copy=False)
+            assert list(column.shape[1:]) == self._metadata[k]["shape"], \
+                "all steps must have the same {} shape".format(k)
+            self._files[k].write(np.ascontiguousarray(column).tobytes())
+        self._num_steps += len(self._buffers["observations"])
+        self._buffers = {k: [] for k in COLUMNS}
+
+    def close(self):
+        self.flush()
+        for f in self._files.values():
+            f.close()
+        with open(os.path.join(self._path, METADATA_FILE), "w") as f:
+            json.dump({
+                "num_steps": self._num_steps,
+                "columns": self._metadata
+            }, f)
+
+
+def convert_pickled_dataset(pickle_path, dataset_path):
+    """Converts a pickled list of trajectories to the columnar format."""
+
+    writer = ExperienceDatasetWriter(dataset_path)
+    for trajectory in pickle.load(open(pickle_path, "rb")):
+        writer.add_trajectory(trajectory)
+    writer.close()
+
+
+def _open_columns(dataset_path):
+    with open(os.path.join(dataset_path, METADATA_FILE)) as f:
+        metadata = json.load(f)
+    columns = {}
+    for k in COLUMNS:
+        info = metadata["columns"][k]
+        columns[k] = np.memmap(
+            os.path.join(dataset_path, k + ".bin"),
+            dtype=np.dtype(info["dtype"]),
+            mode="r",
+            shape=tuple([metadata["num_steps"]] + info["shape"]))
+    return columns
+
+
+def _load_pickled_columns(dataset_path):
+    steps = list(
+        itertools.chain.from_iterable(pickle.load(open(dataset_path, "rb"))))
+    return {
+        "observations": np.array([step[0] for step in steps]),
+        "actions": np.array([step[1] for step in steps]),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Convert a pickled BC dataset to the memory mapped "
+        "columnar format.")
+    parser.add_argument("pickle_path", type=str)
+    parser.add_argument("dataset_path", type=str)
+    args = parser.parse_args()
+    convert_pickled_dataset(args.pickle_path, args.dataset_path)
@@ -13,6 +13,9 @@ DEFAULT_CONFIG = with_common_config({
     "num_workers": 0,
     # Learning rate
     "lr": 0.0004,
+    # Compute advantages for all trajectories in a sample batch at once,
+    # instead of separately for each trajectory
+    "batch_postprocessing": False,
     # Override model config
     "model": {
         # Use LSTM model.
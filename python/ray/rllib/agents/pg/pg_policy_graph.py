@@ -6,7 +6,8 @@ import tensorflow as tf
 
 import ray
 from ray.rllib.models.catalog import ModelCatalog
-from ray.rllib.evaluation.postprocessing import compute_advantages
+from ray.rllib.evaluation.postprocessing import compute_advantages, \
+    compute_advantages_batch
 from ray.rllib.evaluation.tf_policy_graph import TFPolicyGraph
 
 
@@ -19,6 +20,7 @@ class PGPolicyGraph(TFPolicyGraph):
     def __init__(self, obs_space, action_space, config):
         config = dict(ray.rllib.agents.pg.pg.DEFAULT_CONFIG, **config)
         self.config = config
+        self.batch_postprocessing = config["batch_postprocessing"]
 
         # Setup policy
         obs = tf.placeholder(tf.float32, shape=[None] + list(obs_space.shape))
@@ -60,5 +62,13 @@ class PGPolicyGraph(TFPolicyGraph):
         return compute_advantages(
             sample_batch, 0.0, self.config["gamma"], use_gae=False)
 
+    def postprocess_trajectories(self, sample_batch, trajectory_ends):
+        return compute_advantages_batch(
+            sample_batch,
+            0.0,
+            self.config["gamma"],
+            use_gae=False,
+            trajectory_ends=trajectory_ends)
+
     def get_initial_state(self):
         return self.model.state_init
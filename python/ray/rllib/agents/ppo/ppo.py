@@ -52,6 +52,12 @@ DEFAULT_CONFIG = with_common_config({
     "observation_filter": "MeanStdFilter",
     # Use the sync samples optimizer instead of the multi-gpu one
     "simple_optimizer": False,
+    # Keep evaluators sampling the next batch during SGD (multi-gpu only).
+    # Batches are then collected with weights one iteration old.
+    "pipeline_sampling": False,
+    # Compute advantages for all trajectories in a sample batch at once,
+    # instead of separately for each trajectory
+    "batch_postprocessing": False,
     # Override model config
     "model": {
         # Whether to use LSTM model
@@ -100,6 +106,7 @@ class PPOAgent(Agent):
                     "num_gpus": self.config["num_gpus"],
                     "timesteps_per_batch": self.config["timesteps_per_batch"],
                     "standardize_fields": ["advantages"],
+                    "pipeline_sampling": self.config["pipeline_sampling"],
                 })
 
     def _train(self):
@@ -2,10 +2,12 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import numpy as np
 import tensorflow as tf
 
 import ray
-from ray.rllib.evaluation.postprocessing import compute_advantages
+from ray.rllib.evaluation.postprocessing import compute_advantages, \
+    compute_advantages_batch
 from ray.rllib.evaluation.tf_policy_graph import TFPolicyGraph, \
     LearningRateSchedule
 from ray.rllib.models.catalog import ModelCatalog
@@ -104,6 +106,7 @@ class PPOPolicyGraph(LearningRateSchedule, TFPolicyGraph):
         self.sess = tf.get_default_session()
         self.action_space = action_space
         self.config = config
+        self.batch_postprocessing = config["batch_postprocessing"]
         self.kl_coeff_val = self.config["kl_coeff"]
         self.kl_target = self.config["kl_target"]
         dist_cls, logit_dim = ModelCatalog.get_action_dist(action_space)
@@ -268,6 +271,28 @@ class PPOPolicyGraph(LearningRateSchedule, TFPolicyGraph):
             use_gae=self.config["use_gae"])
         return batch
 
+    def postprocess_trajectories(self, sample_batch, trajectory_ends):
+        last_r = np.zeros(len(trajectory_ends))
+        truncated = ~np.asarray(sample_batch["dones"])[trajectory_ends]
+        if truncated.any():
+            # Bootstrap all truncated trajectories with one value call
+            last_idx = trajectory_ends[truncated]
+            feed_dict = {
+                self.observations: sample_batch["new_obs"][last_idx],
+                self.model.seq_lens: np.ones(len(last_idx)),
+            }
+            for i, ph in enumerate(self.model.state_in):
+                feed_dict[ph] = sample_batch["state_out_{}".format(i)][
+                    last_idx]
+            last_r[truncated] = self.sess.run(self.value_function, feed_dict)
+        return compute_advantages_batch(
+            sample_batch,
+            last_r,
+            self.config["gamma"],
+            self.config["lambda"],
+            use_gae=self.config["use_gae"],
+            trajectory_ends=trajectory_ends)
+
     def gradients(self, optimizer):
         return optimizer.compute_gradients(
             self._loss, colocate_gradients_with_ops=True)
@@ -6,29 +6,51 @@ import ray
 from ray.rllib.evaluation.sample_batch import SampleBatch
 
 
+class SampleCollector(object):
+    """Collects sample batches from a set of remote evaluators.
+
+    Every evaluator always has one sample task in flight. Tasks that are
+    still in flight once enough timesteps have been collected are kept, and
+    their results are used by the next call to collect(). This lets the
+    evaluators keep sampling while the caller is busy, e.g. running SGD.
+    """
+
+    def __init__(self, agents):
+        self.agents = agents
+        # This variable maps the object IDs of trajectories that are currently
+        # computed to the agent that they are computed on.
+        self.agent_dict = {}
+
+    def collect(self, timesteps_per_batch):
+        if not self.agent_dict:
+            for agent in self.agents:
+                self.agent_dict[agent.sample.remote()] = agent
+
+        num_timesteps_so_far = 0
+        trajectories = []
+        while num_timesteps_so_far < timesteps_per_batch:
+            # Wait for as many samples as we expect to still need, so that
+            # they can be fetched with a single get.
+            if trajectories:
+                avg_count = max(1, num_timesteps_so_far // len(trajectories))
+                remaining = timesteps_per_batch - num_timesteps_so_far
+                num_needed = (remaining + avg_count - 1) // avg_count
+            else:
+                num_needed = 1
+            num_returns = max(1, min(num_needed, len(self.agent_dict)))
+            # TODO(pcm): Make wait support arbitrary iterators and remove the
+            # conversion to list here.
+            ready, _ = ray.wait(list(self.agent_dict), num_returns=num_returns)
+            for fut_sample in ready:
+                agent = self.agent_dict.pop(fut_sample)
+                # Start task with next trajectory and record it.
+                self.agent_dict[agent.sample.remote()] = agent
+
+            for next_sample in ray.get(ready):
+                num_timesteps_so_far += next_sample.count
+                trajectories.append(next_sample)
+        return SampleBatch.concat_samples(trajectories)
+
+
 def collect_samples(agents, timesteps_per_batch):
-    num_timesteps_so_far = 0
-    trajectories = []
-    # This variable maps the object IDs of trajectories that are currently
-    # computed to the agent that they are computed on; we start some initial
-    # tasks here.
-
-    agent_dict = {}
-
-    for agent in agents:
-        fut_sample = agent.sample.remote()
-        agent_dict[fut_sample] = agent
-
-    while num_timesteps_so_far < timesteps_per_batch:
-        # TODO(pcm): Make wait support arbitrary iterators and remove the
-        # conversion to list here.
-        [fut_sample], _ = ray.wait(list(agent_dict))
-        agent = agent_dict.pop(fut_sample)
-        # Start task with next trajectory and record it in the dictionary.
-        fut_sample2 = agent.sample.remote()
-        agent_dict[fut_sample2] = agent
-
-        next_sample = ray.get(fut_sample)
-        num_timesteps_so_far += next_sample.count
-        trajectories.append(next_sample)
-    return SampleBatch.concat_samples(trajectories)
+    return SampleCollector(agents).collect(timesteps_per_batch)
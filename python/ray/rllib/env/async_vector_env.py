@@ -2,6 +2,8 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import time
+
 from ray.rllib.env.serving_env import ServingEnv
 from ray.rllib.env.vector_env import VectorEnv
 from ray.rllib.env.multi_agent_env import MultiAgentEnv
@@ -148,22 +150,49 @@ class _ServingEnvToAsync(AsyncVectorEnv):
 
     def poll(self):
         with self.serving_env._results_avail_condition:
-            results = self._poll()
-            while len(results[0]) == 0:
-                self.serving_env._results_avail_condition.wait()
-                results = self._poll()
+            ready = self._ready_episodes()
+            while not self._batch_ready(ready):
+                self.serving_env._results_avail_condition.wait(
+                    self._batch_wait_timeout(ready))
+                ready = self._ready_episodes()
                 if not self.serving_env.isAlive():
                     raise Exception("Serving thread has stopped.")
+            results = self._poll(ready[:self.serving_env._max_batch_size])
         limit = self.serving_env._max_concurrent_episodes
         assert len(results[0]) < limit, \
             ("Too many concurrent episodes, were some leaked? This ServingEnv "
              "was created with max_concurrent={}".format(limit))
+        self.serving_env._batch_size_stats.push(len(results[0]))
         return results
 
-    def _poll(self):
+    def _ready_episodes(self):
+        """Returns episodes with pending data, oldest first."""
+
+        ready = [(eid, episode)
+                 for eid, episode in self.serving_env._episodes.copy().items()
+                 if not episode.data_queue.empty()]
+        return sorted(ready, key=lambda item: item[1].send_time)
+
+    def _batch_ready(self, ready):
+        if not ready:
+            return False
+        max_batch_size = self.serving_env._max_batch_size
+        if max_batch_size and len(ready) >= max_batch_size:
+            return True
+        return self._batch_wait_timeout(ready) <= 0
+
+    def _batch_wait_timeout(self, ready):
+        """Seconds until the oldest pending observation must be served."""
+
+        if not ready:
+            return None
+        oldest = ready[0][1].send_time
+        return oldest + self.serving_env._max_batch_wait_us / 1e6 - time.time()
+
+    def _poll(self, ready):
         all_obs, all_rewards, all_dones, all_infos = {}, {}, {}, {}
         off_policy_actions = {}
-        for eid, episode in self.serving_env._episodes.copy().items():
+        for eid, episode in ready:
             data = episode.get_data()
             if episode.cur_done:
                 del self.serving_env._episodes[eid]
@@ -181,9 +210,13 @@ class _ServingEnvToAsync(AsyncVectorEnv):
             _with_dummy_agent_id(off_policy_actions)
 
     def send_actions(self, action_dict):
+        now = time.time()
         for eid, action in action_dict.items():
-            self.serving_env._episodes[eid].action_queue.put(
-                action[_DUMMY_AGENT_ID])
+            episode = self.serving_env._episodes[eid]
+            self.serving_env._action_latency_stats.push(
+                1000 * (now - episode.send_time))
+            episode.action_queue.put(action[_DUMMY_AGENT_ID])
+        self.serving_env._num_actions += len(action_dict)
 
 
 class _VectorEnvToAsync(AsyncVectorEnv):
@@ -4,8 +4,11 @@ from __future__ import print_function
 
 from six.moves import queue
 import threading
+import time
 import uuid
 
+from ray.rllib.utils.window_stat import WindowStat
+
 
 class ServingEnv(threading.Thread):
     """An environment that provides policy serving.
@@ -32,7 +35,12 @@ class ServingEnv(threading.Thread):
               print(agent.train())
     """
 
-    def __init__(self, action_space, observation_space, max_concurrent=100):
+    def __init__(self,
+                 action_space,
+                 observation_space,
+                 max_concurrent=100,
+                 max_batch_size=None,
+                 max_batch_wait_us=0):
         """Initialize a serving env.
 
         ServingEnv subclasses must call this during their __init__.
@@ -42,6 +50,14 @@ class ServingEnv(threading.Thread):
             observation_space (gym.Space): Observation space of the env.
             max_concurrent (int): Max number of active episodes to allow at
                 once. Exceeding this limit raises an error.
+            max_batch_size (int): Max number of episodes whose observations
+                are passed to the policy at once. None means no limit.
+            max_batch_wait_us (int): Max time in microseconds to hold back
+                the oldest pending observation while waiting for more
+                episodes to batch with it. The wait ends early once
+                max_batch_size observations are pending. 0 disables waiting,
+                so only observations that happen to be pending together are
+                batched.
         """
 
         threading.Thread.__init__(self)
@@ -52,6 +68,12 @@ class ServingEnv(threading.Thread):
         self._finished = set()
         self._results_avail_condition = threading.Condition()
         self._max_concurrent_episodes = max_concurrent
+        self._max_batch_size = max_batch_size
+        self._max_batch_wait_us = max_batch_wait_us
+        self._action_latency_stats = WindowStat("action_latency_ms", 1000)
+        self._batch_size_stats = WindowStat("batch_size", 1000)
+        self._num_actions = 0
+        self._stats_start_time = time.time()
 
     def run(self):
         """Override this to implement the run loop.
@@ -110,6 +132,26 @@ class ServingEnv(threading.Thread):
         episode = self._get(episode_id)
         return episode.wait_for_action(observation)
 
+    def get_actions(self, episode_ids, observations):
+        """Record observations for many episodes and get on-policy actions.
+
+        All observations are submitted before waiting, so the actions can be
+        computed together instead of one policy evaluation per episode.
+
+        Arguments:
+            episode_ids (list): Episode ids returned from start_episode().
+            observations (list): Current observation of each episode.
+
+        Returns:
+            actions (list): Action from the env action space for each
+                episode.
+        """
+
+        episodes = [self._get(episode_id) for episode_id in episode_ids]
+        for episode, observation in zip(episodes, observations):
+            episode.request_action(observation)
+        return [episode.wait_for_requested_action() for episode in episodes]
+
     def log_action(self, episode_id, observation, action):
         """Record an observation and (off-policy) action taken.
 
@@ -152,6 +194,24 @@ class ServingEnv(threading.Thread):
         self._finished.add(episode.episode_id)
         episode.done(observation)
 
+    def serving_stats(self):
+        """Returns latency and throughput stats of action serving.
+
+        Latency is measured from when an observation is logged until its
+        action is available. This can be called from the driver with e.g.
+        `agent.optimizer.foreach_evaluator(lambda ev: ev.env.serving_stats())`.
+        """
+
+        elapsed = time.time() - self._stats_start_time
+        stats = {
+            "num_actions": self._num_actions,
+            "actions_per_s": self._num_actions / max(elapsed, 1e-6),
+        }
+        for window in [self._action_latency_stats, self._batch_size_stats]:
+            if window.count:
+                stats.update(window.stats())
+        return stats
+
     def _get(self, episode_id):
         """Get a started episode or raise an error."""
 
@@ -179,6 +239,7 @@ class _ServingEnvEpisode(object):
         self.cur_reward = 0.0
         self.cur_done = False
         self.cur_info = {}
+        self.send_time = None
 
     def get_data(self):
         if self.data_queue.empty():
@@ -192,8 +253,14 @@ class _ServingEnvEpisode(object):
         self.action_queue.get(True, timeout=60.0)
 
     def wait_for_action(self, observation):
+        self.request_action(observation)
+        return self.wait_for_requested_action()
+
+    def request_action(self, observation):
         self.new_observation = observation
         self._send()
+
+    def wait_for_requested_action(self):
         return self.action_queue.get(True, timeout=60.0)
 
     def done(self, observation):
@@ -215,6 +282,7 @@ class _ServingEnvEpisode(object):
         self.new_observation = None
         self.new_action = None
         self.cur_reward = 0.0
+        self.send_time = time.time()
         with self.results_avail_condition:
             self.data_queue.put_nowait(item)
             self.results_avail_condition.notify()
@@ -8,14 +8,14 @@ from ray.rllib.evaluation.sample_batch import (SampleBatch, MultiAgentBatch,
                                                SampleBatchBuilder,
                                                MultiAgentSampleBatchBuilder)
 from ray.rllib.evaluation.sampler import SyncSampler, AsyncSampler
-from ray.rllib.evaluation.postprocessing import (compute_advantages,
-                                                 compute_targets)
+from ray.rllib.evaluation.postprocessing import (
+    compute_advantages, compute_advantages_batch, compute_targets)
 from ray.rllib.evaluation.metrics import collect_metrics
 
 __all__ = [
     "EvaluatorInterface", "PolicyEvaluator", "PolicyGraph", "TFPolicyGraph",
     "TorchPolicyGraph", "SampleBatch", "MultiAgentBatch", "SampleBatchBuilder",
     "MultiAgentSampleBatchBuilder", "SyncSampler", "AsyncSampler",
-    "compute_advantages", "compute_targets", "collect_metrics",
-    "MultiAgentEpisode"
+    "compute_advantages", "compute_advantages_batch", "compute_targets",
+    "collect_metrics", "MultiAgentEpisode"
 ]
@@ -19,8 +19,13 @@ class PolicyGraph(object):
     Attributes:
         observation_space (gym.Space): Observation space of the policy.
         action_space (gym.Space): Action space of the policy.
+        batch_postprocessing (bool): Whether experiences are postprocessed
+            with a single postprocess_trajectories() call per sample batch
+            instead of postprocess_trajectory() calls per trajectory.
     """
 
+    batch_postprocessing = False
+
     def __init__(self, observation_space, action_space, config):
         """Initialize the graph.
 
@@ -106,6 +111,25 @@ class PolicyGraph(object):
         """
         return sample_batch
 
+    def postprocess_trajectories(self, sample_batch, trajectory_ends):
+        """Implements algorithm-specific postprocessing of many trajectories.
+
+        This is called instead of postprocess_trajectory() on each sample
+        batch if batch_postprocessing is set, which allows vectorizing the
+        postprocessing over all trajectories in the batch. Experiences from
+        other agents are not available here.
+
+        Arguments:
+            sample_batch (SampleBatch): batch of experiences for the policy,
+                which contains one or more trajectory fragments back to back.
+            trajectory_ends (np.ndarray): index of the last step of each
+                trajectory fragment in the batch.
+
+        Returns:
+            SampleBatch: postprocessed sample batch.
+        """
+        raise NotImplementedError
+
     def compute_gradients(self, postprocessed_batch):
         """Computes gradients against a batch of experiences.
 
@@ -54,6 +54,85 @@ def compute_advantages(rollout, last_r, gamma=0.9, lambda_=1.0, use_gae=True):
     return SampleBatch(traj)
 
 
+def compute_advantages_batch(batch,
+                             last_r,
+                             gamma=0.9,
+                             lambda_=1.0,
+                             use_gae=True,
+                             trajectory_ends=None):
+    """Computes value targets and advantages for many trajectories at once.
+
+    This is the vectorized version of compute_advantages() for batches that
+    pack many (possibly truncated) trajectories back to back.
+
+    Args:
+        batch (SampleBatch): SampleBatch of one or more trajectories
+        last_r (float|np.ndarray): Value estimation for the observation
+            following the last step of each trajectory
+        gamma (float): Discount factor.
+        lambda_ (float): Parameter for GAE
+        use_gae (bool): Using Generalized Advantage Estamation
+        trajectory_ends (np.ndarray): Index of the last step of each
+            trajectory. Defaults to the boundaries given by eps_id and dones.
+
+    Returns:
+        SampleBatch (SampleBatch): Object with experience from the batch and
+            processed rewards.
+    """
+
+    if trajectory_ends is None:
+        trajectory_ends = get_trajectory_ends(batch)
+    traj = dict(batch.items())
+    rewards = np.asarray(batch["rewards"], dtype=np.float64)
+
+    if use_gae:
+        assert "vf_preds" in batch, "Values not found!"
+        vpred_t = np.asarray(batch["vf_preds"], dtype=np.float64)
+        next_vpred_t = np.append(vpred_t[1:], 0.0)
+        next_vpred_t[trajectory_ends] = last_r
+        delta_t = rewards + gamma * next_vpred_t - vpred_t
+        traj["advantages"] = discount_trajectories(delta_t, gamma * lambda_,
+                                                   trajectory_ends)
+        traj["value_targets"] = (traj["advantages"] + vpred_t).astype(
+            np.float32)
+    else:
+        # Copy so that the rewards of the input batch are left unchanged.
+        rewards_plus_v = rewards.copy()
+        rewards_plus_v[trajectory_ends] += gamma * np.asarray(last_r)
+        traj["advantages"] = discount_trajectories(rewards_plus_v, gamma,
+                                                   trajectory_ends)
+        traj["value_targets"] = np.zeros_like(traj["advantages"])
+
+    traj["advantages"] = traj["advantages"].astype(np.float32)
+    return SampleBatch(traj)
+
+
+def get_trajectory_ends(batch):
+    """Returns the index of the last step of each trajectory in the batch.
+
+    Trajectories are delimited by changes of eps_id and by done steps.
+    """
+
+    eps_id = np.asarray(batch["eps_id"])
+    dones = np.asarray(batch["dones"], dtype=bool)
+    boundaries = (eps_id[1:] != eps_id[:-1]) | dones[:-1]
+    return np.append(np.flatnonzero(boundaries), len(eps_id) - 1)
+
+
+def discount_trajectories(x, gamma, trajectory_ends):
+    """Like discount(), but restarts the sum after each trajectory end."""
+
+    # A single filter pass over the whole batch adds to each step the
+    # discounted sum of all later trajectories, which is subtracted here.
+    y = discount(x, gamma)
+    lengths = np.diff(np.append(-1, trajectory_ends))
+    next_start = np.repeat(trajectory_ends + 1, lengths)
+    leaked = next_start < len(x)
+    steps = next_start[leaked] - np.flatnonzero(leaked)
+    y[leaked] -= gamma**steps * y[next_start[leaked]]
+    return y
+
+
 def compute_targets(rollout, action_space, last_r=0.0, gamma=0.9, lambda_=1.0):
     """Given a rollout, compute targets.
 
@@ -21,36 +21,126 @@ class SampleBatchBuilder(object):
 
     For efficiency, SampleBatches hold values in column form (as arrays).
     However, it is useful to add data one row (dict) at a time.
+
+    Numeric array columns (e.g., image observations) are written in place
+    into NumPy buffers, whose shape and dtype are taken from the first row.
+    Buffers grow geometrically and are handed to the built batch without
+    copying; the next buffers are preallocated with the size of the previous
+    batch. Other columns (e.g., scalars and info dicts) are accumulated in
+    lists.
     """
 
-    def __init__(self):
+    def __init__(self, initial_capacity=64):
+        self.arrays = {}
+        # Number of rows written so far to each array column
+        self.written = {}
         self.buffers = collections.defaultdict(list)
         self.count = 0
+        self.capacity = initial_capacity
 
     def add_values(self, **values):
         """Add the given dictionary (row) of values to this batch."""
 
+        i = self.count
         for k, v in values.items():
-            self.buffers[k].append(v)
+            arr = self.arrays.get(k)
+            if arr is not None and i < len(arr):
+                if not isinstance(v, np.ndarray):
+                    v = np.asarray(v)
+                if v.shape == arr.shape[1:] and (
+                        v.dtype == arr.dtype
+                        or np.can_cast(v.dtype, arr.dtype, "same_kind")):
+                    arr[i] = v
+                    self.written[k] += 1
+                    continue
+            if k in self.buffers:
+                self.buffers[k].append(v)
+            else:
+                self._write(k, [v])
         self.count += 1
 
     def add_batch(self, batch):
         """Add the given batch of values to this batch."""
 
         for k, column in batch.items():
-            self.buffers[k].extend(column)
+            if k in self.buffers:
+                self.buffers[k].extend(column)
+            else:
+                self._write(k, column)
         self.count += batch.count
 
     def build_and_reset(self):
         """Returns a sample batch including all previously added values."""
 
-        batch = SampleBatch(
-            {k: to_float_array(v)
-             for k, v in self.buffers.items()})
+        columns = {}
+        for k, arr in self.arrays.items():
+            if self.written[k] != self.count:
+                raise ValueError(
+                    "Column {} has {} rows, but the batch has {}".format(
+                        k, self.written[k], self.count))
+            column = arr[:self.count]
+            if 4 * self.count < 3 * len(arr):
+                # Don't let the batch pin a mostly unused buffer.
+                column = column.copy()
+            columns[k] = column
+        for k, v in self.buffers.items():
+            columns[k] = to_float_array(v)
+        batch = SampleBatch(columns)
+        # The arrays now belong to the batch, so start new ones next time.
+        self.capacity = max(self.capacity, self.count)
+        self.arrays.clear()
+        self.written.clear()
         self.buffers.clear()
         self.count = 0
         return batch
 
+    def _write(self, key, values):
+        """Writes rows at the end of a column, reallocating it if needed."""
+
+        try:
+            rows = np.asarray(values)
+        except ValueError:
+            rows = None  # ragged values
+        if rows is None or rows.dtype.kind not in "biuf" or rows.ndim < 2:
+            # Scalar columns are cheapest to build from a list, and other
+            # columns may not have a fixed shape or numeric dtype.
+            self._to_list(key).extend(values)
+            return
+        end = self.count + len(rows)
+        arr = self.arrays.get(key)
+        if arr is None:
+            arr = np.empty(
+                (max(end, self.capacity), ) + rows.shape[1:],
+                dtype=_buffer_dtype(rows.dtype))
+        elif arr.shape[1:] != rows.shape[1:]:
+            self._to_list(key).extend(values)
+            return
+        elif not np.can_cast(rows.dtype, arr.dtype, "same_kind"):
+            arr = arr.astype(
+                _buffer_dtype(np.result_type(arr.dtype, rows.dtype)))
+        if len(arr) < end:
+            grown = np.empty(
+                (max(end, 2 * len(arr)), ) + arr.shape[1:], dtype=arr.dtype)
+            grown[:self.count] = arr[:self.count]
+            arr = grown
+        arr[self.count:end] = rows
+        self.arrays[key] = arr
+        self.written[key] = self.written.get(key, 0) + len(rows)
+
+    def _to_list(self, key):
+        """Moves a column into list mode, keeping the rows written so far."""
+
+        column = self.buffers[key]
+        if key in self.arrays:
+            column.extend(self.arrays.pop(key)[:self.written.pop(key)])
+        return column
+
+
+def _buffer_dtype(dtype):
+    if dtype == np.float64:
+        return np.dtype(np.float32)  # save some memory
+    return dtype
+
 
 class MultiAgentSampleBatchBuilder(object):
     """Util to build SampleBatches for each policy in a multi-agent env.
@@ -75,8 +165,12 @@ class MultiAgentSampleBatchBuilder(object):
             k: SampleBatchBuilder()
             for k in policy_map.keys()
         }
+        # Trajectory end indexes of rows awaiting batch postprocessing
+        self.trajectory_ends = collections.defaultdict(list)
         self.agent_builders = {}
         self.agent_to_policy = {}
+        # Reset builders are pooled so that their buffers get reused
+        self.free_builders = []
         self.count = 0  # increment this manually
 
     def has_pending_data(self):
@@ -94,7 +188,10 @@ class MultiAgentSampleBatchBuilder(object):
         """
 
         if agent_id not in self.agent_builders:
-            self.agent_builders[agent_id] = SampleBatchBuilder()
+            if self.free_builders:
+                self.agent_builders[agent_id] = self.free_builders.pop()
+            else:
+                self.agent_builders[agent_id] = SampleBatchBuilder()
             self.agent_to_policy[agent_id] = policy_id
         builder = self.agent_builders[agent_id]
         builder.add_values(**values)
@@ -127,13 +224,21 @@ class MultiAgentSampleBatchBuilder(object):
                 raise ValueError(
                     "Batches sent to postprocessing must only contain steps "
                     "from a single trajectory.", pre_batch)
-            post_batches[agent_id] = policy.postprocess_trajectory(
-                pre_batch, other_batches)
+            if policy.batch_postprocessing:
+                # Postprocessed together with the whole batch on build
+                post_batches[agent_id] = pre_batch
+            else:
+                post_batches[agent_id] = policy.postprocess_trajectory(
+                    pre_batch, other_batches)
 
         # Append into policy batches and reset
         for agent_id, post_batch in sorted(post_batches.items()):
-            self.policy_builders[self.agent_to_policy[agent_id]].add_batch(
-                post_batch)
+            policy_id = self.agent_to_policy[agent_id]
+            builder = self.policy_builders[policy_id]
+            builder.add_batch(post_batch)
+            if self.policy_map[policy_id].batch_postprocessing:
+                self.trajectory_ends[policy_id].append(builder.count - 1)
+        self.free_builders.extend(self.agent_builders.values())
         self.agent_builders.clear()
         self.agent_to_policy.clear()
 
@@ -148,7 +253,13 @@ class MultiAgentSampleBatchBuilder(object):
         policy_batches = {}
         for policy_id, builder in self.policy_builders.items():
             if builder.count > 0:
-                policy_batches[policy_id] = builder.build_and_reset()
+                batch = builder.build_and_reset()
+                if policy_id in self.trajectory_ends:
+                    policy = self.policy_map[policy_id]
+                    batch = policy.postprocess_trajectories(
+                        batch, np.array(self.trajectory_ends[policy_id]))
+                policy_batches[policy_id] = batch
+        self.trajectory_ends.clear()
         old_count = self.count
         self.count = 0
         return MultiAgentBatch.wrap_as_needed(policy_batches, old_count)
@@ -209,34 +320,80 @@ class SampleBatch(object):
 
     For example, {"obs": [1, 2, 3], "reward": [0, -1, 1]} is a batch of three
     samples, each with an "obs" and "reward" attribute.
+
+    Batches produced by concat() and concat_samples() are lazy: they keep a
+    list of the chunks they are made of, and each column is only
+    concatenated into a contiguous array the first time it is accessed.
+    Until then, in-place changes to the arrays of the source batches are
+    visible through the concatenated batch.
     """
 
     def __init__(self, *args, **kwargs):
         """Constructs a sample batch (same params as dict constructor)."""
 
-        self.data = dict(*args, **kwargs)
+        self._data = dict(*args, **kwargs)
         lengths = []
-        for k, v in self.data.copy().items():
+        for k, v in self._data.items():
             assert type(k) == str, self
             lengths.append(len(v))
         if not lengths:
             raise ValueError("Empty sample batch")
         assert len(set(lengths)) == 1, "data columns must be same length"
         self.count = lengths[0]
+        self._chunks = None
+        self._num_pending = 0
+
+    @staticmethod
+    def _from_columns(data, count):
+        """Builds a batch from already validated columns."""
+
+        batch = SampleBatch.__new__(SampleBatch)
+        batch._data = data
+        batch.count = count
+        batch._chunks = None
+        batch._num_pending = 0
+        return batch
+
+    @staticmethod
+    def _from_chunks(chunks):
+        """Builds a lazy batch whose columns are concatenated on access."""
+
+        batch = SampleBatch.__new__(SampleBatch)
+        # Pending columns are tracked with a None placeholder.
+        batch._data = {k: None for k in chunks[0].keys()}
+        batch.count = sum(c.count for c in chunks)
+        batch._chunks = chunks
+        batch._num_pending = len(batch._data)
+        return batch
 
     @staticmethod
     def concat_samples(samples):
+        """Returns a new batch made of the rows of all the given batches.
+
+        The result is lazy and shares the column arrays of the given batches
+        until each column is first accessed, so modifying those arrays in
+        place before then also changes the result. Copy the batches first if
+        they are going to be modified.
+        """
+
         if isinstance(samples[0], MultiAgentBatch):
             return MultiAgentBatch.concat_samples(samples)
-        out = {}
-        samples = [s for s in samples if s.count > 0]
-        for k in samples[0].keys():
-            out[k] = np.concatenate([s[k] for s in samples])
-        return SampleBatch(out)
+        chunks = []
+        for s in samples:
+            if s.count == 0:
+                continue
+            if s._chunks is not None:
+                chunks.extend(s._chunks)
+            else:
+                chunks.append(s)
+        return SampleBatch._from_chunks(chunks)
 
     def concat(self, other):
         """Returns a new SampleBatch with each data column concatenated.
 
+        Like concat_samples(), the result shares the column arrays of both
+        batches until each column is first accessed.
+
         Examples:
             >>> b1 = SampleBatch({"a": [1, 2]})
             >>> b2 = SampleBatch({"a": [3, 4, 5]})
@@ -244,11 +401,35 @@ class SampleBatch(object):
             {"a": [1, 2, 3, 4, 5]}
         """
 
-        assert self.keys() == other.keys(), "must have same columns"
-        out = {}
-        for k in self.keys():
-            out[k] = np.concatenate([self[k], other[k]])
-        return SampleBatch(out)
+        assert set(self.keys()) == set(other.keys()), "must have same columns"
+        return SampleBatch.concat_samples([self, other])
+
+    def slice(self, start, end):
+        """Returns rows [start, end) of this batch without copying data.
+
+        Examples:
+            >>> batch = SampleBatch({"a": [1, 2, 3, 4, 5]})
+            >>> print(batch.slice(1, 3))
+            {"a": [2, 3]}
+        """
+
+        start, end, _ = slice(start, end).indices(self.count)
+        end = max(start, end)
+        if self._chunks is None:
+            return SampleBatch._from_columns(
+                {k: v[start:end]
+                 for k, v in self._data.items()}, end - start)
+        chunks = []
+        offset = 0
+        for chunk in self._chunks:
+            lo = max(start - offset, 0)
+            hi = min(end - offset, chunk.count)
+            if lo < hi:
+                chunks.append(chunk.slice(lo, hi))
+            offset += chunk.count
+        if not chunks:
+            return self._chunks[0].slice(0, 0)
+        return SampleBatch._from_chunks(chunks)
 
     def rows(self):
         """Returns an iterator over data rows, i.e. dicts with column values.
@@ -262,10 +443,11 @@ class SampleBatch(object):
             {"a": 3, "b": 6}
         """
 
+        columns = self.data
         for i in range(self.count):
             row = {}
-            for k in self.keys():
-                row[k] = self[k][i]
+            for k, v in columns.items():
+                row[k] = v[i]
             yield row
 
     def columns(self, keys):
@@ -287,11 +469,37 @@ class SampleBatch(object):
         for key, val in self.items():
             self[key] = val[permutation]
 
+    @property
+    def data(self):
+        """The dict of columns, with all columns made contiguous."""
+
+        self._consolidate_all()
+        return self._data
+
+    def _consolidate(self, key):
+        value = np.concatenate([c[key] for c in self._chunks])
+        self._data[key] = value
+        self._num_pending -= 1
+        if self._num_pending == 0:
+            self._chunks = None
+        return value
+
+    def _consolidate_all(self):
+        if self._chunks is not None:
+            for k, v in list(self._data.items()):
+                if v is None:
+                    self._consolidate(k)
+
     def __getitem__(self, key):
-        return self.data[key]
+        value = self._data[key]
+        if value is None:
+            value = self._consolidate(key)
+        return value
 
     def __setitem__(self, key, item):
-        self.data[key] = item
+        # Chunks must keep matching every column, so stop being lazy first.
+        self._consolidate_all()
+        self._data[key] = item
 
     def __str__(self):
         return "SampleBatch({})".format(str(self.data))
@@ -300,13 +508,13 @@ class SampleBatch(object):
         return "SampleBatch({})".format(str(self.data))
 
     def keys(self):
-        return self.data.keys()
+        return self._data.keys()
 
     def items(self):
         return self.data.items()
 
     def __iter__(self):
-        return self.data.__iter__()
+        return self._data.__iter__()
 
     def __contains__(self, x):
-        return x in self.data
+        return x in self._data
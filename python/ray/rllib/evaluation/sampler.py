@@ -8,7 +8,7 @@ import threading
 
 from ray.rllib.evaluation.episode import MultiAgentEpisode
 from ray.rllib.evaluation.sample_batch import MultiAgentSampleBatchBuilder, \
-    MultiAgentBatch
+    MultiAgentBatch, SampleBatch
 from ray.rllib.evaluation.tf_policy_graph import TFPolicyGraph
 from ray.rllib.env.async_vector_env import AsyncVectorEnv
 from ray.rllib.env.atari_wrappers import get_wrapper_by_cls, MonitorEnv
@@ -149,15 +149,18 @@ class AsyncSampler(threading.Thread):
             return rollout
 
         # Auto-concat rollouts; TODO(ekl) is this important for A3C perf?
-        while not rollout["dones"][-1]:
+        parts = [rollout]
+        while not parts[-1]["dones"][-1]:
             try:
                 part = self.queue.get_nowait()
                 if isinstance(part, BaseException):
-                    raise rollout
-                rollout = rollout.concat(part)
+                    raise part
+                parts.append(part)
             except queue.Empty:
                 break
-        return rollout
+        if len(parts) == 1:
+            return rollout
+        return SampleBatch.concat_samples(parts)
 
     def get_metrics(self):
         completed = []
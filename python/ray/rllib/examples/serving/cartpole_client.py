@@ -20,6 +20,11 @@ parser.add_argument(
     "--off-policy",
     action="store_true",
     help="Whether to take random instead of on-policy actions.")
+parser.add_argument(
+    "--address",
+    type=str,
+    default="http://localhost:8900",
+    help="Server address, http://host:port or tcp://host:port.")
 parser.add_argument(
     "--stop-at-reward",
     type=int,
@@ -29,7 +34,7 @@ parser.add_argument(
 if __name__ == "__main__":
     args = parser.parse_args()
     env = gym.make("CartPole-v0")
-    client = PolicyClient("http://localhost:8900")
+    client = PolicyClient(args.address)
 
     eid = client.start_episode(training_enabled=not args.no_train)
     obs = env.reset()
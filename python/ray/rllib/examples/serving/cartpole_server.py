@@ -6,8 +6,12 @@ from __future__ import print_function
 To try this out, in two separate shells run:
     $ python cartpole_server.py
     $ python cartpole_client.py
+
+Pass --binary to serve the persistent binary protocol instead of HTTP, and
+connect with `cartpole_client.py --address=tcp://localhost:8900`.
 """
 
+import argparse
 import os
 from gym import spaces
 import numpy as np
@@ -15,7 +19,7 @@ import numpy as np
 import ray
 from ray.rllib.agents.dqn import DQNAgent
 from ray.rllib.env.serving_env import ServingEnv
-from ray.rllib.utils.policy_server import PolicyServer
+from ray.rllib.utils.policy_server import PolicyServer, BinaryPolicyServer
 from ray.tune.logger import pretty_print
 from ray.tune.registry import register_env
 
@@ -23,23 +27,34 @@ SERVER_ADDRESS = "localhost"
 SERVER_PORT = 8900
 CHECKPOINT_FILE = "last_checkpoint.out"
 
+parser = argparse.ArgumentParser()
+parser.add_argument(
+    "--binary",
+    action="store_true",
+    help="Whether to serve the binary protocol instead of HTTP.")
+
 
 class CartpoleServing(ServingEnv):
-    def __init__(self):
+    def __init__(self, binary=False):
         ServingEnv.__init__(
             self, spaces.Discrete(2),
             spaces.Box(low=-10, high=10, shape=(4, ), dtype=np.float32))
+        self.binary = binary
 
     def run(self):
         print("Starting policy server at {}:{}".format(SERVER_ADDRESS,
                                                        SERVER_PORT))
-        server = PolicyServer(self, SERVER_ADDRESS, SERVER_PORT)
+        if self.binary:
+            server = BinaryPolicyServer(self, SERVER_ADDRESS, SERVER_PORT)
+        else:
+            server = PolicyServer(self, SERVER_ADDRESS, SERVER_PORT)
         server.serve_forever()
 
 
 if __name__ == "__main__":
+    args = parser.parse_args()
     ray.init()
-    register_env("srv", lambda _: CartpoleServing())
+    register_env("srv", lambda _: CartpoleServing(args.binary))
 
     # We use DQN since it supports off-policy actions, but you can choose and
     # configure any agent.
@@ -0,0 +1,91 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+"""Load generator for benchmarking a policy server.
+
+To try this out, in two separate shells run:
+    $ python cartpole_server.py --binary
+    $ python load_generator.py --address=tcp://localhost:8900
+
+Each client thread keeps its own connection and plays several CartPole-like
+episodes, reporting the aggregate get_action() rate.
+"""
+
+import argparse
+import threading
+import time
+
+import numpy as np
+
+from ray.rllib.utils.policy_client import PolicyClient
+
+parser = argparse.ArgumentParser()
+parser.add_argument(
+    "--address",
+    type=str,
+    default="http://localhost:8900",
+    help="Server address, http://host:port or tcp://host:port.")
+parser.add_argument(
+    "--num-clients", type=int, default=4, help="Number of client threads.")
+parser.add_argument(
+    "--episodes-per-client",
+    type=int,
+    default=1,
+    help="Concurrent episodes per client, batched with get_actions().")
+parser.add_argument(
+    "--episode-length", type=int, default=200, help="Steps per episode.")
+parser.add_argument(
+    "--duration", type=float, default=30.0, help="Seconds to run for.")
+parser.add_argument(
+    "--no-train", action="store_true", help="Whether to disable training.")
+
+
+def run_client(args, counts, index):
+    client = PolicyClient(args.address)
+    num_episodes = args.episodes_per_client
+    eids = [
+        client.start_episode(training_enabled=not args.no_train)
+        for _ in range(num_episodes)
+    ]
+    steps = [0] * num_episodes
+    obs = [np.random.uniform(-0.05, 0.05, 4) for _ in range(num_episodes)]
+    deadline = time.time() + args.duration
+    while time.time() < deadline:
+        if num_episodes == 1:
+            client.get_action(eids[0], obs[0])
+        else:
+            client.get_actions(eids, obs)
+        counts[index] += num_episodes
+        for i in range(num_episodes):
+            steps[i] += 1
+            obs[i] = np.random.uniform(-0.05, 0.05, 4)
+            client.log_returns(eids[i], 1.0)
+            if steps[i] >= args.episode_length:
+                client.end_episode(eids[i], obs[i])
+                eids[i] = client.start_episode(
+                    training_enabled=not args.no_train)
+                steps[i] = 0
+    client.close()
+
+
+if __name__ == "__main__":
+    args = parser.parse_args()
+    counts = [0] * args.num_clients
+    threads = [
+        threading.Thread(target=run_client, args=(args, counts, i))
+        for i in range(args.num_clients)
+    ]
+    start = time.time()
+    for t in threads:
+        t.daemon = True
+        t.start()
+    last_total = 0
+    while any(t.is_alive() for t in threads):
+        time.sleep(5)
+        total = sum(counts)
+        print("{:.0f}s: {:.1f} actions/s".format(time.time() - start,
+                                                 (total - last_total) / 5.0))
+        last_total = total
+    print("Total: {} actions, {:.1f} actions/s".format(
+        sum(counts),
+        sum(counts) / (time.time() - start)))
@@ -13,49 +13,78 @@ class AsyncGradientsOptimizer(PolicyOptimizer):
     This optimizer asynchronously pulls and applies gradients from remote
     evaluators, sending updated weights back as needed. This pipelines the
     gradient computations on the remote workers.
+
+    Gradients are applied in the order they complete, so a slow evaluator
+    does not hold back the others. Updated weights are put into the object
+    store at most once per applied gradient and shared by all evaluators.
     """
 
-    def _init(self, grads_per_step=100):
+    def _init(self, grads_per_step=100, max_staleness=None):
+        """Initialize the optimizer.
+
+        Arguments:
+            grads_per_step (int): Number of gradients to apply per step.
+            max_staleness (int): If set, gradients computed against weights
+                that are more than this many updates old are dropped instead
+                of applied. The evaluator is then re-dispatched with the
+                latest weights.
+        """
+
         self.apply_timer = TimerStat()
         self.wait_timer = TimerStat()
         self.dispatch_timer = TimerStat()
         self.grads_per_step = grads_per_step
+        self.max_staleness = max_staleness
         self.learner_stats = {}
+        self.num_stale_gradients = 0
+        self.weights_version = 0
         if not self.remote_evaluators:
             raise ValueError(
                 "Async optimizer requires at least 1 remote evaluator")
 
     def step(self):
         weights = ray.put(self.local_evaluator.get_weights())
-        gradient_queue = []
+        weights_version = self.weights_version
+        pending = {}
         num_gradients = 0
 
         # Kick off the first wave of async tasks
         for e in self.remote_evaluators:
             e.set_weights.remote(weights)
             fut = e.compute_gradients.remote(e.sample.remote())
-            gradient_queue.append((fut, e))
+            pending[fut] = (e, weights_version)
             num_gradients += 1
 
-        # Note: can't use wait: https://github.com/ray-project/ray/issues/1128
-        while gradient_queue:
+        while pending:
             with self.wait_timer:
-                fut, e = gradient_queue.pop(0)
+                [fut], _ = ray.wait(list(pending), num_returns=1)
+                e, version = pending.pop(fut)
                 gradient, info = ray.get(fut)
                 if "stats" in info:
                     self.learner_stats = info["stats"]
 
+            stale = (self.max_staleness is not None
+                     and self.weights_version - version > self.max_staleness)
             if gradient is not None:
-                with self.apply_timer:
-                    self.local_evaluator.apply_gradients(gradient)
+                # Stale gradients are dropped, but their samples still count.
                 self.num_steps_sampled += info["batch_count"]
-                self.num_steps_trained += info["batch_count"]
+                if stale:
+                    self.num_stale_gradients += 1
+                else:
+                    with self.apply_timer:
+                        self.local_evaluator.apply_gradients(gradient)
+                        self.weights_version += 1
+                    self.num_steps_trained += info["batch_count"]
 
             if num_gradients < self.grads_per_step:
                 with self.dispatch_timer:
-                    e.set_weights.remote(self.local_evaluator.get_weights())
+                    if weights_version != self.weights_version:
+                        weights = ray.put(self.local_evaluator.get_weights())
+                        weights_version = self.weights_version
+                    if version != weights_version:
+                        e.set_weights.remote(weights)
                     fut = e.compute_gradients.remote(e.sample.remote())
-                    gradient_queue.append((fut, e))
+                    pending[fut] = (e, weights_version)
                     num_gradients += 1
 
     def stats(self):
@@ -64,5 +93,6 @@ class AsyncGradientsOptimizer(PolicyOptimizer):
                 "wait_time_ms": round(1000 * self.wait_timer.mean, 3),
                 "apply_time_ms": round(1000 * self.apply_timer.mean, 3),
                 "dispatch_time_ms": round(1000 * self.dispatch_timer.mean, 3),
+                "num_stale_gradients": self.num_stale_gradients,
                 "learner": self.learner_stats,
             })
@@ -57,10 +57,7 @@ class ReplayActor(object):
     def add_batch(self, batch):
         PolicyOptimizer._check_not_multiagent(batch)
         with self.add_batch_timer:
-            for row in batch.rows():
-                self.replay_buffer.add(row["obs"], row["actions"],
-                                       row["rewards"], row["new_obs"],
-                                       row["dones"], row["weights"])
+            self.replay_buffer.add_batch(batch)
 
     def replay(self):
         with self.replay_timer:
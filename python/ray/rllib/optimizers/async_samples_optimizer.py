@@ -96,6 +96,7 @@ class AsyncSamplesOptimizer(PolicyOptimizer):
                 self.sample_tasks.add(ev, ev.sample.remote())
 
         self.batch_buffer = []
+        self.batch_buffer_count = 0
 
     def step(self):
         assert self.learner.is_alive()
@@ -121,13 +122,15 @@ class AsyncSamplesOptimizer(PolicyOptimizer):
                 sample_batch = ray.get(sample_batch)
                 sample_timesteps += sample_batch.count
                 self.batch_buffer.append(sample_batch)
-                if sum(b.count
-                       for b in self.batch_buffer) >= self.train_batch_size:
+                self.batch_buffer_count += sample_batch.count
+                if self.batch_buffer_count >= self.train_batch_size:
+                    # Columns are concatenated lazily in the learner thread.
                     train_batch = self.batch_buffer[0].concat_samples(
                         self.batch_buffer)
                     with self.timers["enqueue"]:
                         self.learner.inqueue.put((ev, train_batch))
                     self.batch_buffer = []
+                    self.batch_buffer_count = 0
 
                 # Note that it's important to pull new weights once
                 # updated to avoid excessive correlation between actors
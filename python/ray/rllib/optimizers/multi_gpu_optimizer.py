@@ -25,6 +25,10 @@ class LocalMultiGPUOptimizer(PolicyOptimizer):
     This optimizer is Tensorflow-specific and require the underlying
     PolicyGraph to be a TFPolicyGraph instance that support `.copy()`.
 
+    If `pipeline_sampling` is set, the remote evaluators keep sampling the
+    next batch while SGD runs on the current one. That batch is then one
+    weight update stale when it is trained on.
+
     Note that all replicas of the TFPolicyGraph will merge their
     extra_compute_grad and apply_grad feed_dicts and fetches. This
     may result in unexpected behavior.
@@ -35,7 +39,8 @@ class LocalMultiGPUOptimizer(PolicyOptimizer):
               num_sgd_iter=10,
               timesteps_per_batch=1024,
               num_gpus=0,
-              standardize_fields=[]):
+              standardize_fields=[],
+              pipeline_sampling=False):
         self.batch_size = sgd_batch_size
         self.num_sgd_iter = num_sgd_iter
         self.timesteps_per_batch = timesteps_per_batch
@@ -53,6 +58,13 @@ class LocalMultiGPUOptimizer(PolicyOptimizer):
         self.grad_timer = TimerStat()
         self.update_weights_timer = TimerStat()
         self.standardize_fields = standardize_fields
+        self.pipeline_sampling = pipeline_sampling
+        if pipeline_sampling and self.remote_evaluators:
+            # TODO(rliaw): remove when refactoring
+            from ray.rllib.agents.ppo.rollout import SampleCollector
+            self.sample_collector = SampleCollector(self.remote_evaluators)
+        else:
+            self.sample_collector = None
 
         print("LocalMultiGPUOptimizer devices", self.devices)
 
@@ -95,7 +107,10 @@ class LocalMultiGPUOptimizer(PolicyOptimizer):
                     e.set_weights.remote(weights)
 
         with self.sample_timer:
-            if self.remote_evaluators:
+            if self.sample_collector:
+                samples = self.sample_collector.collect(
+                    self.timesteps_per_batch)
+            elif self.remote_evaluators:
                 # TODO(rliaw): remove when refactoring
                 from ray.rllib.agents.ppo.rollout import collect_samples
                 samples = collect_samples(self.remote_evaluators,
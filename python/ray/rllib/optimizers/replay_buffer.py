@@ -50,6 +50,65 @@ class ReplayBuffer(object):
             self._evicted_hit_stats.push(self._hit_count[self._next_idx])
             self._hit_count[self._next_idx] = 0
 
+    def add_batch(self, batch):
+        """Add all transitions of a sample batch at once.
+
+        This is equivalent to calling add() on each row of the batch, but
+        operates on whole columns instead of building a dict per row.
+
+        Parameters
+        ----------
+        batch: SampleBatch
+          batch with "obs", "actions", "rewards", "new_obs" and "dones"
+          columns. Observations should already be packed if compression is
+          desired, see ray.rllib.utils.compression.pack_column.
+
+        Returns
+        -------
+        idxes: np.array
+          buffer indexes the transitions were written to, in batch order.
+        """
+        data = list(
+            zip(batch["obs"], batch["actions"], batch["rewards"],
+                batch["new_obs"], batch["dones"]))
+        # Chunks of at most maxsize rows never write the same slot twice.
+        idxes = [
+            self._add_chunk(data[i:i + self._maxsize])
+            for i in range(0, len(data), self._maxsize)
+        ]
+        if not idxes:
+            return np.zeros(0, dtype=np.int64)
+        return np.concatenate(idxes)
+
+    def _add_chunk(self, data):
+        start = self._next_idx
+        num_rows = len(data)
+        self._num_added += num_rows
+
+        num_head = min(num_rows, self._maxsize - start)
+        if start >= len(self._storage):
+            self._storage.extend(data[:num_head])
+            self._est_size_bytes += sum(
+                sys.getsizeof(d) for row in data[:num_head] for d in row)
+        else:
+            self._storage[start:start + num_head] = data[:num_head]
+        self._storage[:num_rows - num_head] = data[num_head:]
+
+        # Slots that add() would have evicted after each insertion.
+        next_idxes = start + np.arange(1, num_rows + 1)
+        if self._eviction_started:
+            evicted = next_idxes % self._maxsize
+        else:
+            evicted = next_idxes[next_idxes >= self._maxsize] % self._maxsize
+        if next_idxes[-1] >= self._maxsize:
+            self._eviction_started = True
+        for hits in self._hit_count[evicted]:
+            self._evicted_hit_stats.push(hits)
+        self._hit_count[evicted] = 0
+
+        self._next_idx = (start + num_rows) % self._maxsize
+        return (start + np.arange(num_rows)) % self._maxsize
+
     def _encode_sample(self, idxes):
         obses_t, actions, rewards, obses_tp1, dones = [], [], [], [], []
         for i in idxes:
@@ -145,6 +204,23 @@ class PrioritizedReplayBuffer(ReplayBuffer):
         self._it_sum[idx] = weight**self._alpha
         self._it_min[idx] = weight**self._alpha
 
+    def add_batch(self, batch):
+        """See ReplayBuffer.add_batch
+
+        Priorities are taken from the optional "weights" column, defaulting
+        to the max priority seen so far.
+        """
+
+        idxes = super(PrioritizedReplayBuffer, self).add_batch(batch)
+        if "weights" in batch:
+            weights = np.asarray(batch["weights"], dtype=np.float64)
+        else:
+            weights = np.full(len(idxes), self._max_priority)
+        priorities = (weights**self._alpha).tolist()
+        self._it_sum.set_items(idxes.tolist(), priorities)
+        self._it_min.set_items(idxes.tolist(), priorities)
+        return idxes
+
     def _sample_proportional(self, batch_size):
         res = []
         for _ in range(batch_size):
@@ -92,6 +92,32 @@ class SegmentTree(object):
                                                self._value[2 * idx + 1])
             idx //= 2
 
+    def set_items(self, idxes, vals):
+        """Sets many items at once.
+
+        Equivalent to `self[idx] = val` for each pair in order, but every
+        internal node covering the updated leaves is recomputed only once,
+        which is much cheaper than individual updates for contiguous runs.
+
+        Parameters
+        ----------
+        idxes: [int]
+          indexes of the items to set
+        vals: [obj]
+          values to set, one per index
+        """
+        nodes = set()
+        for idx, val in zip(idxes, vals):
+            idx += self._capacity
+            self._value[idx] = val
+            nodes.add(idx // 2)
+        # All leaves live at the same depth, so each pass touches one level.
+        while nodes:
+            for idx in nodes:
+                self._value[idx] = self._operation(self._value[2 * idx],
+                                                   self._value[2 * idx + 1])
+            nodes = {idx // 2 for idx in nodes if idx > 1}
+
     def __getitem__(self, idx):
         assert 0 <= idx < self._capacity
         return self._value[self._capacity + idx]
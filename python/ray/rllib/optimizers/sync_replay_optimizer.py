@@ -11,7 +11,7 @@ from ray.rllib.optimizers.replay_buffer import ReplayBuffer, \
 from ray.rllib.optimizers.policy_optimizer import PolicyOptimizer
 from ray.rllib.evaluation.sample_batch import SampleBatch, DEFAULT_POLICY_ID, \
     MultiAgentBatch
-from ray.rllib.utils.compression import pack_if_needed
+from ray.rllib.utils.compression import pack_column
 from ray.rllib.utils.filter import RunningStat
 from ray.rllib.utils.timer import TimerStat
 from ray.rllib.utils.schedules import LinearSchedule
@@ -22,7 +22,11 @@ class SyncReplayOptimizer(PolicyOptimizer):
 
     This optimizer requires that policy evaluators return an additional
     "td_error" array in the info return of compute_gradients(). This error
-    term will be used for sample prioritization."""
+    term will be used for sample prioritization.
+
+    If `pipeline_sampling` is set, the remote evaluators sample the next batch
+    while the local model is updated from the replay buffer. That batch is
+    then one update stale when it is added to the buffer."""
 
     def _init(self,
               learning_starts=1000,
@@ -35,7 +39,8 @@ class SyncReplayOptimizer(PolicyOptimizer):
               final_prioritized_replay_beta=0.4,
               prioritized_replay_eps=1e-6,
               train_batch_size=32,
-              sample_batch_size=4):
+              sample_batch_size=4,
+              pipeline_sampling=False):
 
         self.replay_starts = learning_starts
         # linearly annealing beta used in Rainbow paper
@@ -46,6 +51,11 @@ class SyncReplayOptimizer(PolicyOptimizer):
             final_p=final_prioritized_replay_beta)
         self.prioritized_replay_eps = prioritized_replay_eps
         self.train_batch_size = train_batch_size
+        self.pipeline_sampling = pipeline_sampling
+        self.sample_tasks = []
+        self.num_weight_updates = 0
+        self.weights_version = 0
+        self.sample_staleness = 0
 
         # Stats
         self.update_weights_timer = TimerStat()
@@ -70,17 +80,20 @@ class SyncReplayOptimizer(PolicyOptimizer):
         assert buffer_size >= self.replay_starts
 
     def step(self):
-        with self.update_weights_timer:
-            if self.remote_evaluators:
-                weights = ray.put(self.local_evaluator.get_weights())
-                for e in self.remote_evaluators:
-                    e.set_weights.remote(weights)
+        if self.remote_evaluators and not self.sample_tasks:
+            self._start_sampling()
 
         with self.sample_timer:
             if self.remote_evaluators:
-                batch = SampleBatch.concat_samples(
-                    ray.get(
-                        [e.sample.remote() for e in self.remote_evaluators]))
+                samples = ray.get(self.sample_tasks)
+                self.sample_tasks = []
+                self.sample_staleness = (
+                    self.num_weight_updates - self.weights_version)
+                if self.pipeline_sampling:
+                    # Sample the next batch with the latest weights while
+                    # learning from the replay buffer
+                    self._start_sampling()
+                batch = SampleBatch.concat_samples(samples)
             else:
                 batch = self.local_evaluator.sample()
 
@@ -91,20 +104,30 @@ class SyncReplayOptimizer(PolicyOptimizer):
                 }, batch.count)
 
             for policy_id, s in batch.policy_batches.items():
-                for row in s.rows():
-                    if "weights" not in row:
-                        row["weights"] = np.ones_like(row["rewards"])
-                    self.replay_buffers[policy_id].add(
-                        pack_if_needed(row["obs"]),
-                        row["actions"], row["rewards"],
-                        pack_if_needed(row["new_obs"]), row["dones"],
-                        row["weights"])
+                self.replay_buffers[policy_id].add_batch(
+                    SampleBatch({
+                        "obs": pack_column(s["obs"]),
+                        "actions": s["actions"],
+                        "rewards": s["rewards"],
+                        "new_obs": pack_column(s["new_obs"]),
+                        "dones": s["dones"],
+                        "weights": (s["weights"] if "weights" in s else
+                                    np.ones_like(s["rewards"])),
+                    }))
 
         if self.num_steps_sampled >= self.replay_starts:
             self._optimize()
 
         self.num_steps_sampled += batch.count
 
+    def _start_sampling(self):
+        with self.update_weights_timer:
+            weights = ray.put(self.local_evaluator.get_weights())
+            for e in self.remote_evaluators:
+                e.set_weights.remote(weights)
+            self.weights_version = self.num_weight_updates
+        self.sample_tasks = [e.sample.remote() for e in self.remote_evaluators]
+
     def _optimize(self):
         samples = self._replay()
 
@@ -121,6 +144,7 @@ class SyncReplayOptimizer(PolicyOptimizer):
                         new_priorities)
             self.grad_timer.push_units_processed(samples.count)
 
+        self.num_weight_updates += 1
         self.num_steps_trained += samples.count
 
     def _replay(self):
@@ -160,4 +184,5 @@ class SyncReplayOptimizer(PolicyOptimizer):
                 "opt_peak_throughput": round(self.grad_timer.mean_throughput,
                                              3),
                 "opt_samples": round(self.grad_timer.mean_units_processed, 3),
+                "sample_staleness": self.sample_staleness,
             })
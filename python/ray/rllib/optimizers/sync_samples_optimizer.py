@@ -15,9 +15,16 @@ class SyncSamplesOptimizer(PolicyOptimizer):
     In each step, this optimizer pulls samples from a number of remote
     evaluators, concatenates them, and then updates a local model. The updated
     model weights are then broadcast to all remote evaluators.
+
+    If `pipeline_sampling` is set, the remote evaluators sample the next batch
+    while the local model is updated on the current one. That batch is then
+    one update stale when it is trained on.
     """
 
-    def _init(self, num_sgd_iter=1, timesteps_per_batch=1):
+    def _init(self,
+              num_sgd_iter=1,
+              timesteps_per_batch=1,
+              pipeline_sampling=False):
         self.update_weights_timer = TimerStat()
         self.sample_timer = TimerStat()
         self.grad_timer = TimerStat()
@@ -25,16 +32,21 @@ class SyncSamplesOptimizer(PolicyOptimizer):
         self.num_sgd_iter = num_sgd_iter
         self.timesteps_per_batch = timesteps_per_batch
         self.learner_stats = {}
+        self.pipeline_sampling = pipeline_sampling
+        self.sample_tasks = []
+        self.num_weight_updates = 0
+        self.weights_version = 0
+        self.sample_staleness = 0
 
     def step(self):
-        with self.update_weights_timer:
-            if self.remote_evaluators:
-                weights = ray.put(self.local_evaluator.get_weights())
-                for e in self.remote_evaluators:
-                    e.set_weights.remote(weights)
+        if not self.sample_tasks:
+            self._update_weights()
 
         with self.sample_timer:
             samples = []
+            if self.sample_tasks:
+                samples.extend(ray.get(self.sample_tasks))
+                self.sample_tasks = []
             while sum(s.count for s in samples) < self.timesteps_per_batch:
                 if self.remote_evaluators:
                     samples.extend(
@@ -43,6 +55,14 @@ class SyncSamplesOptimizer(PolicyOptimizer):
                         ]))
                 else:
                     samples.append(self.local_evaluator.sample())
+            self.sample_staleness = (
+                self.num_weight_updates - self.weights_version)
+            if self.pipeline_sampling and self.remote_evaluators:
+                # Sample the next batch with the latest weights during SGD
+                self._update_weights()
+                self.sample_tasks = [
+                    e.sample.remote() for e in self.remote_evaluators
+                ]
             samples = SampleBatch.concat_samples(samples)
             self.sample_timer.push_units_processed(samples.count)
 
@@ -55,10 +75,19 @@ class SyncSamplesOptimizer(PolicyOptimizer):
                     print(i, fetches)
             self.grad_timer.push_units_processed(samples.count)
 
+        self.num_weight_updates += 1
         self.num_steps_sampled += samples.count
         self.num_steps_trained += samples.count
         return fetches
 
+    def _update_weights(self):
+        with self.update_weights_timer:
+            if self.remote_evaluators:
+                weights = ray.put(self.local_evaluator.get_weights())
+                for e in self.remote_evaluators:
+                    e.set_weights.remote(weights)
+                self.weights_version = self.num_weight_updates
+
     def stats(self):
         return dict(
             PolicyOptimizer.stats(self), **{
@@ -71,5 +100,6 @@ class SyncSamplesOptimizer(PolicyOptimizer):
                 "sample_peak_throughput": round(
                     self.sample_timer.mean_throughput, 3),
                 "opt_samples": round(self.grad_timer.mean_units_processed, 3),
+                "sample_staleness": self.sample_staleness,
                 "learner": self.learner_stats,
             })
@@ -0,0 +1,77 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import numpy as np
+
+from ray.rllib.evaluation.sample_batch import SampleBatch
+from ray.rllib.optimizers.replay_buffer import ReplayBuffer, \
+    PrioritizedReplayBuffer
+
+
+def make_batch(start, count):
+    return SampleBatch({
+        "obs": np.arange(start, start + count),
+        "actions": np.arange(start, start + count) % 2,
+        "rewards": np.ones(count),
+        "new_obs": np.arange(start + 1, start + count + 1),
+        "dones": np.zeros(count, dtype=np.bool_),
+        "weights": np.arange(start + 1, start + count + 1, dtype=np.float32),
+    })
+
+
+def add_rows(buf, batch):
+    for row in batch.rows():
+        buf.add(row["obs"], row["actions"], row["rewards"], row["new_obs"],
+                row["dones"], row["weights"])
+
+
+def check_same(buf, expected):
+    assert buf._storage == expected._storage
+    assert buf._next_idx == expected._next_idx
+    assert buf._eviction_started == expected._eviction_started
+    assert (buf._hit_count == expected._hit_count).all()
+    assert buf._num_added == expected._num_added
+    assert buf._est_size_bytes == expected._est_size_bytes
+    assert buf._evicted_hit_stats.items == expected._evicted_hit_stats.items
+
+
+def test_add_batch():
+    buf = ReplayBuffer(10)
+    expected = ReplayBuffer(10)
+    start = 0
+    for count in [3, 6, 4, 25, 1]:
+        batch = make_batch(start, count)
+        idxes = buf.add_batch(batch)
+        assert len(idxes) == count
+        add_rows(expected, batch)
+        check_same(buf, expected)
+        buf.sample(5)
+        expected._hit_count[:] = buf._hit_count
+        start += count
+
+
+def test_prioritized_add_batch():
+    buf = PrioritizedReplayBuffer(10, alpha=0.6)
+    expected = PrioritizedReplayBuffer(10, alpha=0.6)
+    start = 0
+    for count in [7, 5, 13]:
+        batch = make_batch(start, count)
+        buf.add_batch(batch)
+        add_rows(expected, batch)
+        check_same(buf, expected)
+        assert np.allclose(buf._it_sum._value, expected._it_sum._value)
+        assert np.allclose(buf._it_min._value, expected._it_min._value)
+        start += count
+
+    unweighted = SampleBatch(
+        {k: v
+         for k, v in make_batch(0, 3).items() if k != "weights"})
+    idxes = buf.add_batch(unweighted)
+    for idx in idxes:
+        assert np.isclose(buf._it_sum[idx], buf._max_priority**0.6)
+
+
+if __name__ == "__main__":
+    test_add_batch()
+    test_prioritized_add_batch()
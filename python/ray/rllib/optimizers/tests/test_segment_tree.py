@@ -99,9 +99,25 @@ def test_max_interval_tree():
     assert np.isclose(tree.min(3, 4), 3.0)
 
 
+def test_tree_set_items():
+    tree = SumSegmentTree(8)
+    expected = SumSegmentTree(8)
+    min_tree = MinSegmentTree(8)
+
+    tree.set_items([5, 6, 7, 0, 6], [1.0, 2.0, 3.0, 4.0, 0.5])
+    min_tree.set_items([5, 6, 7, 0, 6], [1.0, 2.0, 3.0, 4.0, 0.5])
+    for idx, val in zip([5, 6, 7, 0, 6], [1.0, 2.0, 3.0, 4.0, 0.5]):
+        expected[idx] = val
+
+    assert tree._value == expected._value
+    assert np.isclose(tree.sum(), 8.5)
+    assert np.isclose(min_tree.min(), 0.5)
+
+
 if __name__ == '__main__':
     test_tree_set()
     test_tree_set_overlap()
     test_prefixsum_idx()
     test_prefixsum_idx2()
     test_max_interval_tree()
+    test_tree_set_items()
@@ -34,6 +34,11 @@ class _MockEvaluator(object):
     def apply_gradients(self, grads):
         self._weights += self._grad
 
+    def compute_apply(self, samples):
+        grads, info = self.compute_gradients(samples)
+        self.apply_gradients(grads)
+        return info
+
     def get_weights(self):
         return self._weights
 
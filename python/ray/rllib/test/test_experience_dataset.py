@@ -0,0 +1,65 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from ray.rllib.agents.bc.experience_dataset import ExperienceDataset, \
+    ExperienceDatasetWriter, convert_pickled_dataset
+
+
+def make_trajectories(num_trajectories, length):
+    return [[(np.full(3, t * length + i, dtype=np.float32), t * length + i)
+             for i in range(length)] for t in range(num_trajectories)]
+
+
+class ExperienceDatasetTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def testWriteAndSample(self):
+        path = os.path.join(self.tmpdir, "dataset")
+        writer = ExperienceDatasetWriter(path, flush_every=7)
+        for trajectory in make_trajectories(4, 10):
+            writer.add_trajectory(trajectory)
+        writer.close()
+
+        dataset = ExperienceDataset(path)
+        self.assertEqual(len(dataset), 40)
+        samples = dataset.sample(16)
+        self.assertEqual(samples["observations"].shape, (16, 3))
+        self.assertEqual(samples["observations"].dtype, np.float32)
+        self.assertTrue(
+            (samples["observations"][:, 0] == samples["actions"]).all())
+
+    def testShards(self):
+        path = os.path.join(self.tmpdir, "dataset")
+        pickle_path = os.path.join(self.tmpdir, "dataset.pkl")
+        with open(pickle_path, "wb") as f:
+            pickle.dump(make_trajectories(3, 10), f)
+        convert_pickled_dataset(pickle_path, path)
+
+        for dataset_path in [path, pickle_path]:
+            seen = set()
+            for i in range(3):
+                shard = ExperienceDataset(
+                    dataset_path, shard_index=i, num_shards=3)
+                self.assertEqual(len(shard), 10)
+                actions = shard.sample(100)["actions"]
+                self.assertTrue((actions >= 10 * i).all())
+                self.assertTrue((actions < 10 * (i + 1)).all())
+                seen.update(actions.tolist())
+            self.assertEqual(len(seen), 30)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
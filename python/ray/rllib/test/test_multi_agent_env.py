@@ -6,6 +6,8 @@ import gym
 import random
 import unittest
 
+import numpy as np
+
 import ray
 from ray.rllib.agents.pg import PGAgent
 from ray.rllib.agents.pg.pg_policy_graph import PGPolicyGraph
@@ -13,7 +15,7 @@ from ray.rllib.agents.dqn.dqn_policy_graph import DQNPolicyGraph
 from ray.rllib.optimizers import SyncSamplesOptimizer, \
     SyncReplayOptimizer, AsyncGradientsOptimizer
 from ray.rllib.test.test_policy_evaluator import MockEnv, MockEnv2, \
-    MockPolicyGraph
+    MockPolicyGraph, BatchPostprocessingPolicyGraph
 from ray.rllib.evaluation.policy_evaluator import PolicyEvaluator
 from ray.rllib.evaluation.metrics import collect_metrics
 from ray.rllib.env.async_vector_env import _MultiAgentEnvToAsync
@@ -280,6 +282,25 @@ class TestMultiAgentEnv(unittest.TestCase):
         batch = ev.sample()
         self.assertEqual(batch.count, 50)
 
+    def testMultiAgentSampleBatchPostprocessing(self):
+        act_space = gym.spaces.Discrete(2)
+        obs_space = gym.spaces.Discrete(2)
+        batches = []
+        for policy_graph in [MockPolicyGraph, BatchPostprocessingPolicyGraph]:
+            ev = PolicyEvaluator(
+                env_creator=lambda _: BasicMultiAgent(5),
+                policy_graph={
+                    "p0": (policy_graph, obs_space, act_space, {}),
+                },
+                policy_mapping_fn=lambda agent_id: "p0",
+                batch_steps=10)
+            batches.append(ev.sample().policy_batches["p0"])
+        # The truncated trajectories of all agents share the episode id, so
+        # their boundaries can't be inferred from eps_id and dones alone.
+        self.assertEqual(batches[1].count, 50)
+        self.assertTrue(
+            np.allclose(batches[0]["advantages"], batches[1]["advantages"]))
+
     def testMultiAgentSampleRoundRobin(self):
         act_space = gym.spaces.Discrete(2)
         obs_space = gym.spaces.Discrete(2)
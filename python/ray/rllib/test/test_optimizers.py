@@ -7,9 +7,10 @@ import unittest
 import numpy as np
 
 import ray
+from ray.rllib.agents.ppo.rollout import SampleCollector
 from ray.rllib.test.mock_evaluator import _MockEvaluator
-from ray.rllib.optimizers import AsyncGradientsOptimizer
-from ray.rllib.evaluation import SampleBatch
+from ray.rllib.optimizers import AsyncGradientsOptimizer, SyncSamplesOptimizer
+from ray.rllib.evaluation import SampleBatch, SampleBatchBuilder
 
 
 class AsyncOptimizerTest(unittest.TestCase):
@@ -26,6 +27,64 @@ class AsyncOptimizerTest(unittest.TestCase):
         test_optimizer.step()
         self.assertTrue(all(local.get_weights() == 0))
 
+    def testMaxStaleness(self):
+        ray.init(num_cpus=4)
+        local = _MockEvaluator()
+        remotes = ray.remote(_MockEvaluator)
+        remote_evaluators = [remotes.remote() for i in range(5)]
+        test_optimizer = AsyncGradientsOptimizer(local, remote_evaluators, {
+            "grads_per_step": 10,
+            "max_staleness": 0
+        })
+        test_optimizer.step()
+        # The first applied gradient makes the other four in flight stale.
+        num_stale = test_optimizer.num_stale_gradients
+        self.assertGreaterEqual(num_stale, 4)
+        self.assertEqual(test_optimizer.num_steps_trained,
+                         10 * (10 - num_stale))
+        self.assertEqual(test_optimizer.num_steps_sampled, 10 * 10)
+        self.assertEqual(test_optimizer.stats()["num_stale_gradients"],
+                         num_stale)
+
+
+class SyncSamplesOptimizerTest(unittest.TestCase):
+    def tearDown(self):
+        ray.shutdown()
+
+    def testPipelineSampling(self):
+        ray.init(num_cpus=4)
+        local = _MockEvaluator()
+        remotes = ray.remote(_MockEvaluator)
+        remote_evaluators = [remotes.remote() for i in range(2)]
+        test_optimizer = SyncSamplesOptimizer(local, remote_evaluators, {
+            "timesteps_per_batch": 20,
+            "pipeline_sampling": True
+        })
+        test_optimizer.step()
+        self.assertEqual(test_optimizer.stats()["sample_staleness"], 0)
+        # The next batch was sampled before the first update was applied.
+        self.assertEqual(len(test_optimizer.sample_tasks), 2)
+        test_optimizer.step()
+        self.assertEqual(test_optimizer.stats()["sample_staleness"], 1)
+        self.assertEqual(test_optimizer.num_steps_sampled, 40)
+
+
+class SampleCollectorTest(unittest.TestCase):
+    def tearDown(self):
+        ray.shutdown()
+
+    def testReusesInFlightSamples(self):
+        ray.init(num_cpus=4)
+        remotes = ray.remote(_MockEvaluator)
+        remote_evaluators = [remotes.remote() for i in range(3)]
+        collector = SampleCollector(remote_evaluators)
+        for _ in range(3):
+            samples = collector.collect(25)
+            self.assertGreaterEqual(samples.count, 25)
+            self.assertEqual(samples.count % 10, 0)
+            # Each evaluator keeps exactly one sample task in flight.
+            self.assertEqual(len(collector.agent_dict), 3)
+
 
 class SampleBatchTest(unittest.TestCase):
     def testConcat(self):
@@ -39,6 +98,74 @@ class SampleBatchTest(unittest.TestCase):
         self.assertEqual(b["a"].tolist(), [1, 2, 3, 1, 1])
         self.assertEqual(b["b"].tolist(), [4, 5, 6, 4, 5])
 
+    def testLazyConcat(self):
+        b1 = SampleBatch({"a": np.array([1, 2, 3]), "b": np.array([4, 5, 6])})
+        b2 = SampleBatch({"a": np.array([7]), "b": np.array([8])})
+        b = b1.concat(b2).concat(b1)
+        self.assertEqual(b.count, 7)
+        self.assertEqual(len(b._chunks), 3)
+        self.assertEqual(b["a"].tolist(), [1, 2, 3, 7, 1, 2, 3])
+        self.assertEqual(b._chunks is None, False)
+        self.assertEqual(b["b"].tolist(), [4, 5, 6, 8, 4, 5, 6])
+        self.assertEqual(b._chunks, None)
+        b["a"] = b["a"] * 2
+        self.assertEqual(b.concat(b2)["a"].tolist(), [2, 4, 6, 14, 2, 4, 6, 7])
+
+    def testSlice(self):
+        b1 = SampleBatch({"a": np.array([1, 2, 3]), "b": np.array([4, 5, 6])})
+        b2 = SampleBatch({"a": np.array([7, 8]), "b": np.array([9, 10])})
+        s = b1.slice(1, 3)
+        self.assertEqual(s.count, 2)
+        self.assertEqual(s["a"].tolist(), [2, 3])
+        self.assertTrue(np.may_share_memory(s["a"], b1["a"]))
+        lazy = b1.concat(b2)
+        self.assertEqual(lazy.slice(2, 4)["b"].tolist(), [6, 9])
+        self.assertEqual(lazy.slice(3, 5)["a"].tolist(), [7, 8])
+        self.assertEqual(lazy.slice(4, 4).count, 0)
+
+
+class SampleBatchBuilderTest(unittest.TestCase):
+    def testPreallocatedColumns(self):
+        builder = SampleBatchBuilder(initial_capacity=2)
+        for i in range(5):
+            builder.add_values(obs=np.ones(3) * i, actions=i, infos={"i": i})
+        batch = builder.build_and_reset()
+        self.assertEqual(batch.count, 5)
+        self.assertEqual(batch["obs"].dtype, np.float32)
+        self.assertEqual(batch["obs"].shape, (5, 3))
+        self.assertEqual(batch["obs"][:, 0].tolist(), [0, 1, 2, 3, 4])
+        self.assertEqual(batch["actions"].tolist(), [0, 1, 2, 3, 4])
+        self.assertEqual(batch["infos"][4], {"i": 4})
+        self.assertEqual(builder.capacity, 5)
+
+        # Buffers are handed to the batch, so new rows must not alias it.
+        builder.add_values(obs=np.zeros(3), actions=0, infos={})
+        self.assertEqual(batch["obs"][0].tolist(), [0, 0, 0])
+        self.assertEqual(batch["obs"][1].tolist(), [1, 1, 1])
+
+    def testChangingShape(self):
+        builder = SampleBatchBuilder()
+        builder.add_values(obs=np.zeros(2))
+        builder.add_values(obs=np.zeros(3))
+        batch = builder.build_and_reset()
+        self.assertEqual([len(o) for o in batch["obs"]], [2, 3])
+
+    def testMissingRows(self):
+        builder = SampleBatchBuilder()
+        builder.add_values(obs=np.zeros(2), actions=0)
+        builder.add_values(actions=1)
+        self.assertRaises(ValueError, builder.build_and_reset)
+        builder = SampleBatchBuilder()
+        builder.add_values(actions=0)
+        builder.add_values(obs=np.zeros(2), actions=1)
+        self.assertRaises(ValueError, builder.build_and_reset)
+
+    def testUnusedBufferIsNotPinned(self):
+        builder = SampleBatchBuilder(initial_capacity=64)
+        builder.add_values(obs=np.zeros(3))
+        batch = builder.build_and_reset()
+        self.assertEqual(batch["obs"].base, None)
+
 
 if __name__ == '__main__':
     unittest.main(verbosity=2)
@@ -6,13 +6,17 @@ import gym
 import time
 import unittest
 
+import numpy as np
+
 import ray
 from ray.rllib.agents.pg import PGAgent
 from ray.rllib.agents.a3c import A2CAgent
 from ray.rllib.evaluation.policy_evaluator import PolicyEvaluator
 from ray.rllib.evaluation.metrics import collect_metrics
 from ray.rllib.evaluation.policy_graph import PolicyGraph
-from ray.rllib.evaluation.postprocessing import compute_advantages
+from ray.rllib.evaluation.postprocessing import compute_advantages, \
+    compute_advantages_batch
+from ray.rllib.evaluation.sample_batch import SampleBatch
 from ray.rllib.env.vector_env import VectorEnv
 from ray.tune.registry import register_env
 
@@ -29,6 +33,14 @@ class MockPolicyGraph(PolicyGraph):
         return compute_advantages(batch, 100.0, 0.9, use_gae=False)
 
 
+class BatchPostprocessingPolicyGraph(MockPolicyGraph):
+    batch_postprocessing = True
+
+    def postprocess_trajectories(self, batch, trajectory_ends):
+        return compute_advantages_batch(
+            batch, 100.0, 0.9, use_gae=False, trajectory_ends=trajectory_ends)
+
+
 class BadPolicyGraph(PolicyGraph):
     def compute_actions(self,
                         obs_batch,
@@ -287,6 +299,30 @@ class TestPolicyEvaluator(unittest.TestCase):
             batch["t"].tolist(),
             [0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 0, 1, 2, 3, 4, 5, 6, 7, 8, 9])
 
+    def testBatchPostprocessing(self):
+        batches = []
+        for policy_graph in [MockPolicyGraph, BatchPostprocessingPolicyGraph]:
+            ev = PolicyEvaluator(
+                env_creator=lambda _: MockEnv(10),
+                policy_graph=policy_graph,
+                batch_steps=25,
+                batch_mode="truncate_episodes")
+            batches.append(ev.sample())
+        self.assertEqual(batches[1].count, 25)
+        self.assertTrue(
+            np.allclose(batches[0]["advantages"], batches[1]["advantages"]))
+
+        # The rewards of the input batch must not be modified.
+        rewards = [1.0, 2.0, 3.0]
+        batch = SampleBatch({
+            "rewards": np.array(rewards),
+            "eps_id": np.array([0, 0, 1]),
+            "dones": np.array([False, True, False]),
+        })
+        result = compute_advantages_batch(batch, 10.0, 0.9, use_gae=False)
+        self.assertEqual(batch["rewards"].tolist(), rewards)
+        self.assertEqual(result["rewards"].tolist(), rewards)
+
     def testFilterSync(self):
         ev = PolicyEvaluator(
             env_creator=lambda _: gym.make("CartPole-v0"),
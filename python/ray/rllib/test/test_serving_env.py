@@ -5,6 +5,7 @@ from __future__ import print_function
 import gym
 import numpy as np
 import random
+import threading
 import unittest
 import uuid
 
@@ -15,6 +16,8 @@ from ray.rllib.evaluation.policy_evaluator import PolicyEvaluator
 from ray.rllib.env.serving_env import ServingEnv
 from ray.rllib.test.test_policy_evaluator import BadPolicyGraph, \
     MockPolicyGraph, MockEnv
+from ray.rllib.utils.policy_client import PolicyClient
+from ray.rllib.utils.policy_server import BinaryPolicyServer
 from ray.tune.registry import register_env
 
 
@@ -107,6 +110,53 @@ class MultiServing(ServingEnv):
                     del cur_obs[i]
 
 
+class BatchedServing(ServingEnv):
+    def __init__(self, env_creator, num_episodes, **kwargs):
+        self.env_creator = env_creator
+        self.envs = [env_creator() for _ in range(num_episodes)]
+        ServingEnv.__init__(self, self.envs[0].action_space,
+                            self.envs[0].observation_space, **kwargs)
+
+    def run(self):
+        eids = [self.start_episode() for _ in self.envs]
+        obs = [env.reset() for env in self.envs]
+        while True:
+            actions = self.get_actions(eids, obs)
+            for i, env in enumerate(self.envs):
+                obs[i], reward, done, info = env.step(actions[i])
+                self.log_returns(eids[i], reward, info=info)
+                if done:
+                    self.end_episode(eids[i], obs[i])
+                    obs[i] = env.reset()
+                    eids[i] = self.start_episode()
+
+
+class BinaryServerServing(ServingEnv):
+    def __init__(self, env):
+        ServingEnv.__init__(self, env.action_space, env.observation_space)
+        self.server = BinaryPolicyServer(self, "localhost", 0)
+        client_thread = threading.Thread(target=self.run_client, args=(env, ))
+        client_thread.daemon = True
+        client_thread.start()
+
+    def run(self):
+        self.server.serve_forever()
+
+    def run_client(self, env):
+        client = PolicyClient("tcp://localhost:{}".format(
+            self.server.server_address[1]))
+        eid = client.start_episode()
+        obs = env.reset()
+        while True:
+            action = client.get_action(eid, obs)
+            obs, reward, done, info = env.step(action)
+            client.log_returns(eid, reward, info=info)
+            if done:
+                client.end_episode(eid, obs)
+                obs = env.reset()
+                eid = client.start_episode()
+
+
 class TestServingEnv(unittest.TestCase):
     def testServingEnvCompleteEpisodes(self):
         ev = PolicyEvaluator(
@@ -185,6 +235,42 @@ class TestServingEnv(unittest.TestCase):
                 return
         raise Exception("failed to improve reward")
 
+    def testServingEnvBatchedActions(self):
+        ev = PolicyEvaluator(
+            env_creator=lambda _: BatchedServing(lambda: MockEnv(25), 4),
+            policy_graph=MockPolicyGraph,
+            batch_steps=40,
+            batch_mode="complete_episodes")
+        for _ in range(3):
+            batch = ev.sample()
+            self.assertEqual(batch.count, 100)
+
+    def testServingEnvMicroBatching(self):
+        ev = PolicyEvaluator(
+            env_creator=lambda _: BatchedServing(
+                lambda: MockEnv(25), 4, max_batch_size=3,
+                max_batch_wait_us=100000),
+            policy_graph=MockPolicyGraph,
+            batch_steps=40,
+            batch_mode="complete_episodes")
+        for _ in range(3):
+            batch = ev.sample()
+            self.assertEqual(batch.count, 100)
+        stats = ev.env.serving_stats()
+        self.assertEqual(stats["batch_size_quantiles"][-1], 3)
+        self.assertGreater(stats["num_actions"], 0)
+        self.assertIn("action_latency_ms_mean", stats)
+
+    def testBinaryPolicyServer(self):
+        ev = PolicyEvaluator(
+            env_creator=lambda _: BinaryServerServing(MockEnv(25)),
+            policy_graph=MockPolicyGraph,
+            batch_steps=40,
+            batch_mode="complete_episodes")
+        for _ in range(3):
+            batch = ev.sample()
+            self.assertEqual(batch.count, 50)
+
     def testServingEnvHorizonNotSupported(self):
         ev = PolicyEvaluator(
             env_creator=lambda _: SimpleServing(MockEnv(25)),
@@ -3,9 +3,12 @@ import copy
 from ray.rllib.utils.filter_manager import FilterManager
 from ray.rllib.utils.filter import Filter
 from ray.rllib.utils.policy_client import PolicyClient
-from ray.rllib.utils.policy_server import PolicyServer
+from ray.rllib.utils.policy_server import PolicyServer, BinaryPolicyServer
 
-__all__ = ["Filter", "FilterManager", "PolicyClient", "PolicyServer"]
+__all__ = [
+    "Filter", "FilterManager", "PolicyClient", "PolicyServer",
+    "BinaryPolicyServer"
+]
 
 
 def merge_dicts(d1, d2):
@@ -33,6 +33,19 @@ def pack_if_needed(data):
     return data
 
 
+def pack_column(column):
+    """Packs each row of a sample batch column, e.g. a column of obs.
+
+    This is equivalent to calling pack_if_needed() on every row, but avoids
+    the per-row type checks when the column is a single stacked array.
+    """
+    if isinstance(column, np.ndarray):
+        if column.ndim > 1:
+            return [pack(row) for row in column]
+        return list(column)
+    return [pack_if_needed(row) for row in column]
+
+
 def unpack(data):
     if LZ4_ENABLED:
         data = base64.b64decode(data)
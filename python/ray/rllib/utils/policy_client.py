@@ -3,6 +3,10 @@ from __future__ import division
 from __future__ import print_function
 
 import pickle
+import socket
+import struct
+
+import numpy as np
 
 try:
     import requests  # `requests` is not part of stdlib.
@@ -11,18 +15,41 @@ except ImportError:
     print("Couldn't import `requests` library. Be sure to install it on"
           " the client side.")
 
+_FRAME_HEADER = struct.Struct("!I")
+_NDARRAY_TAG = "__ndarray__"
+
 
 class PolicyClient(object):
-    """REST client to interact with a RLlib policy server."""
+    """Client to interact with a RLlib policy server.
+
+    Addresses of the form "http://host:port" talk to a PolicyServer over
+    HTTP, reusing one keep-alive connection. Addresses of the form
+    "tcp://host:port" talk to a BinaryPolicyServer over a persistent socket.
+    With the binary transport, calls that return nothing (log_returns() and
+    end_episode()) are pipelined: their responses are only read before the
+    next call that needs a result, so they cost no extra round trip. Errors
+    from pipelined calls are raised by that next call.
+    """
 
     START_EPISODE = "START_EPISODE"
     GET_ACTION = "GET_ACTION"
+    GET_ACTIONS = "GET_ACTIONS"
     LOG_ACTION = "LOG_ACTION"
     LOG_RETURNS = "LOG_RETURNS"
     END_EPISODE = "END_EPISODE"
 
     def __init__(self, address):
         self._address = address
+        if address.startswith("tcp://"):
+            host, port = address[len("tcp://"):].rsplit(":", 1)
+            self._sock = socket.create_connection((host, int(port)))
+            self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._rfile = self._sock.makefile("rb")
+            self._num_pending = 0
+            self._session = None
+        else:
+            self._sock = None
+            self._session = requests.Session()
 
     def start_episode(self, episode_id=None, training_enabled=True):
         """Record the start of an episode.
@@ -59,6 +86,26 @@ class PolicyClient(object):
             "episode_id": episode_id,
         })["action"]
 
+    def get_actions(self, episode_ids, observations):
+        """Record observations for many episodes and get on-policy actions.
+
+        This takes a single request, and the actions for all the episodes
+        are computed together by the policy.
+
+        Arguments:
+            episode_ids (list): Episode ids returned from start_episode().
+            observations (list): Current observation of each episode.
+
+        Returns:
+            actions (list): Action from the env action space for each
+                episode.
+        """
+        return self._send({
+            "command": PolicyClient.GET_ACTIONS,
+            "observations": observations,
+            "episode_ids": episode_ids,
+        })["actions"]
+
     def log_action(self, episode_id, observation, action):
         """Record an observation and (off-policy) action taken.
 
@@ -85,12 +132,14 @@ class PolicyClient(object):
             episode_id (str): Episode id returned from start_episode().
             reward (float): Reward from the environment.
         """
-        self._send({
-            "command": PolicyClient.LOG_RETURNS,
-            "reward": reward,
-            "info": info,
-            "episode_id": episode_id,
-        })
+        self._send(
+            {
+                "command": PolicyClient.LOG_RETURNS,
+                "reward": reward,
+                "info": info,
+                "episode_id": episode_id,
+            },
+            wait=False)
 
     def end_episode(self, episode_id, observation):
         """Record the end of an episode.
@@ -99,18 +148,106 @@ class PolicyClient(object):
             episode_id (str): Episode id returned from start_episode().
             observation (obj): Current environment observation.
         """
-        self._send({
-            "command": PolicyClient.END_EPISODE,
-            "observation": observation,
-            "episode_id": episode_id,
-        })
-
-    def _send(self, data):
-        payload = pickle.dumps(data)
-        response = requests.post(self._address, data=payload)
-        if response.status_code != 200:
-            print("Request failed", data)
-            print(response.text)
-        response.raise_for_status()
-        parsed = pickle.loads(response.content)
-        return parsed
+        self._send(
+            {
+                "command": PolicyClient.END_EPISODE,
+                "observation": observation,
+                "episode_id": episode_id,
+            },
+            wait=False)
+
+    def flush(self):
+        """Wait for all pipelined requests to complete."""
+        if self._sock is not None:
+            while self._num_pending:
+                self._recv()
+
+    def close(self):
+        """Close the connection to the server."""
+        if self._sock is not None:
+            self.flush()
+            self._rfile.close()
+            self._sock.close()
+        else:
+            self._session.close()
+
+    def _send(self, data, wait=True):
+        if self._sock is None:
+            payload = pickle.dumps(data)
+            response = self._session.post(self._address, data=payload)
+            if response.status_code != 200:
+                print("Request failed", data)
+                print(response.text)
+            response.raise_for_status()
+            parsed = pickle.loads(response.content)
+            return parsed
+
+        write_message(self._sock, data)
+        self._num_pending += 1
+        if not wait:
+            return None
+        while self._num_pending > 1:
+            self._recv()
+        return self._recv()
+
+    def _recv(self):
+        response = read_message(self._rfile)
+        self._num_pending -= 1
+        if response is None:
+            raise IOError("Connection to {} closed".format(self._address))
+        if "error" in response:
+            raise Exception("Request failed: {}".format(response["error"]))
+        return response
+
+
+def write_message(sock, message):
+    """Write a length-prefixed binary message to a socket."""
+    payload = pickle.dumps(_encode(message), protocol=2)
+    sock.sendall(_FRAME_HEADER.pack(len(payload)) + payload)
+
+
+def read_message(rfile):
+    """Read a message written by write_message(), or None on EOF."""
+    header = rfile.read(_FRAME_HEADER.size)
+    if len(header) < _FRAME_HEADER.size:
+        return None
+    (size, ) = _FRAME_HEADER.unpack(header)
+    payload = rfile.read(size)
+    if len(payload) < size:
+        return None
+    return _decode(pickle.loads(payload))
+
+
+def _encode(value):
+    """Replace NumPy arrays with compact (tag, dtype, shape, bytes) tuples.
+
+    This avoids the per-array overhead of pickling ndarray objects, which
+    dominates the message size for small observations.
+    """
+    if isinstance(value, np.ndarray) and value.dtype != object:
+        return (_NDARRAY_TAG, value.dtype.str, value.shape, value.tobytes())
+    elif isinstance(value, dict):
+        return {k: _encode(v) for k, v in value.items()}
+    elif isinstance(value, (list, tuple)):
+        return _rebuild(value, [_encode(v) for v in value])
+    return value
+
+
+def _decode(value):
+    if isinstance(value, (list, tuple)):
+        if (type(value) is tuple and len(value) == 4
+                and isinstance(value[0], str) and value[0] == _NDARRAY_TAG):
+            _, dtype, shape, data = value
+            # Copy so that the array is writeable, like an unpickled one.
+            return np.frombuffer(data, dtype=dtype).reshape(shape).copy()
+        return _rebuild(value, [_decode(v) for v in value])
+    elif isinstance(value, dict):
+        return {k: _decode(v) for k, v in value.items()}
+    return value
+
+
+def _rebuild(value, items):
+    """Build a list or tuple of the same type as value from its items."""
+    if hasattr(value, "_fields"):
+        return type(value)(*items)  # namedtuples take fields as arguments
+    return type(value)(items)
@@ -6,15 +6,16 @@ import pickle
 import sys
 import traceback
 
-from ray.rllib.utils.policy_client import PolicyClient
+from ray.rllib.utils.policy_client import PolicyClient, read_message, \
+    write_message
 
 if sys.version_info[0] == 2:
     from SimpleHTTPServer import SimpleHTTPRequestHandler
     from SocketServer import TCPServer as HTTPServer
-    from SocketServer import ThreadingMixIn
+    from SocketServer import TCPServer, StreamRequestHandler, ThreadingMixIn
 elif sys.version_info[0] == 3:
     from http.server import SimpleHTTPRequestHandler, HTTPServer
-    from socketserver import ThreadingMixIn
+    from socketserver import TCPServer, StreamRequestHandler, ThreadingMixIn
 
 
 class PolicyServer(ThreadingMixIn, HTTPServer):
@@ -55,40 +56,85 @@ class PolicyServer(ThreadingMixIn, HTTPServer):
         HTTPServer.__init__(self, (address, port), handler)
 
 
+class BinaryPolicyServer(ThreadingMixIn, TCPServer):
+    """Binary protocol server than can be launched from a ServingEnv.
+
+    This is a drop-in alternative to PolicyServer for high request rates.
+    Clients connect with PolicyClient("tcp://host:port") and keep a single
+    persistent connection, which is served by one thread for its lifetime.
+    Requests on a connection may be pipelined and are answered in order.
+    Messages are length-prefixed, with NumPy arrays sent as raw bytes.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, serving_env, address, port):
+        handler = _make_binary_handler(serving_env)
+        TCPServer.__init__(self, (address, port), handler)
+
+
 def _make_handler(serving_env):
     class Handler(SimpleHTTPRequestHandler):
+        # Keep connections alive so that clients can reuse them.
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
         def do_POST(self):
             content_len = int(self.headers.get('Content-Length'), 0)
             raw_body = self.rfile.read(content_len)
             parsed_input = pickle.loads(raw_body)
             try:
-                response = self.execute_command(parsed_input)
+                response = pickle.dumps(
+                    _execute_command(serving_env, parsed_input))
                 self.send_response(200)
+                self.send_header("Content-Length", str(len(response)))
                 self.end_headers()
-                self.wfile.write(pickle.dumps(response))
+                self.wfile.write(response)
             except Exception:
                 self.send_error(500, traceback.format_exc())
 
-        def execute_command(self, args):
-            command = args["command"]
-            response = {}
-            if command == PolicyClient.START_EPISODE:
-                response["episode_id"] = serving_env.start_episode(
-                    args["episode_id"], args["training_enabled"])
-            elif command == PolicyClient.GET_ACTION:
-                response["action"] = serving_env.get_action(
-                    args["episode_id"], args["observation"])
-            elif command == PolicyClient.LOG_ACTION:
-                serving_env.log_action(args["episode_id"], args["observation"],
-                                       args["action"])
-            elif command == PolicyClient.LOG_RETURNS:
-                serving_env.log_returns(args["episode_id"], args["reward"],
-                                        args["info"])
-            elif command == PolicyClient.END_EPISODE:
-                serving_env.end_episode(args["episode_id"],
-                                        args["observation"])
-            else:
-                raise Exception("Unknown command: {}".format(command))
-            return response
+    return Handler
+
+
+def _make_binary_handler(serving_env):
+    class Handler(StreamRequestHandler):
+        disable_nagle_algorithm = True
+
+        def handle(self):
+            while True:
+                args = read_message(self.rfile)
+                if args is None:
+                    return
+                try:
+                    response = _execute_command(serving_env, args)
+                except Exception:
+                    response = {"error": traceback.format_exc()}
+                write_message(self.connection, response)
 
     return Handler
+
+
+def _execute_command(serving_env, args):
+    command = args["command"]
+    response = {}
+    if command == PolicyClient.START_EPISODE:
+        response["episode_id"] = serving_env.start_episode(
+            args["episode_id"], args["training_enabled"])
+    elif command == PolicyClient.GET_ACTION:
+        response["action"] = serving_env.get_action(args["episode_id"],
+                                                    args["observation"])
+    elif command == PolicyClient.GET_ACTIONS:
+        response["actions"] = serving_env.get_actions(args["episode_ids"],
+                                                      args["observations"])
+    elif command == PolicyClient.LOG_ACTION:
+        serving_env.log_action(args["episode_id"], args["observation"],
+                               args["action"])
+    elif command == PolicyClient.LOG_RETURNS:
+        serving_env.log_returns(args["episode_id"], args["reward"],
+                                args["info"])
+    elif command == PolicyClient.END_EPISODE:
+        serving_env.end_episode(args["episode_id"], args["observation"])
+    else:
+        raise Exception("Unknown command: {}".format(command))
+    return response
@@ -16,7 +16,7 @@ logger = logging.getLogger(__name__)
 
 FunctionSignature = namedtuple("FunctionSignature", [
     "arg_names", "arg_defaults", "arg_is_positionals", "keyword_names",
-    "function_name"
+    "function_name", "num_required_args"
 ])
 """This class is used to represent a function signature.
 
@@ -33,6 +33,9 @@ Attributes:
         arguments, so this overlaps (sometimes completely) with arg_names.
     function_name: The name of the function whose signature is being
         inspected. This is used for printing better error messages.
+    num_required_args: The number of arguments that have no default value,
+        which is precomputed so that calls with only positional arguments can
+        be checked quickly. This is None if the function has a *args argument.
 """
 
 
@@ -153,8 +156,16 @@ def extract_signature(func, ignore_first=False):
             # Note KEYWORD_ONLY arguments currently unsupported.
             keyword_names.add(arg_name)
 
+    if any(arg_is_positionals):
+        num_required_args = None
+    else:
+        num_required_args = len(arg_names)
+        while (num_required_args > 0
+               and arg_defaults[num_required_args - 1] is not funcsigs._empty):
+            num_required_args -= 1
+
     return FunctionSignature(arg_names, arg_defaults, arg_is_positionals,
-                             keyword_names, func.__name__)
+                             keyword_names, func.__name__, num_required_args)
 
 
 def extend_args(function_signature, args, kwargs):
@@ -178,6 +189,13 @@ def extend_args(function_signature, args, kwargs):
     """
     arg_names = function_signature.arg_names
     arg_defaults = function_signature.arg_defaults
+    num_required_args = function_signature.num_required_args
+    if (not kwargs and num_required_args is not None
+            and num_required_args <= len(args) <= len(arg_names)):
+        # Fast path for calls with only positional arguments, which only
+        # need to be extended with the remaining default values.
+        return list(args) + arg_defaults[len(args):]
+
     arg_is_positionals = function_signature.arg_is_positionals
     keyword_names = function_signature.keyword_names
     function_name = function_signature.function_name
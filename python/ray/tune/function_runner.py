@@ -2,6 +2,7 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import collections
 import time
 import threading
 import traceback
@@ -14,15 +15,20 @@ from ray.tune.result import TIMESTEPS_TOTAL
 class StatusReporter(object):
     """Object passed into your main() that you can report status through.
 
+    By default only the latest reported result is kept until it is
+    retrieved. If queue_results is set, every reported result is kept and
+    handed out in order.
+
     Example:
         >>> reporter = StatusReporter()
         >>> reporter(timesteps_total=1)
     """
 
-    def __init__(self):
-        self._latest_result = None
+    def __init__(self, queue_results=False):
+        self._queue_results = queue_results
+        self._results = collections.deque()
         self._last_result = None
-        self._lock = threading.Lock()
+        self._cv = threading.Condition()
         self._error = None
         self._done = False
 
@@ -33,29 +39,63 @@ class StatusReporter(object):
             kwargs: Latest training result status.
         """
 
-        with self._lock:
-            self._latest_result = self._last_result = kwargs.copy()
+        with self._cv:
+            self._last_result = kwargs.copy()
+            if not self._queue_results:
+                self._results.clear()
+            self._results.append(self._last_result)
+            self._cv.notify_all()
+
+    def _wait_for_status(self, min_wait_s=0):
+        """Blocks until a result is available or the function has exited.
+
+        Unless the function exits first, this waits for at least min_wait_s
+        seconds so that results reported in the meantime are batched."""
+
+        deadline = time.time() + min_wait_s
+        with self._cv:
+            while not (self._done or self._error):
+                remaining = deadline - time.time()
+                if remaining > 0:
+                    self._cv.wait(remaining)
+                elif self._results:
+                    break
+                else:
+                    self._cv.wait()
 
     def _get_and_clear_status(self):
-        if self._error:
-            raise TuneError("Error running trial: " + str(self._error))
-        if self._done and not self._latest_result:
-            if not self._last_result:
-                raise TuneError("Trial finished without reporting result!")
-            self._last_result.update(done=True)
-            return self._last_result
-        with self._lock:
-            res = self._latest_result
-            self._latest_result = None
-            return res
+        with self._cv:
+            if self._error:
+                raise TuneError("Error running trial: " + str(self._error))
+            if self._results:
+                return self._results.popleft()
+            if self._done:
+                if not self._last_result:
+                    raise TuneError("Trial finished without reporting result!")
+                self._last_result.update(done=True)
+                return self._last_result
+            return None
+
+    def _set_done(self):
+        with self._cv:
+            self._done = True
+            self._cv.notify_all()
+
+    def _set_error(self, error):
+        with self._cv:
+            self._error = error
+            self._cv.notify_all()
 
     def _stop(self):
-        self._error = "Agent stopped"
+        self._set_error("Agent stopped")
 
 
 DEFAULT_CONFIG = {
-    # batch results to at least this granularity
-    "script_min_iter_time_s": 1,
+    # batch results to at least this granularity, 0 returns each result as
+    # soon as it is reported
+    "script_min_iter_time_s": 0,
+    # return every reported result in order instead of only the latest one
+    "script_queue_results": False,
 }
 
 
@@ -73,11 +113,11 @@ class _RunnerThread(threading.Thread):
         try:
             self._entrypoint(*self._entrypoint_args)
         except Exception as e:
-            self._status_reporter._error = e
+            self._status_reporter._set_error(e)
             print("Runner thread raised: {}".format(traceback.format_exc()))
             raise e
         finally:
-            self._status_reporter._done = True
+            self._status_reporter._set_done()
 
 
 class FunctionRunner(Trainable):
@@ -90,7 +130,10 @@ class FunctionRunner(Trainable):
 
     def _setup(self):
         entrypoint = self._trainable_func()
-        self._status_reporter = StatusReporter()
+        self._status_reporter = StatusReporter(
+            queue_results=self.config.get(
+                "script_queue_results", self._default_config[
+                    "script_queue_results"]))
         scrubbed_config = self.config.copy()
         for k in self._default_config:
             if k in scrubbed_config:
@@ -107,13 +150,10 @@ class FunctionRunner(Trainable):
         raise NotImplementedError
 
     def _train(self):
-        time.sleep(
+        self._status_reporter._wait_for_status(
             self.config.get("script_min_iter_time_s",
                             self._default_config["script_min_iter_time_s"]))
         result = self._status_reporter._get_and_clear_status()
-        while result is None:
-            time.sleep(1)
-            result = self._status_reporter._get_and_clear_status()
 
         curr_ts_total = result.get(TIMESTEPS_TOTAL)
         if curr_ts_total is not None:
@@ -8,9 +8,17 @@ import time
 import traceback
 import ray
 from ray.tune.logger import NoopLogger
+from ray.tune.result import NODE_IP
 from ray.tune.trial import Trial, Resources, Checkpoint
 from ray.tune.trial_executor import TrialExecutor
 
+# Fields of local scheduler entries in the client table that are not
+# resources.
+_LOCAL_SCHEDULER_FIELDS = [
+    "ClientType", "Deleted", "DBClientID", "AuxAddress",
+    "LocalSchedulerSocketName"
+]
+
 
 class RayTrialExecutor(TrialExecutor):
     """An implemention of TrialExecutor based on Ray."""
@@ -22,14 +30,28 @@ class RayTrialExecutor(TrialExecutor):
         # trial.train.remote(), thus no more new remote object id generated.
         # We use self._paused to store paused trials here.
         self._paused = {}
+        # Maps trials to the object ids of their in-flight disk checkpoints.
+        self._pending_saves = {}
         self._avail_resources = Resources(cpu=0, gpu=0)
-        self._committed_resources = Resources(cpu=0, gpu=0)
+        # Maps node ids to the total resources of each node.
+        self._node_resources = {}
+        # Maps node ids to the IP address of each node.
+        self._node_ips = {}
+        # Maps node ids to the resources committed to trials on each node.
+        # Overcommitted trials are counted under the node id None.
+        self._node_committed = {}
+        # Maps running trials to the resources committed to them per node.
+        self._trial_placements = {}
+        # Maps running trials to the node their actor is committed on.
+        self._trial_nodes = {}
         self._resources_initialized = False
 
     def _setup_runner(self, trial):
         cls = ray.remote(
             num_cpus=trial.resources.cpu,
-            num_gpus=trial.resources.gpu)(trial._get_trainable_cls())
+            num_gpus=trial.resources.gpu,
+            resources=trial.resources.custom_resources)(
+                trial._get_trainable_cls())
 
         trial.init_logger()
         remote_logdir = trial.logdir
@@ -106,7 +128,7 @@ class RayTrialExecutor(TrialExecutor):
     def start_trial(self, trial, checkpoint_obj=None):
         """Starts the trial."""
 
-        self._commit_resources(trial.resources)
+        self._commit_resources(trial)
         try:
             self._start_trial(trial, checkpoint_obj)
         except Exception:
@@ -130,10 +152,17 @@ class RayTrialExecutor(TrialExecutor):
     def stop_trial(self, trial, error=False, error_msg=None, stop_logger=True):
         """Only returns resources if resources allocated."""
         prior_status = trial.status
+        if not error:
+            self._resolve_checkpoint(trial)
+        elif stop_logger:
+            # The trial will not be restarted, so its save is not needed.
+            self._pending_saves.pop(trial, None)
+        # Otherwise restart_trial() keeps the logger and restores from the
+        # in-flight save once the trial is started again.
         self._stop_trial(
             trial, error=error, error_msg=error_msg, stop_logger=stop_logger)
         if prior_status == Trial.RUNNING:
-            self._return_resources(trial.resources)
+            self._return_resources(trial)
             out = self._find_item(self._running, trial)
             for result_id in out:
                 self._running.pop(result_id)
@@ -160,60 +189,243 @@ class RayTrialExecutor(TrialExecutor):
 
         [result_id], _ = ray.wait(list(self._running))
         trial = self._running.pop(result_id)
+        # Any in-flight save of this trial was submitted before this training
+        # call, so it has already finished.
+        self._resolve_checkpoint(trial)
         result = None
         try:
             result = ray.get(result_id)
         except Exception:
             print("fetch_one_result failed:", traceback.format_exc())
+        else:
+            if isinstance(result, dict) and result.get(NODE_IP):
+                self._move_to_node_ip(trial, result[NODE_IP])
 
         return trial, result
 
-    def _commit_resources(self, resources):
-        self._committed_resources = Resources(
-            self._committed_resources.cpu + resources.cpu_total(),
-            self._committed_resources.gpu + resources.gpu_total())
+    def _free_node_resources(self):
+        """Returns the resources of each node not committed to trials."""
+
+        free = {}
+        for node_id, total in self._node_resources.items():
+            committed = self._node_committed.get(node_id, {})
+            free[node_id] = {
+                name: amount - committed.get(name, 0)
+                for name, amount in total.items()
+            }
+        return free
+
+    def _place(self, resources):
+        """Plans which nodes to commit the given resources on.
+
+        Ray is free to start the trial actor on any node that fits it, so
+        the chosen node is only an estimate until the trial reports the IP
+        address of the node it actually runs on (see _move_to_node_ip).
+
+        The trial actor itself must fit on a single node. It goes on the
+        feasible node that it leaves the least free, preferring nodes
+        without resources it does not use, to keep large and special nodes
+        free for the trials that need them. Extra resources are consumed by
+        actors the trial launches itself, so they are treated as divisible
+        and taken from the nodes with the most free resources.
+
+        Returns:
+            A tuple of the node id of the trial actor and a dict from node ids
+            to the resources to commit on each node, or None if the resources
+            do not fit into the cluster.
+        """
 
-    def _return_resources(self, resources):
-        self._committed_resources = Resources(
-            self._committed_resources.cpu - resources.cpu_total(),
-            self._committed_resources.gpu - resources.gpu_total())
-        assert self._committed_resources.cpu >= 0
-        assert self._committed_resources.gpu >= 0
+        free = self._free_node_resources()
+        demand = {
+            name: amount
+            for name, amount in resources.to_dict().items() if amount > 0
+        }
+
+        def fits(node_id):
+            return all(free[node_id].get(name, 0) >= amount
+                       for name, amount in demand.items())
+
+        def waste(node_id):
+            total = self._node_resources[node_id]
+            unused = len([
+                name for name, amount in total.items()
+                if amount > 0 and name not in demand
+            ])
+            leftover = sum((free[node_id][name] - amount) / total[name]
+                           for name, amount in demand.items())
+            return unused, leftover, node_id
+
+        candidates = [node_id for node_id in free if fits(node_id)]
+        if not candidates:
+            return None
+        actor_node_id = min(candidates, key=waste)
+        placement = {actor_node_id: dict(demand)}
+        for name, amount in demand.items():
+            free[actor_node_id][name] -= amount
+
+        for name, amount in resources.extra_to_dict().items():
+            by_free = sorted(
+                free, key=lambda node_id: free[node_id].get(name, 0))
+            while amount > 0 and by_free:
+                node_id = by_free.pop()
+                taken = min(amount, free[node_id].get(name, 0))
+                if taken <= 0:
+                    break
+                node_placement = placement.setdefault(node_id, {})
+                node_placement[name] = node_placement.get(name, 0) + taken
+                amount -= taken
+            if amount > 0:
+                return None
+        return actor_node_id, placement
+
+    def _committed_totals(self):
+        """Returns the resources committed to trials across all nodes."""
+
+        totals = {}
+        for committed in self._node_committed.values():
+            for name, amount in committed.items():
+                totals[name] = totals.get(name, 0) + amount
+        return totals
+
+    def _commit_resources(self, trial):
+        planned = self._place(trial.resources)
+        if planned is None:
+            # The trial is overcommitted, so it is not placed on any node.
+            requested = trial.resources.to_dict()
+            for name, amount in trial.resources.extra_to_dict().items():
+                requested[name] = requested.get(name, 0) + amount
+            planned = None, {None: requested}
+        self._trial_nodes[trial], placement = planned
+        for node_id, resources in placement.items():
+            self._commit(node_id, resources)
+        self._trial_placements[trial] = placement
+
+    def _commit(self, node_id, resources, sign=1):
+        committed = self._node_committed.setdefault(node_id, {})
+        for name, amount in resources.items():
+            committed[name] = committed.get(name, 0) + sign * amount
+            assert committed[name] >= 0
+        if not any(committed.values()):
+            del self._node_committed[node_id]
+
+    def _return_resources(self, trial):
+        placement = self._trial_placements.pop(trial, {})
+        self._trial_nodes.pop(trial, None)
+        for node_id, resources in placement.items():
+            self._commit(node_id, resources, sign=-1)
+
+    def _move_to_node_ip(self, trial, node_ip):
+        """Moves the actor resources of a trial to the node it runs on.
+
+        This keeps the per-node accounting in line with where Ray actually
+        started the trial actor. Nothing is moved if the trial's node already
+        has this IP address, or if no node with enough resources has it.
+        """
+
+        if trial not in self._trial_placements:
+            return
+        old_node_id = self._trial_nodes[trial]
+        if old_node_id is not None and (
+                self._node_ips.get(old_node_id) == node_ip):
+            return
+        placement = self._trial_placements[trial]
+        demand = {
+            name: amount
+            for name, amount in trial.resources.to_dict().items()
+            if amount > 0
+        }
+        if not demand:
+            return
+        free = self._free_node_resources()
+        candidates = [
+            node_id for node_id, ip in self._node_ips.items()
+            if ip == node_ip and all(
+                free.get(node_id, {}).get(name, 0) >= amount
+                for name, amount in demand.items())
+        ]
+        if not candidates:
+            return
+        new_node_id = min(candidates)
+        old_resources = placement[old_node_id]
+        self._commit(old_node_id, demand, sign=-1)
+        for name, amount in demand.items():
+            old_resources[name] -= amount
+        if not any(old_resources.values()):
+            del placement[old_node_id]
+        self._commit(new_node_id, demand)
+        new_resources = placement.setdefault(new_node_id, {})
+        for name, amount in demand.items():
+            new_resources[name] = new_resources.get(name, 0) + amount
+        self._trial_nodes[trial] = new_node_id
 
     def _update_avail_resources(self):
         clients = ray.global_state.client_table()
         if ray.worker.global_worker.use_raylet:
             # TODO(rliaw): Remove once raylet flag is swapped
-            num_cpus = sum(cl['Resources']['CPU'] for cl in clients)
-            num_gpus = sum(cl['Resources'].get('GPU', 0) for cl in clients)
+            # The client table logs both insertions and deletions of clients,
+            # so the latest entry of each client is the current one.
+            latest = {}
+            for client in clients:
+                latest[client["ClientID"]] = client
+            node_resources = {
+                client_id: dict(client["Resources"])
+                for client_id, client in latest.items()
+                if client["IsInsertion"]
+            }
+            node_ips = {
+                client_id: latest[client_id]["NodeManagerAddress"]
+                for client_id in node_resources
+            }
         else:
-            local_schedulers = [
-                entry for client in clients.values() for entry in client
-                if (entry['ClientType'] == 'local_scheduler'
-                    and not entry['Deleted'])
-            ]
-            num_cpus = sum(ls['CPU'] for ls in local_schedulers)
-            num_gpus = sum(ls.get('GPU', 0) for ls in local_schedulers)
-        self._avail_resources = Resources(int(num_cpus), int(num_gpus))
+            node_resources = {}
+            node_ips = {}
+            for node_ip, client in clients.items():
+                for entry in client:
+                    if (entry["ClientType"] == "local_scheduler"
+                            and not entry["Deleted"]):
+                        node_resources[entry["DBClientID"]] = {
+                            name: amount
+                            for name, amount in entry.items()
+                            if name not in _LOCAL_SCHEDULER_FIELDS
+                        }
+                        node_ips[entry["DBClientID"]] = node_ip
+        totals = {}
+        for resources in node_resources.values():
+            for name, amount in resources.items():
+                totals[name] = totals.get(name, 0) + amount
+        self._node_resources = node_resources
+        self._node_ips = node_ips
+        self._avail_resources = Resources(
+            int(totals.pop("CPU", 0)),
+            int(totals.pop("GPU", 0)),
+            custom_resources=totals)
         self._resources_initialized = True
 
     def has_resources(self, resources):
-        """Returns whether this runner has at least the specified resources."""
+        """Returns whether this runner has at least the specified resources.
 
-        cpu_avail = self._avail_resources.cpu - self._committed_resources.cpu
-        gpu_avail = self._avail_resources.gpu - self._committed_resources.gpu
+        This checks whether the resources can be placed on the nodes of the
+        cluster given the resources committed to running trials."""
 
-        have_space = (resources.cpu_total() <= cpu_avail
-                      and resources.gpu_total() <= gpu_avail)
-
-        if have_space:
+        if self._place(resources) is not None:
             return True
 
         can_overcommit = self._queue_trials
 
-        if (resources.cpu_total() > 0 and cpu_avail <= 0) or \
-           (resources.gpu_total() > 0 and gpu_avail <= 0):
-            can_overcommit = False  # requested resource is already saturated
+        committed = self._committed_totals()
+        requested = [(name, amount)
+                     for name, amount in resources.to_dict().items()]
+        requested += [(name, amount)
+                      for name, amount in resources.extra_to_dict().items()]
+        for name, amount in requested:
+            if name == "CPU":
+                avail = self._avail_resources.cpu
+            elif name == "GPU":
+                avail = self._avail_resources.gpu
+            else:
+                avail = self._avail_resources.get_res_total(name)
+            if amount > 0 and avail - committed.get(name, 0) <= 0:
+                can_overcommit = False  # requested resource is saturated
 
         if can_overcommit:
             print("WARNING:tune:allowing trial to start even though the "
@@ -230,9 +442,15 @@ class RayTrialExecutor(TrialExecutor):
         """Returns a human readable message for printing to the console."""
 
         if self._resources_initialized:
-            return "Resources requested: {}/{} CPUs, {}/{} GPUs".format(
-                self._committed_resources.cpu, self._avail_resources.cpu,
-                self._committed_resources.gpu, self._avail_resources.gpu)
+            committed = self._committed_totals()
+            status = "Resources requested: {}/{} CPUs, {}/{} GPUs".format(
+                committed.get("CPU", 0), self._avail_resources.cpu,
+                committed.get("GPU", 0), self._avail_resources.gpu)
+            for name in sorted(self._avail_resources.custom_resources):
+                status += ", {}/{} {}".format(
+                    committed.get(name, 0),
+                    self._avail_resources.get_res_total(name), name)
+            return status
         else:
             return ""
 
@@ -241,8 +459,36 @@ class RayTrialExecutor(TrialExecutor):
 
         self._update_avail_resources()
 
+    def _resolve_checkpoint(self, trial):
+        """Waits for the in-flight save of this trial, if any."""
+
+        save_id = self._pending_saves.pop(trial, None)
+        if save_id is None:
+            return
+        try:
+            trial._checkpoint.value = ray.get(save_id)
+            trial._checkpoint.storage = Checkpoint.DISK
+        except Exception:
+            print("Error saving runner:", traceback.format_exc())
+
+    def save_async(self, trial, storage=Checkpoint.DISK):
+        """Saves the trial's state to a checkpoint without waiting for it.
+
+        Disk checkpoints are only fetched when they are needed, i.e. on
+        restore, pause or stop, or with the next result of the trial. Since
+        actor tasks run in submission order, the checkpoint reflects the
+        state of the trial before any training submitted afterwards, and it
+        is done by the time that training returns."""
+
+        if storage == Checkpoint.MEMORY:
+            self.save(trial, storage)
+        else:
+            self._pending_saves[trial] = trial.runner.save.remote()
+
     def save(self, trial, storage=Checkpoint.DISK):
         """Saves the trial's state to a checkpoint."""
+        # Resolve older saves first so they cannot overwrite this checkpoint.
+        self._resolve_checkpoint(trial)
         trial._checkpoint.storage = storage
         if storage == Checkpoint.MEMORY:
             trial._checkpoint.value = trial.runner.save_to_object.remote()
@@ -252,6 +498,7 @@ class RayTrialExecutor(TrialExecutor):
 
     def restore(self, trial, checkpoint=None):
         """Restores training state from a given model checkpoint."""
+        self._resolve_checkpoint(trial)
         if checkpoint is None or checkpoint.value is None:
             checkpoint = trial._checkpoint
         if checkpoint is None or checkpoint.value is None:
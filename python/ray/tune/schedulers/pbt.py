@@ -198,9 +198,8 @@ class PopulationBasedTraining(FIFOScheduler):
             assert trial is not trial_to_clone
             self._exploit(trial_runner.trial_executor, trial, trial_to_clone)
 
-        for trial in trial_runner.get_trials():
-            if trial.status in [Trial.PENDING, Trial.PAUSED]:
-                return TrialScheduler.PAUSE  # yield time to other trials
+        if trial_runner.num_trials_with_status(Trial.PENDING, Trial.PAUSED):
+            return TrialScheduler.PAUSE  # yield time to other trials
 
         return TrialScheduler.CONTINUE
 
@@ -256,9 +255,9 @@ class PopulationBasedTraining(FIFOScheduler):
         """
 
         candidates = []
-        for trial in trial_runner.get_trials():
-            if trial.status in [Trial.PENDING, Trial.PAUSED] and \
-                    trial_runner.has_resources(trial.resources):
+        for trial in trial_runner.get_trials_with_status(
+                Trial.PENDING, Trial.PAUSED):
+            if trial_runner.has_resources(trial.resources):
                 candidates.append(trial)
         candidates.sort(
             key=lambda trial: self._trial_state[trial].last_perturbation_time)
@@ -84,13 +84,11 @@ class FIFOScheduler(TrialScheduler):
         pass
 
     def choose_trial_to_run(self, trial_runner):
-        for trial in trial_runner.get_trials():
-            if (trial.status == Trial.PENDING
-                    and trial_runner.has_resources(trial.resources)):
+        for trial in trial_runner.get_trials_with_status(Trial.PENDING):
+            if trial_runner.has_resources(trial.resources):
                 return trial
-        for trial in trial_runner.get_trials():
-            if (trial.status == Trial.PAUSED
-                    and trial_runner.has_resources(trial.resources)):
+        for trial in trial_runner.get_trials_with_status(Trial.PAUSED):
+            if trial_runner.has_resources(trial.resources):
                 return trial
         return None
 
@@ -23,7 +23,15 @@ class BasicVariantGenerator(SearchAlgorithm):
         >>> searcher.is_finished == True
     """
 
-    def __init__(self):
+    def __init__(self, batch_size=None):
+        """Initializes the variant generator.
+
+        Arguments:
+            batch_size (int): The maximum number of trials returned by each
+                call to next_trials. Trials are only created when they are
+                returned. If None, all of the trials are returned at once.
+        """
+        self._batch_size = batch_size
         self._parser = make_parser()
         self._trial_generator = []
         self._counter = 0
@@ -45,10 +53,12 @@ class BasicVariantGenerator(SearchAlgorithm):
         """Provides Trial objects to be queued into the TrialRunner.
 
         Returns:
-            trials (list): Returns a list of trials.
+            trials (list): Returns a list of at most batch_size trials.
         """
-        trials = list(self._trial_generator)
-        self._finished = True
+        trials = list(
+            itertools.islice(self._trial_generator, self._batch_size))
+        if self._batch_size is None or len(trials) < self._batch_size:
+            self._finished = True
         return trials
 
     def _generate_trials(self, unresolved_spec, output_path=""):
@@ -9,7 +9,7 @@ import ray
 from ray.rllib import _register_all
 from ray.tune.ray_trial_executor import RayTrialExecutor
 from ray.tune.suggest import BasicVariantGenerator
-from ray.tune.trial import Trial, Checkpoint
+from ray.tune.trial import Trial, Checkpoint, Resources
 
 
 class RayTrialExecutorTest(unittest.TestCase):
@@ -51,6 +51,47 @@ class RayTrialExecutorTest(unittest.TestCase):
         self.trial_executor.stop_trial(trial)
         self.assertEqual(Trial.TERMINATED, trial.status)
 
+    def testAsyncSave(self):
+        trial = Trial("__fake")
+        self.trial_executor.start_trial(trial)
+        self.trial_executor.fetch_one_result()
+        self.trial_executor.save_async(trial)
+        self.assertFalse(trial.has_checkpoint())
+        self.trial_executor.continue_training(trial)
+        fetched, _ = self.trial_executor.fetch_one_result()
+        self.assertIs(fetched, trial)
+        self.assertTrue(trial.has_checkpoint())
+        self.trial_executor.save_async(trial)
+        self.trial_executor.restore(trial)
+        self.assertEqual(Trial.RUNNING, trial.status)
+        self.trial_executor.stop_trial(trial)
+        self.assertEqual(Trial.TERMINATED, trial.status)
+
+    def testErroredTrialDropsPendingSave(self):
+        trial = Trial("__fake")
+        self.trial_executor.start_trial(trial)
+        self.trial_executor.fetch_one_result()
+        self.trial_executor.save_async(trial)
+        self.trial_executor.stop_trial(trial, error=True)
+        self.assertEqual(Trial.ERROR, trial.status)
+        self.assertNotIn(trial, self.trial_executor._pending_saves)
+
+    def testPlacementFollowsReportedNode(self):
+        executor = self.trial_executor
+        executor._node_resources = {
+            "a": {"CPU": 2},
+            "b": {"CPU": 1},
+        }
+        executor._node_ips = {"a": "1.1.1.1", "b": "2.2.2.2"}
+        trial = Trial("__fake", resources=Resources(cpu=1, gpu=0))
+        executor._commit_resources(trial)
+        self.assertEqual(executor._trial_nodes[trial], "b")
+        executor._move_to_node_ip(trial, "1.1.1.1")
+        self.assertEqual(executor._trial_nodes[trial], "a")
+        self.assertEqual(executor._node_committed, {"a": {"CPU": 1}})
+        executor._return_resources(trial)
+        self.assertEqual(executor._node_committed, {})
+
     def generate_trials(self, spec, name):
         suggester = BasicVariantGenerator({name: spec})
         return suggester.next_trials()
@@ -14,7 +14,8 @@ from ray.tune import register_env, register_trainable, run_experiments
 from ray.tune.ray_trial_executor import RayTrialExecutor
 from ray.tune.schedulers import TrialScheduler, FIFOScheduler
 from ray.tune.registry import _global_registry, TRAINABLE_CLASS
-from ray.tune.result import DEFAULT_RESULTS_DIR, TIMESTEPS_TOTAL, DONE
+from ray.tune.result import (DEFAULT_RESULTS_DIR, TIMESTEPS_TOTAL, DONE,
+                             TRAINING_ITERATION)
 from ray.tune.util import pin_in_object_store, get_pinned_object
 from ray.tune.experiment import Experiment
 from ray.tune.trial import Trial, Resources
@@ -366,6 +367,24 @@ class TrainableFunctionApiTest(unittest.TestCase):
         self.assertEqual(trial.status, Trial.TERMINATED)
         self.assertEqual(trial.last_result[TIMESTEPS_TOTAL], 99)
 
+    def testQueueResults(self):
+        def train(config, reporter):
+            for i in range(10):
+                reporter(timesteps_total=i)
+
+        [trial] = run_experiments({
+            "foo": {
+                "run": train,
+                "config": {
+                    "script_queue_results": True,
+                },
+            }
+        })
+        self.assertEqual(trial.status, Trial.TERMINATED)
+        self.assertEqual(trial.last_result[TIMESTEPS_TOTAL], 9)
+        # Every reported result plus the final result marked as done.
+        self.assertEqual(trial.last_result[TRAINING_ITERATION], 11)
+
     def testReportInfinity(self):
         def train(config, reporter):
             for i in range(100):
@@ -695,6 +714,23 @@ class VariantGeneratorTest(unittest.TestCase):
         else:
             assert False
 
+    def testBatchedVariants(self):
+        """Checks that BasicVariantGenerator creates trials in batches."""
+        searcher = BasicVariantGenerator(batch_size=2)
+        searcher.add_configurations({
+            "test": {
+                "run": "PPO",
+                "num_samples": 5,
+            }
+        })
+        self.assertEqual(len(searcher.next_trials()), 2)
+        self.assertFalse(searcher.is_finished())
+        self.assertEqual(len(searcher.next_trials()), 2)
+        trials = searcher.next_trials()
+        self.assertEqual(len(trials), 1)
+        self.assertEqual(trials[0].experiment_tag, "4")
+        self.assertTrue(searcher.is_finished())
+
     def testMaxConcurrentSuggestions(self):
         """Checks that next_trials() supports throttling."""
         experiment_spec = {
@@ -852,6 +888,31 @@ class TrialRunnerTest(unittest.TestCase):
         self.assertEqual(trials[0].status, Trial.TERMINATED)
         self.assertEqual(trials[1].status, Trial.TERMINATED)
 
+    def testCustomResources(self):
+        ray.init(num_cpus=4, num_gpus=2, resources={"a": 2})
+        runner = TrialRunner(BasicVariantGenerator())
+        kwargs = {
+            "stopping_criterion": {
+                "training_iteration": 1
+            },
+            "resources": Resources(cpu=1, gpu=0, custom_resources={"a": 2}),
+        }
+        trials = [Trial("__fake", **kwargs), Trial("__fake", **kwargs)]
+        for t in trials:
+            runner.add_trial(t)
+
+        runner.step()
+        self.assertEqual(trials[0].status, Trial.RUNNING)
+        self.assertEqual(trials[1].status, Trial.PENDING)
+
+        runner.step()
+        self.assertEqual(trials[0].status, Trial.TERMINATED)
+        self.assertEqual(trials[1].status, Trial.PENDING)
+
+        runner.step()
+        self.assertEqual(trials[0].status, Trial.TERMINATED)
+        self.assertEqual(trials[1].status, Trial.RUNNING)
+
     def testMultiStepRun(self):
         ray.init(num_cpus=4, num_gpus=2)
         runner = TrialRunner(BasicVariantGenerator())
@@ -1153,6 +1214,36 @@ class TrialRunnerTest(unittest.TestCase):
         self.assertEqual(trials[2].status, Trial.RUNNING)
         self.assertEqual(trials[-1].status, Trial.TERMINATED)
 
+    def testMaxPendingTrials(self):
+        ray.init(num_cpus=1)
+        searcher = BasicVariantGenerator(batch_size=2)
+        searcher.add_configurations({
+            "test": {
+                "run": "__fake",
+                "num_samples": 10,
+                "stop": {
+                    "training_iteration": 1
+                }
+            }
+        })
+        runner = TrialRunner(searcher, max_pending_trials=3)
+        runner.step()
+        self.assertEqual(len(runner.get_trials()), 2)
+        while not runner.is_finished():
+            runner.step()
+            # Trials are requested in batches of 2 while fewer than 3 are
+            # pending.
+            self.assertLessEqual(
+                runner.num_trials_with_status(Trial.PENDING), 4)
+            self.assertLessEqual(
+                len(runner.get_trials_with_status(Trial.RUNNING)), 1)
+        trials = runner.get_trials()
+        self.assertEqual(len(trials), 10)
+        self.assertEqual(
+            runner.get_trials_with_status(Trial.TERMINATED), trials)
+        for trial in trials:
+            self.assertIs(runner.get_trial(trial.trial_id), trial)
+
     def testSearchAlgNotification(self):
         """Checks notification of trial to the Search Algorithm."""
         ray.init(num_cpus=4, num_gpus=2)
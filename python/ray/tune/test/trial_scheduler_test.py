@@ -198,6 +198,12 @@ class _MockTrialRunner():
     def get_trials(self):
         return self.trials
 
+    def get_trials_with_status(self, *statuses):
+        return [t for t in self.trials if t.status in statuses]
+
+    def num_trials_with_status(self, *statuses):
+        return len(self.get_trials_with_status(*statuses))
+
     def has_resources(self, resources):
         return True
 
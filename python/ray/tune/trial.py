@@ -28,7 +28,10 @@ def date_str():
 
 
 class Resources(
-        namedtuple("Resources", ["cpu", "gpu", "extra_cpu", "extra_gpu"])):
+        namedtuple("Resources", [
+            "cpu", "gpu", "extra_cpu", "extra_gpu", "custom_resources",
+            "extra_custom_resources"
+        ])):
     """Ray resources required to schedule a trial.
 
     Attributes:
@@ -38,18 +41,40 @@ class Resources(
             launch additional Ray actors that use CPUs.
         extra_gpu (int): Extra GPUs to reserve in case the trial needs to
             launch additional Ray actors that use GPUs.
+        custom_resources (dict): Mapping from custom resource names to the
+            quantities to allocate to the trial.
+        extra_custom_resources (dict): Extra custom resources to reserve in
+            case the trial needs to launch additional Ray actors that use
+            custom resources.
 
     """
 
     __slots__ = ()
 
-    def __new__(cls, cpu, gpu, extra_cpu=0, extra_gpu=0):
-        return super(Resources, cls).__new__(cls, cpu, gpu, extra_cpu,
-                                             extra_gpu)
+    def __new__(cls,
+                cpu,
+                gpu,
+                extra_cpu=0,
+                extra_gpu=0,
+                custom_resources=None,
+                extra_custom_resources=None):
+        custom_resources = custom_resources or {}
+        extra_custom_resources = extra_custom_resources or {}
+        for name in list(custom_resources) + list(extra_custom_resources):
+            if name in ["CPU", "GPU"]:
+                raise ValueError(
+                    "Use the cpu and gpu fields instead of the custom "
+                    "resource {}.".format(name))
+        return super(Resources,
+                     cls).__new__(cls, cpu, gpu, extra_cpu, extra_gpu,
+                                  custom_resources, extra_custom_resources)
 
     def summary_string(self):
-        return "{} CPUs, {} GPUs".format(self.cpu + self.extra_cpu,
-                                         self.gpu + self.extra_gpu)
+        summary = "{} CPUs, {} GPUs".format(self.cpu + self.extra_cpu,
+                                            self.gpu + self.extra_gpu)
+        for name in sorted(self.custom_resource_names()):
+            summary += ", {} {}".format(self.get_res_total(name), name)
+        return summary
 
     def cpu_total(self):
         return self.cpu + self.extra_cpu
@@ -57,6 +82,27 @@ class Resources(
     def gpu_total(self):
         return self.gpu + self.extra_gpu
 
+    def custom_resource_names(self):
+        return set(self.custom_resources) | set(self.extra_custom_resources)
+
+    def get_res_total(self, name):
+        return (self.custom_resources.get(name, 0) +
+                self.extra_custom_resources.get(name, 0))
+
+    def to_dict(self):
+        """Returns the resources of the trial actor keyed by Ray name."""
+
+        resources = {"CPU": self.cpu, "GPU": self.gpu}
+        resources.update(self.custom_resources)
+        return resources
+
+    def extra_to_dict(self):
+        """Returns the extra resources keyed by Ray resource name."""
+
+        resources = {"CPU": self.extra_cpu, "GPU": self.extra_gpu}
+        resources.update(self.extra_custom_resources)
+        return resources
+
 
 def has_trainable(trainable_name):
     return ray.tune.registry._global_registry.contains(
@@ -103,6 +149,9 @@ class Trial(object):
     TERMINATED = "TERMINATED"
     ERROR = "ERROR"
 
+    _status = PENDING
+    _status_listener = None
+
     def __init__(self,
                  trainable_name,
                  config=None,
@@ -146,7 +195,7 @@ class Trial(object):
         self.checkpoint_at_end = checkpoint_at_end
         self._checkpoint = Checkpoint(
             storage=Checkpoint.DISK, value=restore_path)
-        self.status = Trial.PENDING
+        self._status = Trial.PENDING
         self.location = None
         self.logdir = None
         self.result_logger = None
@@ -158,6 +207,22 @@ class Trial(object):
         self.error_file = None
         self.num_failures = 0
 
+    @property
+    def status(self):
+        return self._status
+
+    @status.setter
+    def status(self, status):
+        prior_status = self._status
+        self._status = status
+        if self._status_listener is not None and status != prior_status:
+            self._status_listener(self, prior_status)
+
+    def set_status_listener(self, listener):
+        """Sets a function called as listener(trial, prior_status) whenever
+        the status of this trial changes."""
+        self._status_listener = listener
+
     @classmethod
     def generate_id(cls):
         return binary_to_hex(random_string())[:8]
@@ -151,6 +151,19 @@ class TrialExecutor(object):
         raise NotImplementedError("Subclasses of TrialExecutor must provide "
                                   "restore() method")
 
+    def save_async(self, trial, storage=Checkpoint.DISK):
+        """Starts saving training state of this trial to a checkpoint.
+
+        Unlike save(), this need not wait for the checkpoint to be written.
+        The checkpoint must be available to later restore() calls.
+        Defaults to a blocking save().
+
+        Args:
+            trial (Trial): The state of this trial to be saved.
+            storage (str): Where to store the checkpoint. Defaults to DISK.
+        """
+        self.save(trial, storage)
+
     def save(self, trial, storage=Checkpoint.DISK):
         """Saves training state of this trial to a checkpoint.
 
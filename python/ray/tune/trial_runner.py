@@ -15,6 +15,7 @@ from ray.tune.schedulers import FIFOScheduler, TrialScheduler
 from ray.tune.web_server import TuneServer
 
 MAX_DEBUG_TRIALS = 20
+DEFAULT_MAX_PENDING_TRIALS = 1000
 
 
 class TrialRunner(object):
@@ -46,7 +47,8 @@ class TrialRunner(object):
                  server_port=TuneServer.DEFAULT_PORT,
                  verbose=True,
                  queue_trials=False,
-                 trial_executor=None):
+                 trial_executor=None,
+                 max_pending_trials=DEFAULT_MAX_PENDING_TRIALS):
         """Initializes a new TrialRunner.
 
         Args:
@@ -62,10 +64,19 @@ class TrialRunner(object):
                 be set to True when running on an autoscaling cluster to enable
                 automatic scale-up.
             trial_executor (TrialExecutor): Defaults to RayTrialExecutor.
+            max_pending_trials (int): New trials are only requested from the
+                search algorithm while fewer than this many trials are
+                pending, which bounds the number of trials created ahead of
+                time. If None, trials are always requested.
         """
         self._search_alg = search_alg
         self._scheduler_alg = scheduler or FIFOScheduler()
         self._trials = []
+        # Indexes of the trials by ID and by status. The trials of each status
+        # map to their position in self._trials.
+        self._trials_by_id = {}
+        self._trials_by_status = collections.defaultdict(dict)
+        self._max_pending_trials = max_pending_trials
         self.trial_executor = trial_executor or \
             RayTrialExecutor(queue_trials=queue_trials)
 
@@ -89,8 +100,7 @@ class TrialRunner(object):
                 self._total_time, self._global_time_limit))
             return True
 
-        trials_done = all(trial.is_finished() for trial in self._trials)
-        return trials_done and self._search_alg.is_finished()
+        return self._trials_done() and self._search_alg.is_finished()
 
     def step(self):
         """Runs one step of the trial event loop.
@@ -105,7 +115,8 @@ class TrialRunner(object):
         elif self.trial_executor.get_running_trials():
             self._process_events()
         else:
-            for trial in self._trials:
+            for trial in self.get_trials_with_status(Trial.PENDING,
+                                                     Trial.PAUSED):
                 if trial.status == Trial.PENDING:
                     if not self.has_resources(trial.resources):
                         raise TuneError(
@@ -133,8 +144,7 @@ class TrialRunner(object):
         self.trial_executor.on_step_end()
 
     def get_trial(self, tid):
-        trial = [t for t in self._trials if t.trial_id == tid]
-        return trial[0] if trial else None
+        return self._trials_by_id.get(tid)
 
     def get_trials(self):
         """Returns the list of trials managed by this TrialRunner.
@@ -144,6 +154,20 @@ class TrialRunner(object):
 
         return self._trials
 
+    def get_trials_with_status(self, *statuses):
+        """Returns the trials with any of the given statuses.
+
+        The trials are returned in the order in which they were added.
+        """
+        trials = {}
+        for status in statuses:
+            trials.update(self._trials_by_status[status])
+        return sorted(trials, key=trials.get)
+
+    def num_trials_with_status(self, *statuses):
+        """Returns the number of trials with any of the given statuses."""
+        return sum(len(self._trials_by_status[status]) for status in statuses)
+
     def add_trial(self, trial):
         """Adds a new trial to this TrialRunner.
 
@@ -153,17 +177,29 @@ class TrialRunner(object):
             trial (Trial): Trial to queue.
         """
         trial.set_verbose(self._verbose)
+        trial.set_status_listener(self._on_trial_status_change)
+        self._trials_by_id[trial.trial_id] = trial
+        self._trials_by_status[trial.status][trial] = len(self._trials)
         self._scheduler_alg.on_trial_add(self, trial)
         self._trials.append(trial)
 
+    def _on_trial_status_change(self, trial, prior_status):
+        position = self._trials_by_status[prior_status].pop(trial)
+        self._trials_by_status[trial.status][trial] = position
+
+    def _trials_done(self):
+        return self.num_trials_with_status(Trial.TERMINATED,
+                                           Trial.ERROR) == len(self._trials)
+
     def debug_string(self, max_debug=MAX_DEBUG_TRIALS):
         """Returns a human readable message for printing to the console."""
 
         messages = self._debug_messages()
-        states = collections.defaultdict(set)
+        states = {
+            status: set(trials)
+            for status, trials in self._trials_by_status.items() if trials
+        }
         limit_per_state = collections.Counter()
-        for t in self._trials:
-            states[t.status].add(t)
 
         # Show at most max_debug total, but divide the limit fairly
         while max_debug > 0:
@@ -202,11 +238,15 @@ class TrialRunner(object):
         """Replenishes queue.
 
         Blocks if all trials queued have finished, but search algorithm is
-        still not finished.
+        still not finished. New trials are not requested while there are
+        max_pending_trials pending trials.
         """
-        trials_done = all(trial.is_finished() for trial in self._trials)
-        wait_for_trial = trials_done and not self._search_alg.is_finished()
-        self._update_trial_queue(blocking=wait_for_trial)
+        wait_for_trial = (self._trials_done()
+                          and not self._search_alg.is_finished())
+        if (wait_for_trial or self._max_pending_trials is None
+                or self.num_trials_with_status(
+                    Trial.PENDING) < self._max_pending_trials):
+            self._update_trial_queue(blocking=wait_for_trial)
         trial = self._scheduler_alg.choose_trial_to_run(self)
         return trial
 
@@ -236,8 +276,7 @@ class TrialRunner(object):
 
             if decision == TrialScheduler.CONTINUE:
                 if trial.should_checkpoint(result):
-                    # TODO(rliaw): This is a blocking call
-                    self.trial_executor.save(trial)
+                    self.trial_executor.save_async(trial)
                 self.trial_executor.continue_training(trial)
             elif decision == TrialScheduler.PAUSE:
                 self.trial_executor.pause_trial(trial)
@@ -245,7 +284,7 @@ class TrialRunner(object):
                 # Checkpoint before ending the trial
                 # if checkpoint_at_end experiment option is set to True
                 if trial.should_checkpoint(result):
-                    self.trial_executor.save(trial)
+                    self.trial_executor.save_async(trial)
                 self.trial_executor.stop_trial(trial)
             else:
                 assert False, "Invalid scheduling decision: {}".format(
@@ -8,7 +8,7 @@ from ray.tune.error import TuneError
 from ray.tune.suggest import BasicVariantGenerator
 from ray.tune.trial import Trial, DEBUG_PRINT_INTERVAL
 from ray.tune.log_sync import wait_for_log_sync
-from ray.tune.trial_runner import TrialRunner
+from ray.tune.trial_runner import TrialRunner, DEFAULT_MAX_PENDING_TRIALS
 from ray.tune.schedulers import (HyperBandScheduler, AsyncHyperBandScheduler,
                                  FIFOScheduler, MedianStoppingRule)
 from ray.tune.web_server import TuneServer
@@ -82,7 +82,9 @@ def run_experiments(experiments=None,
         scheduler = FIFOScheduler()
 
     if search_alg is None:
-        search_alg = BasicVariantGenerator()
+        # Create the trials lazily, as the runner has room for them.
+        search_alg = BasicVariantGenerator(
+            batch_size=DEFAULT_MAX_PENDING_TRIALS)
 
     search_alg.add_configurations(experiments)
 
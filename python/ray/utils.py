@@ -242,6 +242,9 @@ def resources_from_resource_arguments(default_num_cpus, default_num_gpus,
 
     Returns:
         A dictionary of the resource requirements for the task.
+
+    Raises:
+        ValueError: If any of the resource quantities is invalid.
     """
     if runtime_resources is not None:
         resources = runtime_resources.copy()
@@ -263,6 +266,14 @@ def resources_from_resource_arguments(default_num_cpus, default_num_gpus,
     elif default_num_gpus is not None:
         resources["GPU"] = default_num_gpus
 
+    for value in resources.values():
+        assert (isinstance(value, int) or isinstance(value, float))
+        if value < 0:
+            raise ValueError("Resource quantities must be nonnegative.")
+        if (value >= 1 and isinstance(value, float)
+                and not value.is_integer()):
+            raise ValueError("Resource quantities must all be whole numbers.")
+
     return resources
 
 
@@ -5,6 +5,7 @@ from __future__ import print_function
 import atexit
 import collections
 import colorama
+import contextlib
 import hashlib
 import inspect
 import logging
@@ -33,7 +34,6 @@ import ray.ray_constants as ray_constants
 from ray import import_thread
 from ray import profiling
 from ray.utils import (
-    binary_to_hex,
     check_oversized_pickle,
     is_cython,
     random_string,
@@ -240,6 +240,10 @@ class Worker(object):
         # import thread. It is safe to convert this worker into an actor of
         # these types.
         self.imported_actor_classes = set()
+        # A dictionary that maps actor class IDs to the ActorClassMethods of
+        # that class. Actor handles are deserialized with these, so that they
+        # don't need to carry the methods of their class.
+        self.actor_class_methods = {}
         # The number of threads Plasma should use when putting an object in the
         # object store.
         self.memcopy_threads = 12
@@ -248,6 +252,10 @@ class Worker(object):
         self.original_gpu_ids = ray.utils.get_cuda_visible_devices()
         self.profiler = profiling.Profiler(self)
         self.state_lock = threading.Lock()
+        # Thread-local state holding the list of tasks that submit_task
+        # collects instead of sending them while a task batch is open. See
+        # task_batch.
+        self.task_batch_state = threading.local()
         # A dictionary that maps from driver id to SerializationContext
         # TODO: clean up the SerializationContext once the job finished.
         self.serialization_context_map = {}
@@ -590,7 +598,8 @@ class Worker(object):
             execution_dependencies: The execution dependencies for this task.
             num_return_vals: The number of return values this function should
                 have.
-            resources: The resource requirements for this task.
+            resources: The resource requirements for this task. These are
+                validated by ray.utils.resources_from_resource_arguments.
             driver_id: The ID of the relevant driver. This is almost always the
                 driver ID of the driver that is currently running. However, in
                 the exceptional case that an actor task is being dispatched to
@@ -634,15 +643,6 @@ class Worker(object):
 
             if resources is None:
                 raise ValueError("The resources dictionary is required.")
-            for value in resources.values():
-                assert (isinstance(value, int) or isinstance(value, float))
-                if value < 0:
-                    raise ValueError(
-                        "Resource quantities must be nonnegative.")
-                if (value >= 1 and isinstance(value, float)
-                        and not value.is_integer()):
-                    raise ValueError(
-                        "Resource quantities must all be whole numbers.")
 
             with self.state_lock:
                 # Increment the worker's task index to track how many tasks
@@ -657,10 +657,38 @@ class Worker(object):
                 actor_creation_id, actor_creation_dummy_object_id, actor_id,
                 actor_handle_id, actor_counter, is_actor_checkpoint_method,
                 execution_dependencies, resources, self.use_raylet)
-            self.local_scheduler_client.submit(task)
+            pending_tasks = getattr(self.task_batch_state, "tasks", None)
+            if pending_tasks is not None:
+                pending_tasks.append(task)
+            else:
+                self.local_scheduler_client.submit(task)
 
             return task.returns()
 
+    @contextlib.contextmanager
+    def task_batch(self):
+        """Collect the tasks submitted in this context and send them at once.
+
+        The tasks are built (and their return object IDs are handed out) as
+        usual, but they are sent to the local scheduler in a single message
+        when the outermost batch exits, instead of one round trip per task.
+        Tasks are sent even if the body raises, since actor tasks that were
+        already built advance the actor's counter.
+        """
+        if getattr(self.task_batch_state, "tasks", None) is not None:
+            # Nested batches are folded into the outermost batch.
+            yield
+            return
+        self.task_batch_state.tasks = []
+        try:
+            yield
+        finally:
+            tasks = self.task_batch_state.tasks
+            self.task_batch_state.tasks = None
+            if tasks:
+                with profiling.profile("submit_task_batch", worker=self):
+                    self.local_scheduler_client.submit_batch(tasks)
+
     def export_remote_function(self, function_id, function_name, function,
                                max_calls, decorated_function):
         """Export a remote function.
@@ -1028,18 +1056,8 @@ class Worker(object):
 
             function_name = (self.function_execution_info[driver_id][
                 function_id.id()]).function_name
-            if not self.use_raylet:
-                extra_data = {
-                    "function_name": function_name,
-                    "task_id": task.task_id().hex(),
-                    "worker_id": binary_to_hex(self.worker_id)
-                }
-            else:
-                extra_data = {
-                    "name": function_name,
-                    "task_id": task.task_id().hex()
-                }
-            with profiling.profile("task", extra_data=extra_data, worker=self):
+            with profiling.profile_task(
+                    function_name, task.task_id(), worker=self):
                 self._process_task(task)
 
         # In the non-raylet code path, push all of the log events to the global
@@ -2619,6 +2637,41 @@ def wait(object_ids, num_returns=1, timeout=None, worker=global_worker):
         return ready_ids, remaining_ids
 
 
+def submit_batch(calls, worker=global_worker):
+    """Submit many remote function and actor method calls at once.
+
+    This is equivalent to calling remote() for each call, except that all of
+    the resulting tasks are sent to the local scheduler together, which is
+    much cheaper than submitting them one at a time when there are many small
+    tasks (for example, when fanning out a call over many actor handles).
+
+    Args:
+        calls: An iterable of tuples (f, args) or (f, args, kwargs), where f is
+            a remote function or an actor method such as handle.method, args
+            is a sequence of positional arguments and kwargs is a dictionary of
+            keyword arguments.
+
+    Returns:
+        A list with the value that f.remote(*args, **kwargs) would have
+            returned for each call, in order.
+    """
+    worker.check_connected()
+    results = []
+    with profiling.profile("ray.submit_batch", worker=worker):
+        with worker.task_batch():
+            for call in calls:
+                if len(call) == 2:
+                    (function, args), kwargs = call, {}
+                elif len(call) == 3:
+                    function, args, kwargs = call
+                else:
+                    raise ValueError("Each call passed to ray.submit_batch "
+                                     "must be a tuple (f, args) or "
+                                     "(f, args, kwargs).")
+                results.append(function.remote(*args, **kwargs))
+    return results
+
+
 def _mode(worker=global_worker):
     """This is a wrapper around worker.mode.
 
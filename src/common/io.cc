@@ -286,6 +286,20 @@ int write_message(int fd,
   }
 }
 
+void append_message(std::vector<uint8_t> &buffer,
+                    int64_t type,
+                    int64_t length,
+                    const uint8_t *bytes) {
+  int64_t version = RayConfig::instance().ray_protocol_version();
+  const uint8_t *version_bytes = reinterpret_cast<const uint8_t *>(&version);
+  const uint8_t *type_bytes = reinterpret_cast<const uint8_t *>(&type);
+  const uint8_t *length_bytes = reinterpret_cast<const uint8_t *>(&length);
+  buffer.insert(buffer.end(), version_bytes, version_bytes + sizeof(version));
+  buffer.insert(buffer.end(), type_bytes, type_bytes + sizeof(type));
+  buffer.insert(buffer.end(), length_bytes, length_bytes + sizeof(length));
+  buffer.insert(buffer.end(), bytes, bytes + length);
+}
+
 int read_bytes(int fd, uint8_t *cursor, size_t length) {
   ssize_t nbytes = 0;
   /* Termination condition: EOF or read 'length' bytes total. */
@@ -133,6 +133,21 @@ int write_message(int fd,
                   uint8_t *bytes,
                   std::mutex *mutex = NULL);
 
+/**
+ * Append a message to a buffer in the format that write_message uses. This
+ * allows sending many messages with a single write_bytes call.
+ *
+ * @param buffer The buffer to append the message to.
+ * @param type The type of the message to send.
+ * @param length The size in bytes of the bytes parameter.
+ * @param bytes The address of the message to send.
+ * @return Void.
+ */
+void append_message(std::vector<uint8_t> &buffer,
+                    int64_t type,
+                    int64_t length,
+                    const uint8_t *bytes);
+
 /**
  * Read a sequence of bytes written by write_message from a file descriptor.
  * This allocates space for the message.
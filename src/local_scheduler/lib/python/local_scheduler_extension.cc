@@ -71,6 +71,50 @@ static PyObject *PyLocalSchedulerClient_submit(PyObject *self, PyObject *args) {
   Py_RETURN_NONE;
 }
 
+static PyObject *PyLocalSchedulerClient_submit_batch(PyObject *self,
+                                                     PyObject *args) {
+  PyObject *py_tasks;
+  if (!PyArg_ParseTuple(args, "O", &py_tasks)) {
+    return NULL;
+  }
+  PyObject *tasks = PySequence_Fast(py_tasks, "tasks must be a sequence");
+  if (tasks == NULL) {
+    return NULL;
+  }
+  Py_ssize_t num_tasks = PySequence_Fast_GET_SIZE(tasks);
+  for (Py_ssize_t i = 0; i < num_tasks; ++i) {
+    if (!PyObject_TypeCheck(PySequence_Fast_GET_ITEM(tasks, i),
+                            &PyTaskType)) {
+      Py_DECREF(tasks);
+      PyErr_SetString(PyExc_TypeError, "tasks must only contain Tasks");
+      return NULL;
+    }
+  }
+
+  // Frame all of the task messages in one buffer, so that they are sent with
+  // a single write instead of several writes per task.
+  std::vector<uint8_t> buffer;
+  for (Py_ssize_t i = 0; i < num_tasks; ++i) {
+    PyTask *task =
+        reinterpret_cast<PyTask *>(PySequence_Fast_GET_ITEM(tasks, i));
+    if (!use_raylet(task)) {
+      TaskExecutionSpec execution_spec = TaskExecutionSpec(
+          *task->execution_dependencies, task->spec, task->size);
+      local_scheduler_append_task(buffer, execution_spec);
+    } else {
+      local_scheduler_append_task_raylet(
+          buffer, *task->execution_dependencies, *task->task_spec);
+    }
+  }
+  Py_DECREF(tasks);
+
+  local_scheduler_submit_batch(
+      reinterpret_cast<PyLocalSchedulerClient *>(self)
+          ->local_scheduler_connection,
+      buffer);
+  Py_RETURN_NONE;
+}
+
 // clang-format off
 static PyObject *PyLocalSchedulerClient_get_task(PyObject *self) {
   TaskSpec *task_spec;
@@ -457,6 +501,8 @@ static PyMethodDef PyLocalSchedulerClient_methods[] = {
      "Notify the local scheduler that this client is exiting gracefully."},
     {"submit", (PyCFunction) PyLocalSchedulerClient_submit, METH_VARARGS,
      "Submit a task to the local scheduler."},
+    {"submit_batch", (PyCFunction) PyLocalSchedulerClient_submit_batch,
+     METH_VARARGS, "Submit a list of tasks to the local scheduler at once."},
     {"get_task", (PyCFunction) PyLocalSchedulerClient_get_task, METH_NOARGS,
      "Get a task from the local scheduler."},
     {"reconstruct_objects",
@@ -76,9 +76,9 @@ void local_scheduler_log_event(LocalSchedulerConnection *conn,
                 fbb.GetSize(), fbb.GetBufferPointer(), &conn->write_mutex);
 }
 
-void local_scheduler_submit(LocalSchedulerConnection *conn,
-                            const TaskExecutionSpec &execution_spec) {
-  flatbuffers::FlatBufferBuilder fbb;
+/// Build the message that submits a task.
+static void build_submit_task_request(flatbuffers::FlatBufferBuilder &fbb,
+                                      const TaskExecutionSpec &execution_spec) {
   auto execution_dependencies =
       to_flatbuf(fbb, execution_spec.ExecutionDependencies());
   auto task_spec =
@@ -87,6 +87,23 @@ void local_scheduler_submit(LocalSchedulerConnection *conn,
   auto message = ray::local_scheduler::protocol::CreateSubmitTaskRequest(
       fbb, execution_dependencies, task_spec);
   fbb.Finish(message);
+}
+
+/// Build the message that submits a task using the raylet code path.
+static void build_submit_task_request_raylet(
+    flatbuffers::FlatBufferBuilder &fbb,
+    const std::vector<ObjectID> &execution_dependencies,
+    const ray::raylet::TaskSpecification &task_spec) {
+  auto execution_dependencies_message = to_flatbuf(fbb, execution_dependencies);
+  auto message = ray::local_scheduler::protocol::CreateSubmitTaskRequest(
+      fbb, execution_dependencies_message, task_spec.ToFlatbuffer(fbb));
+  fbb.Finish(message);
+}
+
+void local_scheduler_submit(LocalSchedulerConnection *conn,
+                            const TaskExecutionSpec &execution_spec) {
+  flatbuffers::FlatBufferBuilder fbb;
+  build_submit_task_request(fbb, execution_spec);
   write_message(conn->conn, static_cast<int64_t>(MessageType::SubmitTask),
                 fbb.GetSize(), fbb.GetBufferPointer(), &conn->write_mutex);
 }
@@ -96,14 +113,35 @@ void local_scheduler_submit_raylet(
     const std::vector<ObjectID> &execution_dependencies,
     const ray::raylet::TaskSpecification &task_spec) {
   flatbuffers::FlatBufferBuilder fbb;
-  auto execution_dependencies_message = to_flatbuf(fbb, execution_dependencies);
-  auto message = ray::local_scheduler::protocol::CreateSubmitTaskRequest(
-      fbb, execution_dependencies_message, task_spec.ToFlatbuffer(fbb));
-  fbb.Finish(message);
+  build_submit_task_request_raylet(fbb, execution_dependencies, task_spec);
   write_message(conn->conn, static_cast<int64_t>(MessageType::SubmitTask),
                 fbb.GetSize(), fbb.GetBufferPointer(), &conn->write_mutex);
 }
 
+void local_scheduler_append_task(std::vector<uint8_t> &buffer,
+                                 const TaskExecutionSpec &execution_spec) {
+  flatbuffers::FlatBufferBuilder fbb;
+  build_submit_task_request(fbb, execution_spec);
+  append_message(buffer, static_cast<int64_t>(MessageType::SubmitTask),
+                 fbb.GetSize(), fbb.GetBufferPointer());
+}
+
+void local_scheduler_append_task_raylet(
+    std::vector<uint8_t> &buffer,
+    const std::vector<ObjectID> &execution_dependencies,
+    const ray::raylet::TaskSpecification &task_spec) {
+  flatbuffers::FlatBufferBuilder fbb;
+  build_submit_task_request_raylet(fbb, execution_dependencies, task_spec);
+  append_message(buffer, static_cast<int64_t>(MessageType::SubmitTask),
+                 fbb.GetSize(), fbb.GetBufferPointer());
+}
+
+void local_scheduler_submit_batch(LocalSchedulerConnection *conn,
+                                  std::vector<uint8_t> &buffer) {
+  std::unique_lock<std::mutex> guard(conn->write_mutex);
+  write_bytes(conn->conn, buffer.data(), buffer.size());
+}
+
 TaskSpec *local_scheduler_get_task(LocalSchedulerConnection *conn,
                                    int64_t *task_size) {
   int64_t type;
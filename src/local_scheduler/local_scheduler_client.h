@@ -79,6 +79,37 @@ void local_scheduler_submit_raylet(
     const std::vector<ObjectID> &execution_dependencies,
     const ray::raylet::TaskSpecification &task_spec);
 
+/// Append the message that submits a task to a buffer, so that many tasks can
+/// be submitted at once with local_scheduler_submit_batch.
+///
+/// \param buffer The buffer to append the message to.
+/// \param execution_spec The execution spec for the task to submit.
+/// \return Void.
+void local_scheduler_append_task(std::vector<uint8_t> &buffer,
+                                 const TaskExecutionSpec &execution_spec);
+
+/// Append the message that submits a task using the raylet code path to a
+/// buffer, so that many tasks can be submitted at once with
+/// local_scheduler_submit_batch.
+///
+/// \param buffer The buffer to append the message to.
+/// \param execution_dependencies The execution dependencies.
+/// \param task_spec The task specification.
+/// \return Void.
+void local_scheduler_append_task_raylet(
+    std::vector<uint8_t> &buffer,
+    const std::vector<ObjectID> &execution_dependencies,
+    const ray::raylet::TaskSpecification &task_spec);
+
+/// Submit the tasks appended to a buffer to the local scheduler with a single
+/// write.
+///
+/// \param conn The connection information.
+/// \param buffer The buffer that the task messages were appended to.
+/// \return Void.
+void local_scheduler_submit_batch(LocalSchedulerConnection *conn,
+                                  std::vector<uint8_t> &buffer);
+
 /**
  * Notify the local scheduler that this client is disconnecting gracefully. This
  * is used by actors to exit gracefully so that the local scheduler doesn't
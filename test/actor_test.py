@@ -1950,6 +1950,25 @@ def test_pickling_actor_handle(ray_start_regular):
     ray.get(new_f.method.remote())
 
 
+def test_actor_handle_does_not_carry_methods(ray_start_regular):
+    @ray.remote
+    class Foo(object):
+        def method(self, x, y=1):
+            return x + y
+
+    f = Foo.remote()
+    state = f._serialization_helper(False)
+    assert "actor_method_names" not in state
+    assert "method_signatures" not in state
+
+    @ray.remote
+    def call_method(f):
+        # The methods of Foo are fetched by class ID on this worker.
+        return ray.get(f.method.remote(1, y=2))
+
+    assert ray.get(call_method.remote(f)) == 3
+
+
 def test_register_and_get_named_actors(ray_start_regular):
     # TODO(heyucongtom): We should test this from another driver.
 
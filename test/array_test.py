@@ -18,7 +18,8 @@ if sys.version_info >= (3, 0):
 @pytest.fixture
 def ray_start_regular():
     for module in [
-            ra.core, ra.random, ra.linalg, da.core, da.random, da.linalg
+            ra.core, ra.random, ra.linalg, da.core, da.random, da.linalg,
+            da.expression
     ]:
         reload(module)
     # Start the Ray processes.
@@ -67,10 +68,124 @@ def test_distributed_array_assemble(ray_start_regular):
         ]))
 
 
+def test_distributed_array_slicing(ray_start_regular):
+    x_val = np.random.normal(size=[25, 33, 7])
+    x = ray.get(da.numpy_to_dist.remote(x_val))
+    indices = [
+        3,
+        -1,
+        (slice(2, 5), ),
+        (slice(None, None, -3), 4),
+        (Ellipsis, 2),
+        (1, Ellipsis, slice(1, 6, 2)),
+        (slice(9, 11), slice(5, 25, 7), 0),
+        (slice(3, 3), ),
+        (1, 2, 3),
+        (np.array([1, 4]), ),
+    ]
+    for sliced in indices:
+        assert_equal(x[sliced], x_val[sliced])
+    with pytest.raises(IndexError):
+        x[25]
+
+    blocks = list(x.iter_blocks(num_blocks_per_get=4))
+    assert [index for index, _ in blocks] == list(np.ndindex(*x.num_blocks))
+    for index, block in blocks:
+        lower = da.DistArray.compute_block_lower(index, x.shape)
+        upper = da.DistArray.compute_block_upper(index, x.shape)
+        assert_equal(block, x_val[tuple(
+            slice(l, u) for (l, u) in zip(lower, upper))])
+
+
+def test_distributed_array_block_size(ray_start_regular):
+    x_val = np.random.normal(size=[23, 37])
+    y_val = np.random.normal(size=[37, 11])
+    x = ray.get(da.numpy_to_dist.remote(x_val, block_size=[7, 3]))
+    assert x.block_size == [7, 3]
+    assert x.num_blocks == [4, 13]
+    assert_equal(x.assemble(), x_val)
+    assert_equal(x[5:20:3, 4], x_val[5:20:3, 4])
+
+    for block_size in [5, [9, 2], [23, 37]]:
+        z = ray.get(da.rechunk.remote(x, block_size))
+        assert z.block_size == da.DistArray.compute_block_size(block_size, 2)
+        assert_equal(z.assemble(), x_val)
+        assert_equal(ray.get(da.add.remote(x, z)).assemble(), 2 * x_val)
+
+    assert_equal(ray.get(da.triu.remote(x)).assemble(), np.triu(x_val))
+    assert_equal(ray.get(da.tril.remote(x)).assemble(), np.tril(x_val))
+    assert_equal(ray.get(da.transpose.remote(x)).assemble(), x_val.T)
+    assert_almost_equal(
+        ray.get(da.eye.remote(23, 37, block_size=[7, 3])).assemble(),
+        np.eye(23, 37))
+
+    # The blocks of y don't line up with the blocks of x, so y is rechunked.
+    y = ray.get(da.numpy_to_dist.remote(y_val, block_size=[8, 4]))
+    for inner_blocks_per_task in [1, 2, 13]:
+        z = ray.get(
+            da.dot.remote(x, y, inner_blocks_per_task=inner_blocks_per_task))
+        assert z.block_size == [7, 4]
+        assert_almost_equal(z.assemble(), np.dot(x_val, y_val))
+
+    # tsqr and tsqr_hr with row blocks taller than the number of columns.
+    a = da.random.normal.remote([53, 12], block_size=[15, 20])
+    a_val = ray.get(da.assemble.remote(a))
+    q, r = da.linalg.tsqr.remote(a)
+    q_val = ray.get(da.assemble.remote(q))
+    assert_almost_equal(a_val, np.dot(q_val, ray.get(r)))
+    assert_almost_equal(np.dot(q_val.T, q_val), np.eye(12))
+    y, t, y_top, r = da.linalg.tsqr_hr.remote(a)
+    assert ray.get(y).block_size == [15, 20]
+    tall_eye = np.eye(53, 12)
+    q = tall_eye - np.dot(
+        ray.get(da.assemble.remote(y)),
+        np.dot(ray.get(t),
+               ray.get(y_top).T))
+    assert_almost_equal(np.dot(q.T, q), np.eye(12))
+    assert_almost_equal(np.dot(q, ray.get(r)), a_val)
+
+    # Row blocks shorter than the number of columns are rejected.
+    with pytest.raises(Exception):
+        ray.get(
+            da.linalg.tsqr.remote(
+                da.random.normal.remote([20, 8], block_size=[5, 50]))[1])
+
+
+def test_distributed_array_expressions(ray_start_regular):
+    x_val = np.random.normal(size=[23, 37])
+    y_val = np.random.normal(size=[23, 37])
+    x = ray.get(da.numpy_to_dist.remote(x_val, block_size=[7, 3]))
+    # The blocks of y don't line up with the blocks of x.
+    y = ray.get(da.numpy_to_dist.remote(y_val, block_size=5))
+
+    expression = np.exp(da.lazy(x)) * 2 + y - 1
+    expression = abs(-expression) / 3 + np.maximum(da.lazy(x), y)**2
+    expected = (np.abs(-(np.exp(x_val) * 2 + y_val - 1)) / 3 + np.maximum(
+        x_val, y_val)**2)
+    result = ray.get(da.evaluate.remote(expression))
+    assert result.block_size == [7, 3]
+    assert_almost_equal(result.assemble(), expected)
+
+    for reduction, numpy_reduction in [(da.sum, np.sum), (da.mean, np.mean),
+                                       (da.max, np.max), (da.min, np.min)]:
+        assert_almost_equal(
+            ray.get(reduction.remote(expression)), numpy_reduction(expected))
+        for axis in [0, 1, -1]:
+            assert_almost_equal(
+                ray.get(reduction.remote(expression, axis=axis)).assemble(),
+                numpy_reduction(expected, axis=axis))
+    assert_almost_equal(
+        ray.get(da.sum.remote(x, axis=0)).assemble(), np.sum(x_val, axis=0))
+
+    with pytest.raises(Exception):
+        da.apply(np.add, x, ray.get(da.zeros.remote([3, 3])))
+
+
 @pytest.fixture
 def ray_start_two_nodes():
     for module in [
-            ra.core, ra.random, ra.linalg, da.core, da.random, da.linalg
+            ra.core, ra.random, ra.linalg, da.core, da.random, da.linalg,
+            da.expression
     ]:
         reload(module)
     # Start the Ray processes.
@@ -2,11 +2,13 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import json
 import os
 import pytest
 import re
 import string
 import sys
+import tempfile
 import threading
 import time
 import unittest
@@ -290,6 +292,49 @@ def test_putting_object_that_closes_over_object_id(ray_start):
         ray.put(f)
 
 
+def test_binary_profiling_buffer():
+    buffer = ray.profiling.BinaryEventBuffer(3)
+    task_id = 20 * b"\x01"
+    buffer.add(0.0, 1.0, "task", "f", task_id, None)
+    buffer.add(1.0, 2.0, "task:execute", None, None, None)
+    buffer.add(2.0, 3.0, "custom", None, None, {"key": "value"})
+    buffer.add(3.0, 4.0, "task", "g", task_id, None)
+    assert len(buffer) == 3
+    assert buffer.num_dropped == 1
+
+    events = buffer.drain(raylet=True, worker_id_hex="ff")
+    assert len(buffer) == 0
+    assert [event["event_type"]
+            for event in events] == ["task:execute", "custom", "task"]
+    assert [event["start_time"] for event in events] == [1.0, 2.0, 3.0]
+    assert json.loads(events[1]["extra_data"]) == {"key": "value"}
+    assert json.loads(events[2]["extra_data"]) == {
+        "name": "g",
+        "task_id": 20 * "01"
+    }
+
+    buffer.add(5.0, 6.0, "task", "f", task_id, None)
+    events = buffer.drain(raylet=False, worker_id_hex="ff")
+    assert events == [(5.0, "task", ray.profiling.LOG_SPAN_START, {
+        "task_id": 20 * "01",
+        "function_name": "f",
+        "worker_id": "ff"
+    }), (6.0, "task", ray.profiling.LOG_SPAN_END, {})]
+
+
+def test_binary_profiling_buffer_many_names():
+    buffer = ray.profiling.BinaryEventBuffer(3)
+    num_events = 2 * (1 << 16)
+    for i in range(num_events):
+        buffer.add(float(i), float(i), "custom", "span {}".format(i), None,
+                   None)
+    assert len(buffer._strings) <= (
+        7 + ray.profiling.BinaryEventBuffer.MAX_UNUSED_STRINGS)
+    assert [name for _, _, _, name, _, _ in buffer.records()] == [
+        "span {}".format(i) for i in range(num_events - 3, num_events)
+    ]
+
+
 class WorkerTest(unittest.TestCase):
     def tearDown(self):
         ray.shutdown()
@@ -602,6 +647,10 @@ class APITest(unittest.TestCase):
         with pytest.raises(Exception):
             f2.remote(1, 2, 3, 4)
 
+        # Make sure we get an exception if too few arguments are passed in.
+        with pytest.raises(Exception):
+            f2.remote()
+
         @ray.remote
         def f3(x):
             return x
@@ -777,6 +826,42 @@ class APITest(unittest.TestCase):
             args=["test"], kwargs={"b": 2}, num_return_vals=4)
         assert ray.get([id1, id2, id3, id4]) == [0, 1, "test", 2]
 
+    def testSubmitBatchAPI(self):
+        self.init_ray(num_cpus=2)
+
+        @ray.remote
+        def f(x, y=1):
+            return x * y
+
+        assert ray.get(f.map(range(10))) == list(range(10))
+        assert ray.get(f.map(range(10), [2] * 5)) == [0, 2, 4, 6, 8]
+        assert f.map([]) == []
+
+        object_ids = ray.submit_batch([(f, [1]), (f, [2], {"y": 3})])
+        assert ray.get(object_ids) == [1, 6]
+
+        @ray.remote
+        class Counter(object):
+            def __init__(self):
+                self.count = 0
+
+            def add(self, n):
+                self.count += n
+                return self.count
+
+        # Tasks for the same actor in a batch must run in submission order.
+        counter = Counter.remote()
+        assert ray.get(counter.add.map([1, 2, 3])) == [1, 3, 6]
+
+        # Fan a method out over many actor handles.
+        counters = [Counter.remote() for _ in range(5)]
+        object_ids = ray.submit_batch(
+            [(c.add, [i]) for i, c in enumerate(counters)])
+        assert ray.get(object_ids) == list(range(5))
+
+        with pytest.raises(ValueError):
+            ray.submit_batch([(f, )])
+
     def testGetMultiple(self):
         self.init_ray()
         object_ids = [ray.put(i) for i in range(10)]
@@ -1099,6 +1184,75 @@ class APITest(unittest.TestCase):
                    for expected_type in expected_types):
                 break
 
+        # The timeline can also be streamed to a file and filtered.
+        filename = os.path.join(tempfile.mkdtemp(), "timeline.json")
+        num_events = ray.global_state.chrome_tracing_dump(filename=filename)
+        with open(filename) as f:
+            assert len(json.load(f)) == num_events
+        assert num_events >= len(profile_data)
+        assert ray.global_state.chrome_tracing_dump(start=time.time() +
+                                                    1000) == []
+        driver_events = ray.global_state.chrome_tracing_dump(
+            component_types=["driver"])
+        assert len(driver_events) > 0
+        assert all(
+            event["tid"].startswith("driver:") for event in driver_events)
+        assert "custom_event" not in {event["cat"] for event in driver_events}
+
+    @unittest.skipIf(
+        os.environ.get("RAY_USE_XRAY") != "1",
+        "This test only works with xray.")
+    def testBinaryProfilingMode(self):
+        # The workers read the profiling configuration from the environment
+        # when they start.
+        os.environ["RAY_PROFILING_MODE"] = "binary"
+        os.environ["RAY_PROFILING_SAMPLE_EVERY_N"] = "2"
+        try:
+            self.init_ray(num_cpus=1)
+        finally:
+            del os.environ["RAY_PROFILING_MODE"]
+            del os.environ["RAY_PROFILING_SAMPLE_EVERY_N"]
+
+        @ray.remote
+        def f():
+            with ray.profile("custom_event", extra_data={"key": "value"}):
+                pass
+
+        ray.get([f.remote() for _ in range(10)])
+
+        timeout_seconds = 20
+        start_time = time.time()
+        while True:
+            if time.time() - start_time > timeout_seconds:
+                raise Exception("Timed out while waiting for information in "
+                                "profile table.")
+            profile_data = ray.global_state.chrome_tracing_dump()
+            task_events = [
+                event for event in profile_data if event["cat"] == "task"
+            ]
+            if len(task_events) > 0:
+                break
+            time.sleep(0.1)
+
+        # Only some of the tasks are sampled, and the spans inside of a task
+        # are recorded if and only if the task is.
+        time.sleep(2)
+        profile_data = ray.global_state.chrome_tracing_dump()
+        task_events = [
+            event for event in profile_data if event["cat"] == "task"
+        ]
+        custom_events = [
+            event for event in profile_data if event["cat"] == "custom_event"
+        ]
+        assert 0 < len(task_events) < 10
+        assert len(custom_events) == len(task_events)
+        for event in custom_events:
+            assert event["args"]["key"] == "value"
+            assert "task_id" not in event["args"]
+        for event in task_events:
+            assert event["args"]["name"] == "f"
+            assert len(event["args"]["task_id"]) == 40
+
     def testIdenticalFunctionNames(self):
         # Define a bunch of remote functions and make sure that we don't
         # accidentally call an older version.
@@ -2336,6 +2490,63 @@ class GlobalStateAPI(unittest.TestCase):
         object_table_entry = ray.global_state.object_table(result_id)
         assert object_table[result_id] == object_table_entry
 
+    def testPaginatedTableAPI(self):
+        ray.init(num_cpus=1, num_redis_shards=2)
+
+        @ray.remote
+        def f():
+            return 1
+
+        @ray.remote
+        def g():
+            return 2
+
+        num_tasks = 20
+        ray.get([f.remote() for _ in range(num_tasks)] +
+                [g.remote() for _ in range(num_tasks)])
+        # The driver task is also in the task table.
+        wait_for_num_tasks(2 * num_tasks + 1)
+
+        # Walking the pages visits every task exactly once.
+        task_ids = []
+        cursor = None
+        while True:
+            page, cursor = ray.global_state.task_table_page(
+                cursor, page_size=5)
+            task_ids.extend(page.keys())
+            if cursor is None:
+                break
+        assert len(task_ids) == len(set(task_ids)) == 2 * num_tasks + 1
+        assert set(task_ids) == set(ray.global_state.task_table().keys())
+
+        def function_id(task_info):
+            if ray.worker.global_worker.use_raylet:
+                task_info = task_info[0]
+            return task_info["TaskSpec"]["FunctionID"]
+
+        some_task_info = ray.global_state.task_table(task_ids[0])
+        f_tasks = [
+            info for info in ray.global_state.task_table().values()
+            if function_id(info) == function_id(some_task_info)
+        ]
+        filtered_tasks = dict(
+            ray.global_state.iter_task_table(
+                page_size=7, function_id=function_id(some_task_info)))
+        assert len(filtered_tasks) == len(f_tasks)
+
+        driver_id = ray.experimental.state.binary_to_hex(
+            ray.worker.global_worker.worker_id)
+        assert len(
+            dict(ray.global_state.iter_task_table(
+                driver_id=driver_id))) == 2 * num_tasks + 1
+        assert dict(
+            ray.global_state.iter_task_table(driver_id=ray_constants.ID_SIZE *
+                                             "00")) == {}
+
+        object_table = ray.global_state.object_table()
+        assert dict(
+            ray.global_state.iter_object_table(page_size=3)) == object_table
+
     def testLogFileAPI(self):
         ray.init(redirect_worker_output=True)
 